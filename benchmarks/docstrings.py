@@ -0,0 +1,60 @@
+"""Compare the builtin docstring parser against `griffe` on large docstrings.
+
+Usage:
+
+```shell
+python -m benchmarks.docstrings --attributes 1000
+```
+"""
+
+import argparse
+import timeit
+
+from pydanclick.model.docstrings import DocstringStyle, _parse_with_builtin_parser, _parse_with_griffe
+
+
+def make_docstring(n_attributes: int, docstring_style: DocstringStyle) -> str:
+    """Create a docstring documenting `n_attributes` attributes, with a two-line description each."""
+    lines = ["Some model.", "", "Some description of the model.", ""]
+    if docstring_style == "google":
+        lines.append("Attributes:")
+        for i in range(n_attributes):
+            lines.extend([f"    field_{i} (int): description of field {i}", "        on two lines"])
+    elif docstring_style == "numpy":
+        lines.extend(["Attributes", "----------"])
+        for i in range(n_attributes):
+            lines.extend([f"field_{i} : int", f"    description of field {i}", "    on two lines"])
+    else:
+        for i in range(n_attributes):
+            lines.extend([f":ivar field_{i}: description of field {i}", "    on two lines", f":vartype field_{i}: int"])
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attributes", type=int, default=1000, help="number of attributes in the docstring")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions")
+    args = parser.parse_args()
+    print(f"{'style':<8} {'griffe (ms)':>12} {'builtin (ms)':>13} {'speedup':>8}")
+    for docstring_style in ("google", "numpy", "sphinx"):
+        docstring = make_docstring(args.attributes, docstring_style)
+        if _parse_with_builtin_parser(docstring, docstring_style) != _parse_with_griffe(docstring, docstring_style):
+            raise RuntimeError(f"griffe and the builtin parser disagree on {docstring_style} docstrings")
+        griffe_time = min(
+            timeit.repeat(lambda: _parse_with_griffe(docstring, docstring_style), number=1, repeat=args.repeat)  # noqa: B023
+        )
+        builtin_time = min(
+            timeit.repeat(
+                lambda: _parse_with_builtin_parser(docstring, docstring_style),  # noqa: B023
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        print(
+            f"{docstring_style:<8} {griffe_time * 1000:>12.2f} {builtin_time * 1000:>13.2f}"
+            f" {griffe_time / builtin_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
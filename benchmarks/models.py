@@ -0,0 +1,69 @@
+"""Synthetic models used by benchmarks, covering typical shapes of real-world models."""
+
+from typing import Any, Optional, Union
+
+from pydantic import BaseModel, Field, create_model
+
+
+class Item(BaseModel):
+    """Item, used in unions and unpacked lists."""
+
+    name: str = "item"
+    count: int = 0
+    ratio: float = 0.5
+    enabled: bool = False
+    tags: list[str] = Field(default_factory=list)
+
+
+class OtherItem(BaseModel):
+    """Other item, used in unions."""
+
+    label: str = "other"
+    size: int = 1
+
+
+def make_wide_model(n_fields: int = 1000) -> type[BaseModel]:
+    """Create a flat model with `n_fields` scalar fields."""
+    annotations: list[Any] = [int, float, str, bool]
+    fields: dict[str, Any] = {
+        f"field_{i}": (annotations[i % len(annotations)], annotations[i % len(annotations)]()) for i in range(n_fields)
+    }
+    return create_model("Wide", **fields)
+
+
+def make_deep_model(depth: int = 10) -> type[BaseModel]:
+    """Create a model nested `depth` times, with a few scalar fields at each level."""
+    model: type[BaseModel] = create_model("Level0", a=(int, 0), b=(str, "b"), c=(bool, False))
+    for i in range(1, depth):
+        model = create_model(
+            f"Level{i}", a=(int, 0), b=(str, "b"), c=(bool, False), sub=(model, Field(default_factory=model))
+        )
+    return model
+
+
+def make_json_model(n_fields: int = 20) -> type[BaseModel]:
+    """Create a model with `n_fields` container fields, passed as JSON strings on the command line."""
+    fields: dict[str, Any] = {}
+    for i in range(n_fields):
+        if i % 2:
+            fields[f"field_{i}"] = (dict[str, int], {"a": 1, "b": 2})
+        else:
+            fields[f"field_{i}"] = (list[int], [1, 2, 3])
+    return create_model("Json", **fields)
+
+
+def make_union_model(n_fields: int = 100) -> type[BaseModel]:
+    """Create a model where every field is a union, either of scalars or of models."""
+    fields: dict[str, Any] = {}
+    for i in range(n_fields):
+        if i % 2:
+            fields[f"field_{i}"] = (Optional[Union[Item, OtherItem]], None)
+        else:
+            fields[f"field_{i}"] = (Optional[Union[int, str]], None)
+    return create_model("Unions", **fields)
+
+
+def make_unpacked_model(n_fields: int = 20) -> type[BaseModel]:
+    """Create a model with `n_fields` lists of models, to use with `unpack_list=True`."""
+    fields: dict[str, Any] = {f"items_{i}": (list[Item], Field(default_factory=list)) for i in range(n_fields)}
+    return create_model("Unpacked", **fields)
@@ -0,0 +1,79 @@
+"""Measure the throughput of reading model instances from CSV and JSON Lines files.
+
+Usage:
+
+```shell
+python -m benchmarks.records --rows 1000000
+```
+"""
+
+import argparse
+import io
+import json
+import time
+from collections.abc import Iterator
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+from benchmarks.models import make_deep_model
+from pydanclick.model import convert_to_click
+from pydanclick.records import RecordValidator, iter_csv_records, iter_records
+
+
+def make_csv(model: type[BaseModel], rows: int) -> str:
+    """Create a CSV table with one column per field of `model`, and `rows` distinct rows."""
+    _, plan = convert_to_click(model, parse_docstring=False)
+    header = list(plan.qualified_names.values())  # type: ignore[attr-defined]
+    lines = [",".join(header)]
+    for i in range(rows):
+        lines.append(",".join(_make_cell(name, i) for name in header))
+    return "\n".join(lines) + "\n"
+
+
+def make_jsonl(model: type[BaseModel], rows: int) -> bytes:
+    """Create JSON Lines with dotted field names, equivalent to `make_csv()`."""
+    _, plan = convert_to_click(model, parse_docstring=False)
+    header = list(plan.qualified_names.values())  # type: ignore[attr-defined]
+    return "".join(json.dumps({name: _make_cell(name, i) for name in header}) + "\n" for i in range(rows)).encode()
+
+
+def _make_cell(dotted_name: str, i: int) -> str:
+    name = dotted_name.rsplit(".", 1)[-1]
+    return {"a": str(i), "b": f"b{i}", "c": "true" if i % 2 else "false"}[name]
+
+
+def measure(func: Callable[[], Iterator[Any]]) -> float:
+    """Return the time (in seconds) needed to exhaust the iterator returned by `func`."""
+    start = time.perf_counter()
+    for _ in func():
+        pass
+    return time.perf_counter() - start
+
+
+def run(rows: int, chunk_size: int = 1000) -> dict[str, float]:
+    """Return the throughput (in rows per second) of each source and validation mode."""
+    model = make_deep_model(2)
+    table = make_csv(model, rows)
+    results = {}
+    for validation in ("default", "flat"):
+        options, plan = convert_to_click(model, parse_docstring=False, validation=validation)
+        duration = measure(lambda: iter_csv_records(io.StringIO(table), plan, options, chunk_size=chunk_size))  # noqa: B023
+        results[f"csv.{validation}"] = rows / duration
+    lines = make_jsonl(model, rows)
+    results["jsonl"] = rows / measure(lambda: iter_records(io.BytesIO(lines), RecordValidator(model)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="number of rows (default: 1M)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="number of rows read at once (default: 1000)")
+    args = parser.parse_args()
+    print(f"{'source':<14} {'rows per second':>16}")
+    for name, throughput in run(args.rows, args.chunk_size).items():
+        print(f"{name:<14} {throughput:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
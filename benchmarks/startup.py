@@ -0,0 +1,162 @@
+"""Measure import time, decoration time and invocation latency, and compare them against a baseline.
+
+Usage:
+
+```shell
+python -m benchmarks.startup --output results.json
+python -m benchmarks.startup --output results.json --baseline baseline.json --threshold 0.2
+```
+
+or simply `make benchmark`. Results are stored as JSON, as a mapping from benchmark names to durations (in seconds).
+When a baseline is provided, the script exits with status 1 if any benchmark is slower than its baseline by more than
+the threshold (relative to the baseline).
+"""
+
+import argparse
+import functools
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+import click
+from click.testing import CliRunner
+from pydantic import BaseModel
+
+from benchmarks.models import make_deep_model, make_union_model, make_unpacked_model, make_wide_model
+from pydanclick import from_pydantic
+
+
+class Shape(NamedTuple):
+    """Represent a synthetic model, with the arguments to convert it and to invoke the resulting command."""
+
+    name: str
+    model: type[BaseModel]
+    kwargs: dict[str, Any]
+    args: list[str]
+
+
+def get_shapes(scale: float = 1.0) -> list[Shape]:
+    """Create synthetic models. Use `scale < 1` for quicker (but noisier) runs."""
+    return [
+        Shape("wide", make_wide_model(max(1, int(1000 * scale))), {}, ["--field-0", "1"]),
+        Shape("deep", make_deep_model(10), {}, ["--sub-sub-a", "1"]),
+        Shape("unions", make_union_model(max(2, int(100 * scale))), {}, ["--field-0", "1"]),
+        Shape(
+            "unpacked",
+            make_unpacked_model(max(1, int(20 * scale))),
+            {"unpack_list": True},
+            ["--items-0-name", "a", "--items-0-name", "b"],
+        ),
+    ]
+
+
+def measure_import_time(repeat: int) -> float:
+    """Return the cumulative import time of `pydanclick` (in seconds), as reported by `python -X importtime`."""
+    durations = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import pydanclick"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+            if name == "pydanclick":
+                durations.append(int(cumulative) / 1e6)
+    return min(durations)
+
+
+def make_command(shape: Shape) -> click.Command:
+    """Decorate a command with the model of `shape`."""
+
+    @click.command()
+    @from_pydantic("model", shape.model, **shape.kwargs)
+    def cli(model: BaseModel) -> None:
+        pass
+
+    return cli
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    """Return the best duration of `func()` (in seconds) over `repeat` runs."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run(scale: float = 1.0, repeat: int = 5) -> dict[str, float]:
+    """Run all benchmarks and return a mapping from benchmark names to durations (in seconds)."""
+    results = {"import": measure_import_time(repeat)}
+    runner = CliRunner()
+    for shape in get_shapes(scale):
+        results[f"decoration.{shape.name}"] = best_of(functools.partial(make_command, shape), repeat)
+        command = make_command(shape)
+        result = runner.invoke(command, shape.args)
+        if result.exit_code != 0:
+            raise RuntimeError(f"Invocation of {shape.name} failed:\n{result.output}") from result.exception
+        results[f"invocation.{shape.name}"] = best_of(functools.partial(runner.invoke, command, shape.args), repeat)
+    return results
+
+
+class Comparison(NamedTuple):
+    """Represent the comparison of a benchmark against its baseline."""
+
+    name: str
+    baseline: Optional[float]
+    current: float
+    regression: bool
+
+    @property
+    def ratio(self) -> Optional[float]:
+        return self.current / self.baseline if self.baseline else None
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> Iterator[Comparison]:
+    """Compare results against a baseline.
+
+    >>> [c.regression for c in compare({"a": 1.3, "b": 1.1, "c": 1.0}, {"a": 1.0, "b": 1.0}, threshold=0.2)]
+    [True, False, False]
+
+    Args:
+        results: current results
+        baseline: baseline results
+        threshold: maximum relative slowdown before a benchmark is considered a regression
+
+    Returns:
+        one comparison per benchmark in `results`. Benchmarks missing from the baseline are never regressions
+    """
+    for name, current in results.items():
+        reference = baseline.get(name)
+        yield Comparison(name, reference, current, reference is not None and current > reference * (1 + threshold))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="file to write results to (JSON)")
+    parser.add_argument("--baseline", type=Path, help="results to compare against (JSON)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="maximum relative slowdown (default: 0.2)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions (default: 5)")
+    parser.add_argument("--scale", type=float, default=1.0, help="scale factor for model sizes (default: 1)")
+    args = parser.parse_args()
+    results = run(scale=args.scale, repeat=args.repeat)
+    if args.output is not None:
+        metadata = {"python": platform.python_version(), "platform": platform.platform(), "scale": args.scale}
+        args.output.write_text(json.dumps({"metadata": metadata, "results": results}, indent=2) + "\n")
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline is not None else {}
+    comparisons = list(compare(results, baseline, args.threshold))
+    print(f"{'benchmark':<24} {'baseline (ms)':>14} {'current (ms)':>13} {'ratio':>6}")
+    for comparison in comparisons:
+        reference = f"{comparison.baseline * 1000:.2f}" if comparison.baseline is not None else "-"
+        ratio = f"{comparison.ratio:.2f}" if comparison.ratio is not None else "-"
+        flag = "  REGRESSION" if comparison.regression else ""
+        print(f"{comparison.name:<24} {reference:>14} {comparison.current * 1000:>13.2f} {ratio:>6}{flag}")
+    if any(comparison.regression for comparison in comparisons):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Measure decoration time and memory of models with many JSON-typed fields, with and without the type cache.
+
+Usage:
+
+```shell
+python -m benchmarks.type_adapters --fields 500
+```
+"""
+
+import argparse
+import timeit
+import tracemalloc
+from typing import Any, Optional, Union
+
+import click
+from pydantic import BaseModel, create_model
+
+from pydanclick import from_pydantic
+from pydanclick.model import type_conversion
+from pydanclick.utils import LRUCache
+
+# Annotations and a valid JSON value for each of them
+ANNOTATIONS: list[tuple[Any, str]] = [
+    (list[int], "[1, 2]"),
+    (dict[str, float], '{"a": 1.5}'),
+    (Union[int, str], '"a"'),
+    (Optional[list[str]], "null"),
+    (tuple[int, int], "[1, 2]"),
+]
+
+
+def make_model(n_fields: int) -> type[BaseModel]:
+    """Create a model with `n_fields` fields, cycling through a few JSON-typed annotations."""
+    fields: dict[str, Any] = {f"field_{i}": (ANNOTATIONS[i % len(ANNOTATIONS)][0], None) for i in range(n_fields)}
+    return create_model("Wide", **fields)
+
+
+def decorate_and_parse(model: type[BaseModel]) -> None:
+    """Decorate a command with `model`, then parse a value for every field."""
+
+    @click.command()
+    @from_pydantic("model", model)
+    def cli(model: BaseModel) -> None:
+        pass
+
+    for i, param in enumerate(cli.params):
+        param.type.convert(ANNOTATIONS[i % len(ANNOTATIONS)][1], param, None)
+
+
+def measure(model: type[BaseModel], maxsize: int, repeat: int) -> tuple[float, int]:
+    """Return the best decoration time (in seconds) and the peak memory (in bytes) for a given cache size."""
+    type_conversion._type_adapters = LRUCache(maxsize=maxsize)
+    type_conversion._custom_types = LRUCache(maxsize=maxsize)
+
+    def run() -> None:
+        type_conversion.clear_type_cache()
+        decorate_and_parse(model)
+
+    duration = min(timeit.repeat(run, number=1, repeat=repeat))
+    type_conversion.clear_type_cache()
+    tracemalloc.start()
+    decorate_and_parse(model)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fields", type=int, default=500, help="number of fields in the model")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions")
+    args = parser.parse_args()
+    model = make_model(args.fields)
+    print(f"{'cache':<9} {'time (ms)':>10} {'peak memory (MiB)':>18}")
+    for label, maxsize in (("disabled", 0), ("enabled", type_conversion._TYPE_CACHE_MAXSIZE)):
+        duration, peak = measure(model, maxsize, args.repeat)
+        print(f"{label:<9} {duration * 1000:>10.1f} {peak / 2**20:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Compare validation modes, i.e. the conversion of command-line strings to a model instance, on several model shapes.
+
+Each measure includes the conversion of raw strings by the Click types of the options, then the validation of the
+parsed arguments. Every call validates the same arguments, which is the best case for `incremental` validation.
+
+The second table compares the throughput of validating many records, either one by one or by chunks with
+`ValidationPlan.validate_many()`.
+
+Usage:
+
+```shell
+python -m benchmarks.validation --number 10000 --records 100000
+```
+"""
+
+import argparse
+import functools
+import timeit
+from collections.abc import Callable
+from typing import Any, get_args
+
+import click
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from benchmarks.models import make_deep_model, make_json_model, make_wide_model
+from pydanclick.model import convert_to_click
+from pydanclick.model.type_conversion import is_json_type
+from pydanclick.model.validation import ConstructionPlan, ValidationMode, model_validate_kwargs
+
+
+def get_raw_kwargs(model: type[BaseModel]) -> dict[str, Any]:
+    """Return the values Click would receive from the command line to set every field of `model` to its default."""
+    options, _ = convert_to_click(model, parse_docstring=False)
+    return {option.name: _get_raw_value(option) for option in options if option.name}
+
+
+def _get_raw_value(option: click.Option) -> Any:
+    value = option.default._default  # type: ignore[union-attr]
+    if option.is_flag:
+        return value
+    if is_json_type(option.type):
+        return to_json(value).decode()
+    return str(value)
+
+
+def get_validators(model: type[BaseModel]) -> dict[str, Callable[[dict[str, Any]], Any]]:
+    """Return functions converting raw command-line values to a model instance, one per validation mode."""
+    validators = {}
+    for validation in get_args(ValidationMode):
+        options, validate = convert_to_click(model, parse_docstring=False, validation=validation)
+        if validation == "default":
+            validators["model_validate_kwargs"] = functools.partial(
+                _parse_and_validate,
+                options,
+                functools.partial(
+                    model_validate_kwargs,
+                    model=model,
+                    qualified_names=validate.qualified_names,  # type: ignore[attr-defined]
+                    unpacked_names=set(),
+                ),
+            )
+        validators[validation] = functools.partial(_parse_and_validate, options, validate)
+    options, validate = convert_to_click(model, parse_docstring=False, trusted=True)
+    if isinstance(validate, ConstructionPlan):
+        validators["trusted"] = functools.partial(_parse_and_validate, options, validate)
+    return validators
+
+
+def _parse_and_validate(options: list[click.Option], validate: Callable[..., Any], raw_kwargs: dict[str, Any]) -> Any:
+    kwargs = {option.name: option.type.convert(raw_kwargs[option.name], option, None) for option in options}
+    return validate(kwargs)
+
+
+def get_many_validators(model: type[BaseModel], chunk_size: int) -> dict[str, Callable[[list[dict[str, Any]]], Any]]:
+    """Return functions validating a list of parsed arguments (without Click conversion)."""
+    validators: dict[str, Callable[[list[dict[str, Any]]], Any]] = {}
+    for validation in ("default", "flat"):
+        _, plan = convert_to_click(model, parse_docstring=False, validation=validation)
+        validators[f"{validation}.per_record"] = lambda records, plan=plan: [plan(dict(record)) for record in records]
+        validators[f"{validation}.validate_many"] = lambda records, plan=plan: list(
+            plan.validate_many((dict(record) for record in records), chunk_size=chunk_size)
+        )
+        if validation == "default":
+            validators["model_validate_kwargs"] = lambda records, plan=plan: [
+                model_validate_kwargs(dict(record), model, plan.qualified_names, set()) for record in records
+            ]
+    return validators
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=10_000, help="number of validations")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions")
+    parser.add_argument("--records", type=int, default=100_000, help="number of records for batch validation")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="chunk size for batch validation")
+    args = parser.parse_args()
+    print(f"{'model':<6} {'validator':<22} {'time per call (us)':>19}")
+    for name, model in (("wide", make_wide_model(100)), ("deep", make_deep_model(10)), ("json", make_json_model(20))):
+        raw_kwargs = get_raw_kwargs(model)
+        for validator_name, validator in get_validators(model).items():
+            duration = min(
+                timeit.repeat(lambda: validator(raw_kwargs), number=args.number, repeat=args.repeat)  # noqa: B023
+            )
+            print(f"{name:<6} {validator_name:<22} {duration / args.number * 1e6:>19.2f}")
+    print()
+    print(f"{'model':<6} {'validator':<28} {'records per second':>19}")
+    for name, model in (("wide", make_wide_model(20)), ("deep", make_deep_model(3))):
+        options, _ = convert_to_click(model, parse_docstring=False)
+        raw_kwargs = get_raw_kwargs(model)
+        record = {option.name: option.type.convert(raw_kwargs[option.name], option, None) for option in options}
+        records = [record] * args.records
+        for validator_name, many_validator in get_many_validators(model, args.chunk_size).items():
+            duration = min(timeit.repeat(lambda: many_validator(records), number=1, repeat=args.repeat))  # noqa: B023
+            print(f"{name:<6} {validator_name:<28} {args.records / duration:>19,.0f}")
+
+
+if __name__ == "__main__":
+    main()
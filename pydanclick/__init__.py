@@ -1,3 +1,25 @@
-from pydanclick.main import from_pydantic
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = ("from_pydantic",)
+if TYPE_CHECKING:
+    from pydanclick.batch import batch, batch_option
+    from pydanclick.main import from_pydantic
+
+__all__ = ("batch", "batch_option", "from_pydantic")
+
+# Public names are imported on first access, so that `import pydanclick` doesn't import Pydantic nor the conversion
+# machinery until they're actually needed
+_LAZY_IMPORTS = {"batch": "pydanclick.batch", "batch_option": "pydanclick.batch", "from_pydantic": "pydanclick.main"}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
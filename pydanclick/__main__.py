@@ -0,0 +1,116 @@
+"""Command-line interface of pydanclick (see `python -m pydanclick --help`)."""
+
+import shlex
+import sys
+from pathlib import Path
+from typing import Literal, Optional
+
+import click
+
+from pydanclick.codegen import generate_module
+
+
+@click.group()
+def cli() -> None:
+    """Pydanclick utilities."""
+
+
+def _parse_mapping(ctx: click.Context, param: click.Parameter, values: tuple[str, ...]) -> Optional[dict[str, str]]:
+    mapping = {}
+    for value in values:
+        key, sep, name = value.partition("=")
+        if not sep:
+            raise click.BadParameter(f"expected `dotted.field=option-name`, got {value!r}", ctx=ctx, param=param)
+        mapping[key] = name
+    return mapping or None
+
+
+@cli.command()
+@click.argument("model_path")
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), help="File to write the module to")
+@click.option("--check", is_flag=True, help="Don't write anything, exit with status 1 if `--output` is outdated")
+@click.option("--exclude", multiple=True, help="Dotted name of a field to exclude")
+@click.option("--rename", multiple=True, callback=_parse_mapping, help="Option name of a field, as `field=--name`")
+@click.option("--shorten", multiple=True, callback=_parse_mapping, help="Short option name of a field, as `field=-n`")
+@click.option("--prefix", help="Prefix to add to option names")
+@click.option("--parse-docstring/--no-parse-docstring", default=True, help="Extract help from the model docstring")
+@click.option("--docstring-style", type=click.Choice(["google", "numpy", "sphinx"]), default="google")
+@click.option("--docstring-parser", type=click.Choice(["griffe", "builtin"]), default="griffe")
+@click.option("--ignore-unsupported", is_flag=True, help="Ignore fields with unsupported types")
+@click.option("--unpack-list", is_flag=True, help="Unpack lists of nested models")
+@click.option("--max-depth", type=click.IntRange(min=1), help="Maximum nesting depth of options")
+def codegen(
+    model_path: str,
+    output: Optional[Path],
+    check: bool,
+    exclude: tuple[str, ...],
+    rename: Optional[dict[str, str]],
+    shorten: Optional[dict[str, str]],
+    prefix: Optional[str],
+    parse_docstring: bool,
+    docstring_style: Literal["google", "numpy", "sphinx"],
+    docstring_parser: Literal["griffe", "builtin"],
+    ignore_unsupported: bool,
+    unpack_list: bool,
+    max_depth: Optional[int],
+) -> None:
+    """Generate a module declaring the Click options of MODEL_PATH (e.g. `package.module:Model`).
+
+    The generated module defines `options` and `validate`, like `convert_to_click()`, but doesn't need to analyze the
+    model at runtime.
+    """
+    if check and output is None:
+        raise click.UsageError("`--check` requires `--output`")
+    command = _format_command(click.get_current_context())
+    source = generate_module(
+        model_path,
+        exclude=exclude,
+        rename=rename,
+        shorten=shorten,
+        prefix=prefix,
+        parse_docstring=parse_docstring,
+        docstring_style=docstring_style,
+        docstring_parser=docstring_parser,
+        ignore_unsupported=ignore_unsupported,
+        unpack_list=unpack_list,
+        max_depth=max_depth,
+        command=command,
+    )
+    if output is None:
+        click.echo(source, nl=False)
+    elif check:
+        if not output.exists() or output.read_text() != source:
+            click.echo(f"{output} is outdated, run: {command} --output {shlex.quote(str(output))}", err=True)
+            sys.exit(1)
+    else:
+        output.write_text(source)
+
+
+def _format_command(ctx: click.Context) -> str:
+    """Format the command that generates a module, without default values nor options that don't affect the code.
+
+    The output path is left out too: it depends on the working directory, and would make `--check` report modules
+    generated from another directory as outdated.
+    """
+    arguments = [ctx.params["model_path"]]
+    for param in ctx.command.params:
+        value = ctx.params[param.name] if param.name is not None else None
+        if (
+            not isinstance(param, click.Option)
+            or param.name in ("check", "output")
+            or value in (None, (), param.default)
+        ):
+            continue
+        if param.is_flag:
+            arguments.append(param.opts[-1] if value else param.secondary_opts[-1])
+            continue
+        if isinstance(value, dict):
+            values = [f"{key}={name}" for key, name in value.items()]
+        else:
+            values = list(value) if param.multiple else [value]
+        arguments.extend(arg for value in values for arg in (param.opts[-1], str(value)))
+    return shlex.join(["python", "-m", "pydanclick", "codegen", *arguments])
+
+
+if __name__ == "__main__":
+    cli()
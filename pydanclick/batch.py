@@ -0,0 +1,321 @@
+"""Run a Click command over many argument vectors in a single process, or in a pool of worker processes.
+
+Starting Python, importing Pydantic and converting models to options can take much longer than running the command
+itself. Batches pay these costs once (per worker): every argument vector is parsed and validated by the same command
+object, and thus reuses its options and validators.
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import pickle
+import shlex
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, NamedTuple, Optional, Union, cast
+
+import click
+from click.decorators import FC
+
+BATCH_OPTION_NAME = "--pydanclick-batch"
+WORKERS_OPTION_NAME = "--pydanclick-workers"
+
+
+class BatchResult(NamedTuple):
+    """Represent the outcome of one invocation of a command in a batch.
+
+    Attributes:
+        position: position of the argument vector in the batch
+        argv: command-line arguments passed to the command
+        exit_code: exit code the command would have returned if invoked alone (0 on success)
+        return_value: value returned by the command (None if it failed)
+        exception: exception raised by the command, if any
+    """
+
+    position: int
+    argv: list[str]
+    exit_code: int
+    return_value: Any = None
+    exception: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
+
+def parse_argv(line: str) -> list[str]:
+    """Parse a line into command-line arguments, either as a JSON array of strings or with shell-like syntax.
+
+    >>> parse_argv("--foo 1 --bar 'a b'")
+    ['--foo', '1', '--bar', 'a b']
+    >>> parse_argv('["--foo", "1", "--bar", "a b"]')
+    ['--foo', '1', '--bar', 'a b']
+
+    Args:
+        line: line to parse
+
+    Returns:
+        list of arguments
+
+    Raises:
+        ValueError: if the line can't be parsed
+    """
+    line = line.strip()
+    if not line.startswith("["):
+        return shlex.split(line)
+    argv = json.loads(line)
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        raise ValueError(f"Expected a JSON array of strings, got {line!r}")
+    return argv
+
+
+def read_argvs(lines: Iterable[str]) -> Iterator[str]:
+    """Yield non-empty lines, skipping comments (lines starting with `#`). Lines are parsed later by `batch()`."""
+    for line in lines:
+        stripped_line = line.strip()
+        if stripped_line and not stripped_line.startswith("#"):
+            yield stripped_line
+
+
+def batch(
+    command: click.Command,
+    argvs: Iterable[Union[str, Sequence[str]]],
+    *,
+    prog_name: Optional[str] = None,
+    workers: Optional[int] = None,
+    **extra: Any,
+) -> Iterator[BatchResult]:
+    """Invoke a command once per argument vector, lazily.
+
+    Each invocation behaves as if the command was called from the command line with these arguments: errors are
+    reported through the exit code of the result, instead of stopping the batch.
+
+    ```python
+    for result in batch(cli, ["--foo 1", "--foo 2", ["--foo", "3"]]):
+        if not result.ok:
+            print(f"Invocation {result.position} failed: {result.exception}")
+    ```
+
+    With `workers`, invocations are distributed over a pool of processes. Each worker imports the command once (so the
+    command must be defined at the top level of a module), then parses, validates and runs its invocations. Results
+    and outputs are still reported in order. Return values and exceptions that can't be pickled are replaced.
+
+    Args:
+        command: Click command (or group) to invoke
+        argvs: argument vectors, either as lists of arguments or as lines to parse (see `parse_argv()`)
+        prog_name: program name, used in error messages. Defaults to the name of the command
+        workers: number of worker processes. By default, commands are invoked in the current process
+        **extra: extra arguments passed to `click.Context` (such as `obj`). Must be picklable if `workers` is set
+
+    Returns:
+        an iterator over results, in the same order as `argvs`. Arguments are read and commands are invoked as results
+            are consumed
+    """
+    items = _parse_argvs(argvs)
+    if workers is not None:
+        yield from _batch_in_workers(command, items, workers, prog_name, extra)
+        return
+    for item in items:
+        yield item if isinstance(item, BatchResult) else _invoke(command, *item, prog_name, extra)
+
+
+def _parse_argvs(argvs: Iterable[Union[str, Sequence[str]]]) -> Iterator[Union[BatchResult, tuple[int, list[str]]]]:
+    """Yield `(index, argv)` pairs, or results for lines that can't be parsed."""
+    for index, argv_or_line in enumerate(argvs):
+        if not isinstance(argv_or_line, str):
+            yield index, list(argv_or_line)
+            continue
+        try:
+            yield index, parse_argv(argv_or_line)
+        except ValueError as e:
+            yield BatchResult(index, [argv_or_line], click.UsageError.exit_code, exception=e)
+
+
+def _batch_in_workers(
+    command: click.Command,
+    items: Iterable[Union[BatchResult, tuple[int, list[str]]]],
+    workers: int,
+    prog_name: Optional[str],
+    extra: dict[str, Any],
+) -> Iterator[BatchResult]:
+    if workers < 1:
+        raise ValueError(f"`workers` must be positive, got {workers}")
+    command_path = _get_command_path(command)
+    # Bound the number of pending invocations, so that arguments are read as results are consumed
+    max_pending = 4 * workers
+    pending: deque[Union[BatchResult, Future[tuple[BatchResult, str, str]]]] = deque()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(command_path, prog_name, extra)) as executor:
+        for item in items:
+            pending.append(item if isinstance(item, BatchResult) else executor.submit(_invoke_in_worker, *item))
+            if len(pending) >= max_pending:
+                yield _collect(pending.popleft())
+        while pending:
+            yield _collect(pending.popleft())
+
+
+def _get_command_path(command: click.Command) -> tuple[str, str]:
+    """Return the module and the attribute name of `command`, so that worker processes can import it."""
+    module_name = getattr(command.callback, "__module__", None)
+    module = sys.modules.get(module_name) if module_name is not None else None
+    for name, value in vars(module).items() if module is not None else ():
+        if value is command:
+            return cast(str, module_name), name
+    raise ValueError(f"Command {command.name!r} must be defined at the top level of a module to run in workers")
+
+
+def _collect(item: Union[BatchResult, "Future[tuple[BatchResult, str, str]]"]) -> BatchResult:
+    """Wait for a result, and write the outputs of its invocation."""
+    if isinstance(item, BatchResult):
+        return item
+    result, stdout, stderr = item.result()
+    if stdout:
+        click.echo(stdout, nl=False)
+    if stderr:
+        click.echo(stderr, nl=False, err=True)
+    return result
+
+
+# State of worker processes: the command (imported once per worker) and the arguments shared by all invocations
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(command_path: tuple[str, str], prog_name: Optional[str], extra: dict[str, Any]) -> None:
+    module_name, name = command_path
+    _worker_state.update(command=getattr(importlib.import_module(module_name), name), prog_name=prog_name, extra=extra)
+
+
+def _invoke_in_worker(index: int, argv: list[str]) -> tuple[BatchResult, str, str]:
+    """Invoke the command of the worker, capturing its outputs."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        result = _invoke(_worker_state["command"], index, argv, _worker_state["prog_name"], _worker_state["extra"])
+    return _make_picklable(result), stdout.getvalue(), stderr.getvalue()
+
+
+def _make_picklable(result: BatchResult) -> BatchResult:
+    """Replace the return value and the exception of `result` if they can't be sent back to the main process."""
+    if not _is_picklable(result.return_value):
+        result = result._replace(return_value=None)
+    if result.exception is not None and not _is_picklable(result.exception):
+        # Click exceptions hold a reference to their context, and thus to the command
+        message = (
+            result.exception.format_message()
+            if isinstance(result.exception, click.ClickException)
+            else str(result.exception)
+        )
+        result = result._replace(exception=RuntimeError(f"{type(result.exception).__name__}: {message}"))
+    return result
+
+
+def _is_picklable(value: Any) -> bool:
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def _invoke(
+    command: click.Command, index: int, argv: list[str], prog_name: Optional[str], extra: dict[str, Any]
+) -> BatchResult:
+    """Invoke `command` with `argv`, reporting errors in the result."""
+    # Same as `command.main(argv, standalone_mode=False)`, except that exits are reported instead of being returned
+    try:
+        # Click consumes the list of arguments: keep the original one for the result
+        with command.make_context(prog_name or command.name, list(argv), **extra) as ctx:
+            return_value = command.invoke(ctx)
+    except click.exceptions.Exit as e:
+        return BatchResult(index, argv, e.exit_code)
+    except click.ClickException as e:
+        e.show()
+        return BatchResult(index, argv, e.exit_code, exception=e)
+    except click.Abort as e:
+        click.echo("Aborted!", err=True)
+        return BatchResult(index, argv, 1, exception=e)
+    except Exception as e:
+        return BatchResult(index, argv, 1, exception=e)
+    return BatchResult(index, argv, 0, return_value=return_value)
+
+
+def batch_option(
+    *param_decls: str,
+    report: Optional[Callable[[BatchResult], None]] = None,
+    workers_param_decls: Sequence[str] = (WORKERS_OPTION_NAME,),
+    **kwargs: Any,
+) -> Callable[[FC], FC]:
+    """Add hidden options to run a command over a file of argument vectors, one per line.
+
+    ```python
+    @click.command()
+    @from_pydantic(Config)
+    @batch_option()
+    def cli(config: Config):
+        ...
+    ```
+
+    Then `cli --pydanclick-batch jobs.txt` (or `-` to read from standard input) invokes `cli` once per line of
+    `jobs.txt`, where each line contains command-line arguments (see `parse_argv()`). Other arguments are ignored.
+    With `--pydanclick-workers N`, invocations are distributed over `N` worker processes (see `batch()`).
+    The command exits with status 1 if any invocation failed.
+
+    Args:
+        *param_decls: option names. Defaults to `--pydanclick-batch`
+        report: function called with the result of each invocation. By default, failures are reported on stderr
+        workers_param_decls: names of the option setting the number of worker processes
+        **kwargs: extra arguments passed to `click.option()`
+
+    Returns:
+        a decorator adding the options
+    """
+
+    def run(ctx: click.Context, key: str, value: Any) -> None:
+        # Eager options are processed in command-line order: run the batch once both options are known
+        state = ctx.meta.setdefault("pydanclick.batch", {})
+        state[key] = value
+        if len(state) < 2 or state["file"] is None or ctx.resilient_parsing:
+            return
+        failed = False
+        results = batch(
+            ctx.command, read_argvs(state["file"]), prog_name=ctx.info_name, workers=state["workers"], obj=ctx.obj
+        )
+        for result in results:
+            failed = failed or not result.ok
+            (report or _report_failure)(result)
+        ctx.exit(1 if failed else 0)
+
+    kwargs = {
+        "type": click.File("r"),
+        "hidden": True,
+        "is_eager": True,
+        "expose_value": False,
+        "callback": lambda ctx, _, value: run(ctx, "file", value),
+        "help": "Run the command once per line of FILE (use - for stdin).",
+        **kwargs,
+    }
+    batch_decorator = click.option(*(param_decls or (BATCH_OPTION_NAME,)), **kwargs)
+    workers_decorator = click.option(
+        *workers_param_decls,
+        type=click.IntRange(min=1),
+        hidden=True,
+        is_eager=True,
+        expose_value=False,
+        callback=lambda ctx, _, value: run(ctx, "workers", value),
+        help="Number of worker processes running the batch.",
+    )
+
+    def decorator(f: FC) -> FC:
+        return batch_decorator(workers_decorator(f))
+
+    return decorator
+
+
+def _report_failure(result: BatchResult) -> None:
+    if not result.ok:
+        click.echo(
+            f"Invocation {result.position} ({shlex.join(result.argv)}) exited with code {result.exit_code}", err=True
+        )
+        if result.exception is not None and not isinstance(result.exception, (click.ClickException, click.Abort)):
+            click.echo(f"{type(result.exception).__name__}: {result.exception}", err=True)
@@ -0,0 +1,402 @@
+"""Generate a static Python module declaring the Click options of a Pydantic model.
+
+The generated module defines `options` and `validate`, equivalent to the pair returned by `convert_to_click()`, without
+analyzing the model at runtime: fields aren't collected, docstrings aren't parsed, and JSON types only build their type
+adapter when they first parse a value. Generate it with:
+
+```shell
+python -m pydanclick codegen my_package.my_module:MyModel --output my_package/_options.py
+```
+
+then use it like any other list of options:
+
+```python
+from pydanclick.command import add_options
+from my_package._options import options, validate
+
+@click.command()
+@add_options(options)
+def cli(**kwargs):
+    my_model = validate(kwargs)
+```
+
+The module must be generated again whenever the model changes: use `--check` (e.g. in CI) to detect stale modules.
+
+This module also contains the (lightweight) helpers used by generated modules at runtime.
+"""
+
+import ast
+import importlib
+import importlib.util
+import pathlib
+from collections.abc import Sequence
+from typing import Any, Literal, Optional, Union, cast, get_args, get_origin
+
+import click
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic.fields import FieldInfo
+
+from pydanclick.model.type_conversion import (
+    JsonParamType,
+    PydanclickDefault,
+    PydanclickDefaultCallable,
+    PydanclickParamType,
+    _get_pydanclick_type,
+    _get_type_from_field,
+)
+
+__all__ = (
+    "LazyJsonParamType",
+    "PydanclickDefault",
+    "PydanclickDefaultCallable",
+    "field_info",
+    "generate_module",
+    "type_from_field",
+    "wrap_type",
+)
+
+_SHARED_TYPE_NAMES = ("INT", "FLOAT", "STRING", "BOOL", "UUID")
+
+
+def wrap_type(click_type: click.ParamType) -> click.ParamType:
+    """Wrap a Click type, as `convert_to_click()` does for every option."""
+    return _get_pydanclick_type(click_type)
+
+
+def field_info(model: type[BaseModel], parents: Sequence[str]) -> FieldInfo:
+    """Get a (possibly nested) field of a model.
+
+    Nested fields are looked up in sub-models, lists of sub-models (unpacked fields) and unions of sub-models.
+
+    Args:
+        model: Pydantic model
+        parents: field name and all its parent names
+
+    Returns:
+        the Pydantic field
+    """
+    models = [model]
+    info: Optional[FieldInfo] = None
+    for name in parents:
+        info = next((candidate.model_fields[name] for candidate in models if name in candidate.model_fields), None)
+        if info is None:
+            raise KeyError(f"{model.__name__} has no field {'.'.join(parents)}")
+        models = _get_nested_models(info.annotation)
+    if info is None:
+        raise ValueError("`parents` can't be empty")
+    return info
+
+
+def type_from_field(model: type[BaseModel], parents: Sequence[str]) -> click.ParamType:
+    """Get the Click type of a field, for types that can't be rendered as code."""
+    return _get_type_from_field(field_info(model, parents))
+
+
+class LazyJsonParamType(JsonParamType):
+    """Click type parsing JSON strings, which only builds its type adapter when it first parses a value.
+
+    Args:
+        model: Pydantic model
+        parents: field name and all its parent names
+    """
+
+    def __init__(self, model: type[BaseModel], parents: Sequence[str]) -> None:
+        self.model = model
+        self.parents = tuple(parents)
+        self._type_adapter: Optional[TypeAdapter[Any]] = None
+
+    def convert(self, value: Any, param: Optional[click.Parameter], ctx: Optional[click.Context]) -> Any:
+        if self._type_adapter is None:
+            self._type_adapter = TypeAdapter(field_info(self.model, self.parents).annotation)
+        try:
+            if isinstance(value, str):
+                return self._type_adapter.validate_json(value)
+            return self._type_adapter.validate_python(value)
+        except ValidationError as e:
+            self.fail(str(e), param, ctx)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self.model, self.parents)
+
+
+def generate_module(
+    model_path: str,
+    *,
+    exclude: Sequence[str] = (),
+    rename: Optional[dict[str, str]] = None,
+    shorten: Optional[dict[str, str]] = None,
+    prefix: Optional[str] = None,
+    parse_docstring: bool = True,
+    docstring_style: Literal["google", "numpy", "sphinx"] = "google",
+    docstring_parser: Literal["griffe", "builtin"] = "griffe",
+    ignore_unsupported: bool = False,
+    unpack_list: bool = False,
+    max_depth: Optional[int] = None,
+    command: Optional[str] = None,
+) -> str:
+    """Generate the source code of a module declaring the Click options of a model.
+
+    Arguments are the same as for `convert_to_click()`. `extra_options` isn't supported, since arbitrary Python objects
+    can't be rendered as code: pass them to the generated options instead.
+
+    Args:
+        model_path: path to the model, as `package.module:Model`
+        exclude: fields to exclude
+        rename: a mapping from dotted field names to option names
+        shorten: a mapping from dotted field names to short option names
+        prefix: prefix to add to option names
+        parse_docstring: if True, parse model docstring to extract field documentation
+        docstring_style: docstring style of the model
+        docstring_parser: docstring parser, either `griffe` or `builtin`
+        ignore_unsupported: ignore unsupported model fields instead of raising
+        unpack_list: if True, unpack lists of nested models
+        max_depth: maximum nesting depth of options
+        command: command used to generate the module, mentioned in its docstring
+
+    Returns:
+        the source code of the module
+    """
+    # Conversion machinery is only needed to generate modules, not to use them
+    from pydanclick.model.model_conversion import _convert
+
+    module_name, model_name = _split_model_path(model_path)
+    model = import_model(model_path)
+    conversion = _convert(
+        model,
+        exclude=exclude,
+        rename=rename,
+        shorten=shorten,
+        prefix=prefix,
+        parse_docstring=parse_docstring,
+        docstring_style=docstring_style,
+        docstring_parser=docstring_parser,
+        extra_options=None,
+        ignore_unsupported=ignore_unsupported,
+        unpack_list=unpack_list,
+        max_depth=max_depth,
+    )
+    renderer = _OptionRenderer(model_name)
+    rendered_options = [
+        renderer.render(option, conversion.qualified_names[cast(Any, option.name)]) for option in conversion.options
+    ]
+    lines = [
+        f'"""Click options for `{model_path}`.',
+        "",
+        "Generated with the following command, do not edit by hand:",
+        "",
+        f"    {command or f'python -m pydanclick codegen {model_path}'}",
+        '"""',
+        "",
+        *_render_imports(
+            renderer.imports,
+            {
+                "click": "import click",
+                "pydanclick.codegen": f"from pydanclick.codegen import {', '.join(sorted(renderer.helpers))}",
+                "pydanclick.model.validation": "from pydanclick.model.validation import ValidationPlan",
+                module_name: f"from {module_name} import {model_name}",
+            },
+        ),
+        "options = [",
+        *rendered_options,
+        "]",
+        "",
+        "validate = ValidationPlan(",
+        f"    {model_name},",
+        f"    qualified_names={_render_dict(conversion.qualified_names)},",
+        f"    unpacked_names={_render_set(conversion.unpacked_names)},",
+        ")",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def import_model(model_path: str) -> type[BaseModel]:
+    """Import a model from its path, e.g. `package.module:Model`."""
+    module_name, model_name = _split_model_path(model_path)
+    model = getattr(importlib.import_module(module_name), model_name, None)
+    if not (isinstance(model, type) and issubclass(model, BaseModel)):
+        raise TypeError(f"{model_path} isn't a Pydantic model")
+    return model
+
+
+def _split_model_path(model_path: str) -> tuple[str, str]:
+    module_name, _, model_name = model_path.partition(":")
+    if not module_name or not model_name.isidentifier():
+        raise ValueError(f"Invalid model path {model_path!r}: expected `package.module:Model`")
+    return module_name, model_name
+
+
+def _get_nested_models(annotation: Any) -> list[type[BaseModel]]:
+    """Return the models contained in an annotation (directly, in a list or in a union)."""
+    candidates = [annotation]
+    if get_origin(annotation) is list or get_origin(annotation) is Union:
+        candidates.extend(get_args(annotation))
+    return [candidate for candidate in candidates if isinstance(candidate, type) and issubclass(candidate, BaseModel)]
+
+
+class _OptionRenderer:
+    """Render Click options created by `convert_to_click()` as code.
+
+    Attributes:
+        model_name: name of the model in the generated module
+        imports: standard library imports needed by the rendered code
+        helpers: helpers from this module needed by the rendered code
+    """
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+        self.imports: set[str] = set()
+        self.helpers: set[str] = {"wrap_type"}
+
+    def render(self, option: click.Option, dotted_name: str) -> str:
+        parents = tuple(dotted_name.split("."))
+        decls = [option.name]
+        if option.secondary_opts:
+            decls.append(f"{option.opts[0]}/{option.secondary_opts[0]}")
+            decls.extend(option.opts[1:])
+        else:
+            decls.extend(option.opts)
+        arguments = {
+            "type": self._render_type(option.type, parents),
+            "default": self._render_default(option.default, parents),
+            "required": repr(option.required),
+            "multiple": repr(option.multiple),
+            "help": _to_source(option.help),
+        }
+        lines = ["    click.Option(", f"        {_to_source(decls)},"]
+        lines.extend(f"        {key}={value}," for key, value in arguments.items())
+        lines.append("    ),")
+        return "\n".join(lines)
+
+    def _render_type(self, click_type: click.ParamType, parents: tuple[str, ...]) -> str:
+        actual_type = click_type.actual_type if isinstance(click_type, PydanclickParamType) else click_type
+        for name in _SHARED_TYPE_NAMES:
+            if actual_type is getattr(click, name):
+                return f"wrap_type(click.{name})"
+        source: Optional[str] = None
+        if isinstance(actual_type, JsonParamType):
+            self.helpers.add("LazyJsonParamType")
+            source = f"LazyJsonParamType({self.model_name}, {_to_source(parents)})"
+        elif isinstance(actual_type, (click.IntRange, click.FloatRange)):
+            source = _render_call(
+                f"click.{type(actual_type).__name__}",
+                min=actual_type.min,
+                max=actual_type.max,
+                min_open=actual_type.min_open,
+                max_open=actual_type.max_open,
+                clamp=actual_type.clamp,
+            )
+        elif isinstance(actual_type, click.Choice):
+            source = _render_call("click.Choice", actual_type.choices, case_sensitive=actual_type.case_sensitive)
+        elif isinstance(actual_type, click.DateTime):
+            source = _render_call("click.DateTime", list(actual_type.formats))
+        elif isinstance(actual_type, click.Path) and actual_type.type is pathlib.Path:
+            self.imports.add("import pathlib")
+            source = "click.Path(path_type=pathlib.Path)"
+        if source is not None:
+            return f"wrap_type({source})"
+        self.helpers.add("type_from_field")
+        return f"type_from_field({self.model_name}, {_to_source(parents)})"
+
+    def _render_default(self, default: Any, parents: tuple[str, ...]) -> str:
+        if isinstance(default, PydanclickDefaultCallable):
+            self.helpers.update(("PydanclickDefaultCallable", "field_info"))
+            return f"PydanclickDefaultCallable(field_info({self.model_name}, {_to_source(parents)}).default_factory)"
+        if isinstance(default, PydanclickDefault):
+            self.helpers.add("PydanclickDefault")
+            value = _render_literal(default._default)
+            if value is None:
+                self.helpers.add("field_info")
+                value = f"field_info({self.model_name}, {_to_source(parents)}).default"
+            return f"PydanclickDefault({value})"
+        value = _render_literal(default)
+        if value is None:
+            raise ValueError(f"Can't render default value {default!r} of field {'.'.join(parents)}")
+        return value
+
+
+def _render_literal(value: Any) -> Optional[str]:
+    """Render `value` as code, if it is a literal (e.g. a number, a string or a list of strings)."""
+    source = _to_source(value)
+    try:
+        evaluated = ast.literal_eval(source)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return None
+    if type(evaluated) is not type(value) or evaluated != value:
+        return None
+    return source
+
+
+def _render_call(function: str, *args: Any, **kwargs: Any) -> Optional[str]:
+    """Render a function call as code, if all arguments are literals."""
+    arguments = [_render_literal(arg) for arg in args]
+    for key, value in kwargs.items():
+        rendered_value = _render_literal(value)
+        arguments.append(f"{key}={rendered_value}" if rendered_value is not None else None)
+    if any(argument is None for argument in arguments):
+        return None
+    return f"{function}({', '.join(cast(list[str], arguments))})"
+
+
+def _to_source(value: Any) -> str:
+    """Same as `repr()`, except that strings use double quotes where possible, as code formatters do.
+
+    >>> print(_to_source({"a": ("b",), "it's": ['"c"']}))
+    {"a": ("b",), "it's": ['"c"']}
+    """
+    if isinstance(value, str):
+        source = repr(value)
+        return f'"{source[1:-1]}"' if source.startswith("'") and '"' not in value else source
+    if isinstance(value, list):
+        return "[" + ", ".join(map(_to_source, value)) + "]"
+    if isinstance(value, tuple):
+        return "(" + ", ".join(map(_to_source, value)) + ("," if len(value) == 1 else "") + ")"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{_to_source(key)}: {_to_source(item)}" for key, item in value.items()) + "}"
+    return repr(value)
+
+
+def _render_dict(d: dict[Any, Any]) -> str:
+    """Render a dictionary with one item per line, as code formatters do with trailing commas."""
+    items = [f"        {_to_source(key)}: {_to_source(value)},\n" for key, value in d.items()]
+    return "{\n" + "".join(items) + "    }" if d else "{}"
+
+
+def _render_set(s: set[Any]) -> str:
+    """Render a set with one item per line, as code formatters do with trailing commas."""
+    items = [f"        {_to_source(item)},\n" for item in sorted(s)]
+    return "{\n" + "".join(items) + "    }" if s else "set()"
+
+
+def _render_imports(stdlib_imports: set[str], imports: dict[str, str]) -> list[str]:
+    """Render import statements in sections (standard library, third-party and first-party), sorted like isort.
+
+    Args:
+        stdlib_imports: imports from the standard library
+        imports: other imports, indexed by module name
+
+    Returns:
+        the lines of all sections, each followed by a blank line
+    """
+    third_party: list[str] = []
+    first_party: list[str] = []
+    for module_name, statement in imports.items():
+        (first_party if _is_first_party(module_name) else third_party).append(statement)
+    lines = []
+    for section in (list(stdlib_imports), third_party, first_party):
+        if section:
+            # Plain imports come first, then modules are sorted case-insensitively
+            lines.extend(sorted(section, key=lambda statement: (statement.startswith("from "), statement.lower())))
+            lines.append("")
+    return lines
+
+
+def _is_first_party(module_name: str) -> bool:
+    """Return True if a module belongs to the current project, i.e. if it isn't installed in `site-packages`."""
+    spec = importlib.util.find_spec(module_name.partition(".")[0])
+    locations = [spec.origin] if spec is not None and spec.origin else []
+    if spec is not None and spec.submodule_search_locations:
+        locations.extend(spec.submodule_search_locations)
+    return any(
+        not {"site-packages", "dist-packages"}.intersection(pathlib.Path(location).parts) for location in locations
+    )
@@ -1,14 +1,17 @@
 """Utilities to work with Click commands and options."""
 
+from collections.abc import Mapping, Sequence
 from typing import Any, Callable, Optional, TypeVar, Union
 
 import click
+from click.parser import OptionParser
 
 T = TypeVar("T")
 
 
 def add_options(
-    __f_or_opts: Union[Callable[..., Any], list[click.Option]], options: Optional[list[click.Option]] = None
+    __f_or_opts: Union[Callable[..., Any], Sequence[click.Parameter]],
+    options: Optional[Sequence[click.Parameter]] = None,
 ) -> Callable[..., Any]:
     """Add options to a Click command.
 
@@ -46,7 +49,7 @@ def add_options(
     return wrapper
 
 
-def _add_options(f: Callable[..., Any], options: list[click.Option]) -> Callable[..., Any]:
+def _add_options(f: Callable[..., Any], options: Sequence[click.Parameter]) -> Callable[..., Any]:
     """Add Click options to a callable or command.
 
     This is basically a copy of what the `@click.option()` decorator does (i.e. if `f` isn't a `click.Command`, add its
@@ -67,3 +70,71 @@ def _add_options(f: Callable[..., Any], options: list[click.Option]) -> Callable
             f.__click_params__ = []  # type: ignore[attr-defined]
         f.__click_params__.extend(ordered_options)  # type: ignore[attr-defined]
     return f
+
+
+class LazyOptions(click.Parameter):
+    """Placeholder for a list of options that are only created when the command is actually used.
+
+    When a command is resolved by Click (to parse its arguments, display its help or provide completions), the
+    placeholder replaces itself with the actual options in the command parameters. Until then, creating the options
+    (which may be expensive) is deferred: for example, running a sibling command or displaying the help of the parent
+    group never creates them.
+
+    Args:
+        factory: function returning the options. It will be called at most once
+        name: name of the placeholder. It is never exposed to the command callback
+    """
+
+    param_type_name = "lazy options"
+
+    def __init__(self, factory: Callable[[], list[click.Option]], name: str) -> None:
+        super().__init__([name], expose_value=False)
+        self._factory = factory
+        self._options: Optional[list[click.Option]] = None
+
+    def _parse_decls(self, decls: Sequence[str], expose_value: bool) -> tuple[Optional[str], list[str], list[str]]:
+        return decls[0], [], []
+
+    @property
+    def options(self) -> list[click.Option]:
+        """Actual options, created on first access."""
+        if self._options is None:
+            self._options = self._factory()
+        return self._options
+
+    def materialize(self, ctx: click.Context) -> list[click.Option]:
+        """Replace the placeholder with the actual options in the parameters of the current command.
+
+        Args:
+            ctx: current Click context
+
+        Returns:
+            the actual options
+        """
+        options = self.options
+        params = ctx.command.params
+        for i, param in enumerate(params):
+            if param is self:
+                params[i : i + 1] = options
+                break
+        return options
+
+    def add_to_parser(self, parser: OptionParser, ctx: click.Context) -> None:
+        for option in self.materialize(ctx):
+            option.add_to_parser(parser, ctx)
+
+    def handle_parse_result(
+        self, ctx: click.Context, opts: Mapping[str, Any], args: list[str]
+    ) -> tuple[Any, list[str]]:
+        for option in self.materialize(ctx):
+            _, args = option.handle_parse_result(ctx, opts, args)
+        return None, args
+
+    def get_usage_pieces(self, ctx: click.Context) -> list[str]:
+        return [piece for option in self.materialize(ctx) for piece in option.get_usage_pieces(ctx)]
+
+    def get_help_record(self, ctx: click.Context) -> Optional[tuple[str, str]]:
+        # Click formats the usage line before the options, so the placeholder has usually been replaced already. If
+        # not, the actual options will be listed the next time the help is formatted
+        self.materialize(ctx)
+        return None
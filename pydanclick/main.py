@@ -1,20 +1,24 @@
 import functools
+import io
+import os
 from collections.abc import Sequence
-from typing import Any, Callable, Literal, Optional, TypeVar, Union
+from typing import IO, TYPE_CHECKING, Any, Callable, Literal, Optional, TypeVar, Union
 
-from pydantic import BaseModel
+import click
 
-from pydanclick.command import add_options
-from pydanclick.model import convert_to_click
+from pydanclick.command import LazyOptions, add_options
 from pydanclick.types import _ParameterKwargs
 from pydanclick.utils import camel_case_to_snake_case
 
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
 T = TypeVar("T")
 
 
 def from_pydantic(
-    __var_or_model: Union[str, type[BaseModel]],
-    model: Optional[type[BaseModel]] = None,
+    __var_or_model: Union[str, type["BaseModel"]],
+    model: Optional[type["BaseModel"]] = None,
     *,
     exclude: Sequence[str] = (),
     rename: Optional[dict[str, str]] = None,
@@ -22,9 +26,20 @@ def from_pydantic(
     prefix: Optional[str] = None,
     parse_docstring: bool = True,
     docstring_style: Literal["google", "numpy", "sphinx"] = "google",
+    docstring_parser: Literal["griffe", "builtin"] = "griffe",
     extra_options: Optional[dict[str, _ParameterKwargs]] = None,
     ignore_unsupported: Optional[bool] = False,
     unpack_list: bool = False,
+    max_depth: Optional[int] = None,
+    validation: Literal["default", "flat", "pydantic-only", "click-trusted", "incremental"] = "default",
+    trusted: bool = False,
+    cache_dir: Union[str, "os.PathLike[str]", None] = None,
+    validator_cache_size: Optional[int] = None,
+    lazy: bool = False,
+    records: bool = False,
+    records_format: Literal["jsonl", "csv", "tsv"] = "jsonl",
+    records_chunk_size: int = 1000,
+    sweep: Optional[Literal["product", "zip"]] = None,
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator to add fields from a Pydantic model as options to a Click command.
 
@@ -39,11 +54,44 @@ def from_pydantic(
         parse_docstring: if True and `griffe` is installed, parse the docstring of the Pydantic model and pass argument
             documentation to the Click `help` option
         docstring_style: style of the docstring (`google`, `numpy` or `sphinx`). Ignored if `parse_docstring` is False
+        docstring_parser: `griffe` to parse docstrings with `griffe` (if installed), or `builtin` to use a faster
+            parser without dependencies, that only extracts attribute sections. Ignored if `parse_docstring` is False
         extra_options: a mapping from field names to a dictionary of options passed to the `click.option()` function
         ignore_unsupported: ignore unsupported model fields instead of raising
         unpack_list: if True, a list of nested models (e.g. `list[Foo]`) will be yield one command-line option for each
             field in the nested model. Each field can be specified multiple times. This API is experimental.
-
+        max_depth: if set, nested models deeper than `max_depth` (top-level fields have depth 1) are passed as a single
+            JSON option. Recursive models are always passed as JSON after their first occurrence
+        validation: `default` to build a nested dictionary from the parsed arguments, then validate it, or `flat` to
+            validate the parsed arguments directly with a validator compiled from the model (falls back to `default`
+            when the model doesn't support it, e.g. with `unpack_list=True`). `pydantic-only` and `click-trusted`
+            also validate flat arguments, but avoid converting values twice: with `pydantic-only`, Click passes raw
+            strings to Pydantic; with `click-trusted`, values already validated by Click aren't validated again.
+            `incremental` only validates again the sub-models whose arguments changed since the previous invocation
+            (e.g. in sweeps), and shares the others with the previous instance
+        trusted: if True, skip validation entirely (using `model_construct()`) when Click already guarantees the type
+            of every field, i.e. for flat models whose fields are strings, integers, floats, booleans, UUIDs, paths or
+            string literals, without constraints nor validators. This is checked when decorating the command: other
+            models fall back to `validation`
+        cache_dir: if set, cache the converted options in this directory, so that subsequent runs don't need to analyze
+            the model again. The cache is invalidated when the model, its source file or the arguments above change
+        validator_cache_size: if set, cache up to this number of model instances, and reuse them when the command is
+            invoked again with the same arguments (e.g. in batches). Mutable models are copied. Ignored for models
+            whose default factories may return different values
+        lazy: if True, defer the conversion of the model until Click actually uses the command (to parse its arguments,
+            show its help or complete it). Importing the module, running another command or displaying the help of the
+            parent group is then cheap
+        records: if True, add a `--<variable-name>-records FILE` option (e.g. `--config-records`), to read instances
+            from JSON Lines (use `-` to read from stdin). The decorated function is then invoked once per record, as
+            records are read. Options passed on the command line override the corresponding field of every record.
+            Since fields can be provided by records, options are never required
+        records_format: format of records: `jsonl` for JSON Lines, `csv` or `tsv` for tables whose header contains
+            dotted field names (e.g. `bar.baz.c`). Cells are converted like the corresponding options
+        records_chunk_size: number of records read at once from CSV and TSV files
+        sweep: if set, numerical and `Literal` options also accept lists (e.g. `--lr 0.1,0.01`) and, for numbers,
+            inclusive ranges (e.g. `--seed 1..100` or `--lr 0..1:0.1`). The decorated function is then invoked once
+            per combination of values: the cartesian product of all swept options with `product`, or their n-th values
+            together with `zip`. Combinations are generated lazily
 
     Returns:
         a decorator that adds options to a function
@@ -55,7 +103,8 @@ def from_pydantic(
     else:
         model = __var_or_model
         variable_name = camel_case_to_snake_case(model.__name__)
-    options, validator = convert_to_click(
+    convert = functools.partial(
+        _convert_to_click,
         model,
         exclude=exclude,
         rename=rename,
@@ -63,18 +112,171 @@ def from_pydantic(
         prefix=prefix,
         parse_docstring=parse_docstring,
         docstring_style=docstring_style,
+        docstring_parser=docstring_parser,
         extra_options=extra_options,
         ignore_unsupported=ignore_unsupported,
         unpack_list=unpack_list,
+        max_depth=max_depth,
+        validation=validation,
+        trusted=trusted,
+        cache_dir=cache_dir,
+        validator_cache_size=validator_cache_size,
     )
+    if lazy:
+        get_conversion: Callable[[], tuple[list[click.Option], Callable[..., Any]]]
+        get_conversion = lazy_convert = functools.lru_cache(maxsize=None)(convert)
+        options: Sequence[click.Parameter] = [
+            LazyOptions(lambda: _prepare_options(lazy_convert()[0], records, sweep), name=f"pydanclick_{variable_name}")
+        ]
+    else:
+        conversion = convert()
+        options = _prepare_options(conversion[0], records, sweep)
+        get_conversion = lambda: conversion
+    records_argument = f"pydanclick_{variable_name}_records"
+    records_option: Optional[click.Option] = None
+    if records:
+        records_option = click.Option(
+            [records_argument, _get_records_option_name(variable_name)],
+            type=click.File("rb", lazy=True),
+            help=f"Read {variable_name} from {_RECORDS_FORMAT_NAMES[records_format]} (- for stdin).",
+        )
+        options = [*options, records_option]
 
     def wrapper(f: Callable[..., T]) -> Callable[..., T]:
         @add_options(options)
         @functools.wraps(f)
         def wrapped(**kwargs: Any) -> T:
-            kwargs[variable_name] = validator(kwargs)
+            records_file = kwargs.pop(records_argument, None)
+            if sweep is not None and _has_sweeps(kwargs):
+                if records_file is not None:
+                    raise click.UsageError(f"Options of {variable_name} can't be swept when reading records")
+                _invoke_per_combination(f, variable_name, get_conversion()[1], kwargs, sweep)
+                return None  # type: ignore[return-value]
+            if records_file is not None:
+                _invoke_per_record(
+                    f,
+                    variable_name,
+                    get_conversion(),
+                    records_file,
+                    kwargs,
+                    param=records_option,
+                    records_format=records_format,
+                    chunk_size=records_chunk_size,
+                )
+                return None  # type: ignore[return-value]
+            kwargs[variable_name] = get_conversion()[1](kwargs)
             return f(**kwargs)
 
         return wrapped  # type: ignore[no-any-return]
 
     return wrapper
+
+
+_RECORDS_FORMAT_NAMES = {
+    "jsonl": "JSON Lines (one JSON object per line)",
+    "csv": "a CSV file with dotted field names as header",
+    "tsv": "a TSV file with dotted field names as header",
+}
+
+
+def _prepare_options(
+    options: list[click.Option], records: bool, sweep: Optional[Literal["product", "zip"]]
+) -> list[click.Option]:
+    if records:
+        for option in options:
+            option.required = False
+    if sweep is not None:
+        from pydanclick.sweep import enable_sweeps
+
+        enable_sweeps(options)
+    return options
+
+
+def _get_records_option_name(variable_name: str) -> str:
+    """Return the name of the option reading records for the model passed to `variable_name`.
+
+    >>> _get_records_option_name("my_config")
+    '--my-config-records'
+    """
+    return "--" + variable_name.replace("_", "-") + "-records"
+
+
+def _invoke_per_record(
+    f: Callable[..., Any],
+    variable_name: str,
+    conversion: tuple[list[click.Option], Any],
+    records_file: IO[Any],
+    kwargs: dict[str, Any],
+    *,
+    param: Optional[click.Parameter],
+    records_format: str,
+    chunk_size: int,
+) -> None:
+    """Call `f` once per record, with explicit options as overrides."""
+    from pydanclick.records import (
+        RecordValidator,
+        get_explicit_kwargs,
+        iter_csv_records,
+        iter_records,
+        parse_json_kwargs,
+    )
+
+    ctx = click.get_current_context()
+    options, validator = conversion
+    explicit_kwargs = get_explicit_kwargs(ctx, validator, kwargs)
+    if records_format == "jsonl":
+        # Raw JSON strings (with `validation="pydantic-only"`) are merged into records as parsed values
+        overrides = validator.unflatten(parse_json_kwargs(validator, explicit_kwargs, options))
+        validate = RecordValidator(validator.model, overrides)
+        instances = iter_records(records_file, validate, param=param)
+        for instance in instances:
+            f(**kwargs, **{variable_name: instance})
+        return
+    # The csv module handles line endings itself, e.g. in quoted cells spanning several lines
+    text_file = io.TextIOWrapper(records_file, encoding="utf-8", newline="")
+    try:
+        instances = iter_csv_records(
+            text_file,
+            validator,
+            options,
+            delimiter="\t" if records_format == "tsv" else ",",
+            overrides=explicit_kwargs,
+            chunk_size=chunk_size,
+            ctx=ctx,
+            param=param,
+        )
+        for instance in instances:
+            f(**kwargs, **{variable_name: instance})
+    finally:
+        # Leave the file to Click, which closes it unless it's the standard input
+        text_file.detach()
+
+
+def _has_sweeps(kwargs: dict[str, Any]) -> bool:
+    from pydanclick.sweep import has_sweeps
+
+    return has_sweeps(kwargs)
+
+
+def _invoke_per_combination(
+    f: Callable[..., Any],
+    variable_name: str,
+    validate: Callable[[dict[str, Any]], Any],
+    kwargs: dict[str, Any],
+    mode: Literal["product", "zip"],
+) -> None:
+    """Call `f` once per combination of swept values."""
+    from pydanclick.sweep import iter_sweep
+
+    for combination in iter_sweep(kwargs, mode):
+        # Validation removes the arguments of the model from `combination`, leaving the other arguments of `f`
+        instance = validate(combination)
+        f(**combination, **{variable_name: instance})
+
+
+def _convert_to_click(model: type["BaseModel"], **kwargs: Any) -> tuple[list[click.Option], Callable[..., Any]]:
+    # The conversion machinery (and Pydantic itself) is only imported when a model is actually converted, which can be
+    # deferred with `lazy=True`
+    from pydanclick.model import convert_to_click
+
+    return convert_to_click(model, **kwargs)
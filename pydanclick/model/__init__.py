@@ -1,5 +1,26 @@
 """Analyze a Pydantic model and turn it into Click options."""
 
-from pydanclick.model.model_conversion import convert_to_click
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pydanclick.model.model_conversion import convert_to_click
 
 __all__ = ("convert_to_click",)
+
+# Public names are imported on first access, so that submodules (e.g. `validation`, used by generated modules) can be
+# imported without the conversion machinery
+_LAZY_IMPORTS = {"convert_to_click": "pydanclick.model.model_conversion"}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,170 @@
+"""Persist the result of a model conversion on disk, to skip field collection on warm starts.
+
+Cache entries are keyed by a fingerprint of the model, which includes:
+
+- the Pydantic core schema of the model (field names, types, defaults, validators...)
+- the docstring and the source file (modification time and size) of every model referenced by the schema
+- the arguments passed to `convert_to_click`
+- the versions of Python, Pydantic, Click and pydanclick (cached options are restored without calling `__init__`)
+
+Entries are stored as pickle files. The cache directory must therefore be trusted: never point it to a location other
+users can write to.
+"""
+
+import functools
+import hashlib
+import importlib.metadata
+import os
+import pickle
+import re
+import sys
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+import click
+import pydantic
+from pydantic import BaseModel
+
+from pydanclick.types import ArgumentName, DottedFieldName
+
+# Bump this whenever the structure of cached entries changes
+_CACHE_VERSION = 1
+_ADDRESS_PATTERN = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+class CachedConversion(NamedTuple):
+    """Represent the result of a model conversion, as stored on disk.
+
+    Attributes:
+        options: Click options created from the model fields
+        qualified_names: mapping from argument names to dotted field names
+        unpacked_names: dotted names of the fields to unpack
+    """
+
+    options: list[click.Option]
+    qualified_names: dict[ArgumentName, DottedFieldName]
+    unpacked_names: set[DottedFieldName]
+
+
+def get_cache_key(model: type[BaseModel], arguments: dict[str, Any]) -> str:
+    """Compute the fingerprint of a model and of the arguments used to convert it.
+
+    Args:
+        model: Pydantic model
+        arguments: arguments passed to `convert_to_click`. Their representation must be stable across processes: memory
+            addresses (e.g. in the representation of functions) are ignored
+
+    Returns:
+        a hexadecimal digest
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((_CACHE_VERSION, pydantic.VERSION, sys.version_info[:2], _get_versions())).encode())
+    schema = model.__pydantic_core_schema__
+    digest.update(_stable_repr(schema).encode())
+    for cls in _iter_schema_classes(schema):
+        digest.update(repr((cls.__module__, cls.__qualname__, cls.__doc__, _get_source_stat(cls))).encode())
+    digest.update(_stable_repr(arguments).encode())
+    return digest.hexdigest()
+
+
+def load(cache_dir: Union[str, "os.PathLike[str]"], key: str) -> Optional[CachedConversion]:
+    """Load a conversion result from the cache.
+
+    Args:
+        cache_dir: cache directory
+        key: cache key, as returned by `get_cache_key()`
+
+    Returns:
+        the cached conversion, or None if it isn't in the cache (or can't be loaded)
+    """
+    try:
+        with open(_get_cache_path(cache_dir, key), "rb") as f:
+            conversion = pickle.load(f)  # noqa: S301
+    except Exception:
+        # A missing, corrupted or outdated entry should never prevent the command from running
+        return None
+    if not isinstance(conversion, CachedConversion):
+        return None
+    return conversion
+
+
+def store(cache_dir: Union[str, "os.PathLike[str]"], key: str, conversion: CachedConversion) -> bool:
+    """Store a conversion result in the cache.
+
+    Args:
+        cache_dir: cache directory. It will be created if needed
+        key: cache key, as returned by `get_cache_key()`
+        conversion: conversion result to store
+
+    Returns:
+        True if the entry was written, False if it couldn't be serialized (e.g. a field uses a type or a default
+            factory defined inside a function) or written
+    """
+    try:
+        data = pickle.dumps(conversion, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return False
+    path = _get_cache_path(cache_dir, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so that concurrent processes never read a partially written entry
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{key}.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        return False
+    return True
+
+
+def _get_cache_path(cache_dir: Union[str, "os.PathLike[str]"], key: str) -> Path:
+    return Path(cache_dir) / f"{key}.pickle"
+
+
+def _stable_repr(obj: Any) -> str:
+    """Return the representation of `obj`, without memory addresses."""
+    return _ADDRESS_PATTERN.sub("", repr(obj))
+
+
+def _iter_schema_classes(schema: Any) -> Iterator[type]:
+    """Iterate over the classes (models, dataclasses...) referenced by a core schema."""
+    if isinstance(schema, dict):
+        cls = schema.get("cls")
+        if isinstance(cls, type):
+            yield cls
+        for value in schema.values():
+            yield from _iter_schema_classes(value)
+    elif isinstance(schema, (list, tuple)):
+        for value in schema:
+            yield from _iter_schema_classes(value)
+
+
+@functools.cache
+def _get_versions() -> tuple[Any, ...]:
+    """Return the installed versions of Click and pydanclick.
+
+    When pydanclick isn't installed (e.g. when running from a source checkout), its source files are fingerprinted instead.
+    """
+    try:
+        pydanclick_version: Any = importlib.metadata.version("pydanclick")
+    except importlib.metadata.PackageNotFoundError:
+        package_dir = Path(__file__).parent.parent
+        pydanclick_version = sorted(
+            (str(path.relative_to(package_dir)), path.stat().st_mtime_ns, path.stat().st_size)
+            for path in package_dir.rglob("*.py")
+        )
+    return importlib.metadata.version("click"), pydanclick_version
+
+
+def _get_source_stat(cls: type) -> Optional[tuple[int, int]]:
+    """Return the modification time and size of the file where `cls` is defined, if any."""
+    filename = getattr(sys.modules.get(cls.__module__), "__file__", None)
+    if not filename:
+        return None
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -1,29 +1,127 @@
-"""Extract attribute documentation from docstrings."""
+"""Extract attribute documentation from docstrings.
 
-from typing import Literal
+Two parsers are available:
+
+- `griffe` (default): relies on the optional dependency `griffe`, which supports the full docstring syntax
+- `builtin`: a lightweight parser that only extracts attribute sections. It has no dependency and is much faster, and
+    follows the same rules as `griffe` for attribute sections
+"""
+
+import inspect
+import re
+import textwrap
+import weakref
+from typing import Literal, Optional
 
 from pydantic import BaseModel
 from typing_extensions import TypeAlias
 
-from pydanclick.types import FieldName
+from pydanclick.types import CacheInfo, FieldName
 
 DocstringStyle: TypeAlias = Literal["google", "numpy", "sphinx"]
+DocstringParser: TypeAlias = Literal["griffe", "builtin"]
+
+# Models are weakly referenced, so that models created dynamically (e.g. in tests) can still be garbage-collected
+_cache: "weakref.WeakKeyDictionary[type[BaseModel], dict[tuple[DocstringStyle, DocstringParser], dict[FieldName, str]]]" = weakref.WeakKeyDictionary()
+_hits = 0
+_misses = 0
 
 
 def parse_attribute_documentation(
-    model_cls: type[BaseModel], docstring_style: DocstringStyle = "google"
+    model_cls: type[BaseModel], docstring_style: DocstringStyle = "google", docstring_parser: DocstringParser = "griffe"
 ) -> dict[FieldName, str]:
     """Parse the docstring of a `BaseModel` and returns a mapping from field name to their documentation.
 
-    Requires the optional dependency `griffe`. If it is not installed, returns an empty dictionary.
+    With the `griffe` parser, requires the optional dependency `griffe`. If it is not installed, returns an empty
+    dictionary.
+
+    Results are cached per model, docstring style and parser: the returned dictionary is shared between calls and must
+    not be modified. See `docstring_cache_info()` and `clear_docstring_cache()`.
 
     Args:
         model_cls: base model to parse
         docstring_style: docstring style (see `griffe` documentation for details)
+        docstring_parser: parser to use, either `griffe` or `builtin`
 
     Returns:
         a mapping from field name to their documentation. Only documented fields will be present
     """
+    global _hits, _misses
+    cached_docstrings = _cache.setdefault(model_cls, {})
+    key = (docstring_style, docstring_parser)
+    if key in cached_docstrings:
+        _hits += 1
+        return cached_docstrings[key]
+    _misses += 1
+    if docstring_parser == "builtin":
+        fields = _parse_with_builtin_parser(model_cls.__doc__ or "", docstring_style)
+    else:
+        fields = _parse_with_griffe(model_cls.__doc__ or "", docstring_style)
+    cached_docstrings[key] = fields
+    return fields
+
+
+class LazyDocumentation:
+    """Documentation of a model field, only parsed from the model docstring when it is actually needed.
+
+    Docstrings are only useful to display help, so there is no need to parse them when running a command normally.
+
+    Args:
+        model_cls: model containing the field
+        field_name: name of the field in the model
+        docstring_style: docstring style of the model
+        docstring_parser: parser to use
+    """
+
+    __slots__ = ("docstring_parser", "docstring_style", "field_name", "model_cls")
+
+    def __init__(
+        self,
+        model_cls: type[BaseModel],
+        field_name: FieldName,
+        docstring_style: DocstringStyle = "google",
+        docstring_parser: DocstringParser = "griffe",
+    ) -> None:
+        self.model_cls = model_cls
+        self.field_name = field_name
+        self.docstring_style = docstring_style
+        self.docstring_parser = docstring_parser
+
+    def resolve(self) -> Optional[str]:
+        """Parse the model docstring (if not already done) and return the documentation of the field, if any."""
+        return parse_attribute_documentation(
+            self.model_cls, docstring_style=self.docstring_style, docstring_parser=self.docstring_parser
+        ).get(self.field_name)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyDocumentation):
+            other = other.resolve()
+        return self.resolve() == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.model_cls.__name__}.{self.field_name})"
+
+    def __reduce__(self) -> tuple[object, ...]:
+        return self.__class__, (self.model_cls, self.field_name, self.docstring_style, self.docstring_parser)
+
+
+def docstring_cache_info() -> CacheInfo:
+    """Return statistics about the cache used by `parse_attribute_documentation()`."""
+    return CacheInfo(
+        hits=_hits, misses=_misses, maxsize=None, currsize=sum(len(docstrings) for docstrings in _cache.values())
+    )
+
+
+def clear_docstring_cache() -> None:
+    """Clear the cache used by `parse_attribute_documentation()` and reset its statistics."""
+    global _hits, _misses
+    _cache.clear()
+    _hits = _misses = 0
+
+
+def _parse_with_griffe(docstring: str, docstring_style: DocstringStyle) -> dict[FieldName, str]:
     try:
         import logging
 
@@ -33,9 +131,8 @@ def parse_attribute_documentation(
         logging.getLogger("griffe.agents.nodes").disabled = True
     except ImportError:
         return {}
-    docstring = Docstring(model_cls.__doc__ or "").parse(docstring_style)
     fields = {}
-    for section in docstring:
+    for section in Docstring(docstring).parse(docstring_style):
         if not isinstance(section, DocstringSectionAttributes):
             continue
         for attribute in section.value:
@@ -43,3 +140,168 @@ def parse_attribute_documentation(
                 continue
             fields[FieldName(attribute.name)] = attribute.description
     return fields
+
+
+def _parse_with_builtin_parser(docstring: str, docstring_style: DocstringStyle) -> dict[FieldName, str]:
+    lines = inspect.cleandoc(docstring.rstrip()).split("\n")
+    if docstring_style == "numpy":
+        return _parse_numpy_attributes(lines)
+    if docstring_style == "sphinx":
+        return _parse_sphinx_attributes(lines)
+    return _parse_google_attributes(lines)
+
+
+def _is_empty_line(line: str) -> bool:
+    return not line.strip()
+
+
+_GOOGLE_SECTION_PATTERN = re.compile(r"^(?P<type>[\w][\s\w-]*):(\s+(?P<title>[^\s].*))?\s*$", re.IGNORECASE)
+
+
+def _parse_google_attributes(lines: list[str]) -> dict[FieldName, str]:
+    """Extract attributes from a Google-style docstring.
+
+    >>> _parse_google_attributes(["Summary.", "", "Attributes:", "    a: foo", "        bar", "    b (int): baz"])
+    {'a': 'foo\\nbar', 'b': 'baz'}
+    """
+    fields: dict[FieldName, str] = {}
+    in_code_block = False
+    offset = 0
+    while offset < len(lines):
+        line = lines[offset]
+        if line.lstrip(" ").startswith("```"):
+            in_code_block = not in_code_block
+        elif not in_code_block and (match := _GOOGLE_SECTION_PATTERN.match(line)):
+            has_next_line = offset < len(lines) - 1
+            has_next_lines = offset < len(lines) - 2
+            blank_line_above = offset == 0 or _is_empty_line(lines[offset - 1])
+            blank_line_below = has_next_line and _is_empty_line(lines[offset + 1])
+            blank_lines_below = has_next_lines and _is_empty_line(lines[offset + 2])
+            indented_line_below = has_next_line and not blank_line_below and lines[offset + 1].startswith(" ")
+            indented_lines_below = has_next_lines and not blank_lines_below and lines[offset + 2].startswith(" ")
+            if (
+                match.group("type").lower() == "attributes"
+                and (indented_line_below or indented_lines_below)
+                and blank_line_above
+                and not (indented_lines_below and blank_line_below)
+            ):
+                items, offset = _read_google_items(lines, offset + 1)
+                for item in items:
+                    name_with_type, separator, description = item[0].partition(":")
+                    if not separator:
+                        continue
+                    name = FieldName(name_with_type.split(" ", 1)[0])
+                    fields[name] = "\n".join([description.lstrip(), *item[1:]]).rstrip("\n")
+        offset += 1
+    return fields
+
+
+def _read_google_items(lines: list[str], offset: int) -> tuple[list[list[str]], int]:
+    """Read the items of a Google-style section starting at `offset`, and return the offset of its last line."""
+    while offset < len(lines) and _is_empty_line(lines[offset]):
+        offset += 1
+    if offset >= len(lines):
+        return [], offset
+    indent = len(lines[offset]) - len(lines[offset].lstrip())
+    if indent == 0:
+        return [], offset - 1
+    items = [[lines[offset][indent:]]]
+    offset += 1
+    while offset < len(lines):
+        line = lines[offset]
+        if _is_empty_line(line):
+            items[-1].append("")
+        elif line.startswith(" " * indent * 2):
+            items[-1].append(line[indent * 2 :])
+        elif line.startswith(" " * (indent + 1)):
+            items[-1].append(line.lstrip())
+        elif line.startswith(" " * indent):
+            items.append([line[indent:]])
+        else:
+            break
+        offset += 1
+    return items, offset - 1
+
+
+def _is_dash_line(line: str) -> bool:
+    return not _is_empty_line(line) and _is_empty_line(line.replace("-", ""))
+
+
+def _parse_numpy_attributes(lines: list[str]) -> dict[FieldName, str]:
+    """Extract attributes from a Numpy-style docstring.
+
+    >>> _parse_numpy_attributes(["Summary.", "", "Attributes", "----------", "a : int", "    foo", "b", "    bar"])
+    {'a': 'foo', 'b': 'bar'}
+    """
+    fields: dict[FieldName, str] = {}
+    in_code_block = False
+    offset = 0
+    while offset < len(lines) - 1:
+        line = lines[offset]
+        if line.lstrip(" ").startswith("```"):
+            in_code_block = not in_code_block
+        elif not in_code_block and line.lower() == "attributes" and _is_dash_line(lines[offset + 1]):
+            items, offset = _read_numpy_items(lines, offset + 2)
+            for item in items:
+                name = FieldName(item[0].split(":", 1)[0].strip() if ":" in item[0] else item[0])
+                fields[name] = textwrap.dedent("\n".join(item[1:]))
+        offset += 1
+    return fields
+
+
+def _read_numpy_items(lines: list[str], offset: int) -> tuple[list[list[str]], int]:
+    """Read the items of a Numpy-style section starting at `offset`, and return the offset of its last line."""
+    while offset < len(lines) and _is_empty_line(lines[offset]):
+        offset += 1
+    if offset >= len(lines):
+        return [], offset
+    items = [[lines[offset]]]
+    offset += 1
+    while offset < len(lines):
+        line = lines[offset]
+        if _is_empty_line(line):
+            items[-1].append("")
+        elif line.startswith(" " * 4):
+            items[-1].append(line[4:])
+        elif line.startswith(" "):
+            items[-1].append(line.lstrip())
+        elif offset + 1 < len(lines) and _is_dash_line(lines[offset + 1]):
+            break
+        else:
+            items.append([line])
+        offset += 1
+    return items, offset - 1
+
+
+_SPHINX_ATTRIBUTE_DIRECTIVES = (":var", ":ivar", ":cvar")
+
+
+def _parse_sphinx_attributes(lines: list[str]) -> dict[FieldName, str]:
+    """Extract attributes from a Sphinx-style docstring.
+
+    >>> _parse_sphinx_attributes(["Summary.", "", ":ivar a: foo", "    bar", ":vartype a: int", ":cvar b: baz"])
+    {'a': 'foo bar', 'b': 'baz'}
+    """
+    fields: dict[FieldName, str] = {}
+    offset = 0
+    while offset < len(lines):
+        line = lines[offset]
+        if not line.startswith(":"):
+            offset += 1
+            continue
+        # Directives span until the next line starting with a colon
+        block = [line.lstrip()]
+        offset += 1
+        while offset < len(lines) and not lines[offset].startswith(":"):
+            block.append(lines[offset].lstrip())
+            offset += 1
+        if line.startswith(":vartype") or not line.startswith(_SPHINX_ATTRIBUTE_DIRECTIVES):
+            continue
+        try:
+            _, directive, value = " ".join(block).rstrip("\n").split(":", 2)
+        except ValueError:
+            continue
+        directive_parts = directive.split(" ")
+        if len(directive_parts) == 2 and directive_parts[1] not in fields:
+            fields[FieldName(directive_parts[1])] = value.strip()
+    return fields
@@ -1,15 +1,14 @@
 """Collect fields from Pydantic models."""
 
 import dataclasses
-import re
-from collections.abc import Iterable
-from typing import Any, Literal, Optional, Union, get_args, get_origin
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, Literal, NamedTuple, Optional, Union, cast, get_args, get_origin
 
 from pydantic import BaseModel
 from pydantic.fields import FieldInfo
 from typing_extensions import TypeGuard
 
-from pydanclick.model.docstrings import parse_attribute_documentation
+from pydanclick.model.docstrings import DocstringParser, LazyDocumentation
 from pydanclick.types import DottedFieldName, FieldName
 
 
@@ -22,7 +21,8 @@ class _Field:
         dotted_name: dotted name of the field (i.e. field name and all its parent names, joined with dots). From a user
             standpoint, this uniquely identifies the field within a nested model.
         field_info: Pydantic `FieldInfo` object representing the field
-        documentation: help string for the field, if available
+        documentation: help string for the field, if available. When extracted from the model docstring, it is only
+            parsed when needed: see `LazyDocumentation`
         parents: list of parent names for the field
         unpacked_from: name of the parent of this field. Only set for fields that are nested inside a list
     """
@@ -30,7 +30,7 @@ class _Field:
     name: FieldName
     dotted_name: DottedFieldName
     field_info: FieldInfo
-    documentation: Optional[str] = None
+    documentation: Union[str, LazyDocumentation, None] = None
     parents: tuple[FieldName, ...] = ()
     unpacked_from: Union[DottedFieldName, None] = None
 
@@ -51,9 +51,14 @@ def collect_fields(
     parse_docstring: bool = True,
     docstring_style: Literal["google", "numpy", "sphinx"] = "google",
     unpack_list: bool = False,
+    docstring_parser: DocstringParser = "griffe",
+    max_depth: Optional[int] = None,
 ) -> list[_Field]:
     """Collect fields (including nested ones) from a Pydantic model.
 
+    Recursive models are supported: a model that is already being expanded (i.e. that is one of the parents of the
+    current field) isn't expanded again. Instead, the field is kept as a single field, like fields of unsupported types.
+
     Args:
         obj: Pydantic model to collect fields from
         excluded_fields: fields to exclude. To exclude nested fields, use their dotted names, i.e. the field name and
@@ -62,23 +67,56 @@ def collect_fields(
         docstring_style: docstring style of the model. Ignored if `parse_docstring=False`
         unpack_list: if True, lists of submodel will yield the list of fields of said submodule (where each field can
             be specified multiple times)
+        docstring_parser: docstring parser to use (`griffe` or `builtin`). Ignored if `parse_docstring=False`
+        max_depth: if set, maximum nesting depth of collected fields (top-level fields have depth 1). Nested models
+            beyond this depth are kept as single fields
 
     Returns:
         a mapping from field dotted names to field objects. Each field object contains the Pydantic `FieldInfo`, as well
             as additional information, such as field parents, name of the argument mapped to the field, documentation
             and so on. See `_Field` for details.
     """
-    if excluded_fields:
-        excluded_pattern = r"^(" + "|".join(field.replace(".", "[.]") for field in excluded_fields) + r")\b"
-    else:
-        excluded_pattern = None
-    return [
-        option
-        for option in _collect_fields(
-            obj, docstring_style=docstring_style, parse_docstring=parse_docstring, unpack_list=unpack_list
+    return list(
+        _collect_fields(
+            obj,
+            docstring_style=docstring_style,
+            parse_docstring=parse_docstring,
+            unpack_list=unpack_list,
+            docstring_parser=docstring_parser,
+            exclusions=_ExclusionNode.from_dotted_names(excluded_fields) if excluded_fields else None,
+            max_depth=max_depth,
         )
-        if excluded_pattern is None or not re.search(excluded_pattern, option.dotted_name)
-    ]
+    )
+
+
+@dataclasses.dataclass
+class _ExclusionNode:
+    """Represent excluded fields as a trie of field names, so that excluded subtrees are never visited.
+
+    Attributes:
+        excluded: if True, the field represented by this node (and all its subfields) is excluded
+        children: nodes for the subfields containing excluded fields, by field name
+    """
+
+    excluded: bool = False
+    children: dict[str, "_ExclusionNode"] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_dotted_names(cls, dotted_names: Iterable[str]) -> "_ExclusionNode":
+        """Build a trie from dotted field names.
+
+        >>> root = _ExclusionNode.from_dotted_names(["foo", "bar.b"])
+        >>> root.children["foo"].excluded, root.children["bar"].excluded, root.children["bar"].children["b"].excluded
+        (True, False, True)
+
+        """
+        root = cls()
+        for dotted_name in dotted_names:
+            node = root
+            for part in dotted_name.split("."):
+                node = node.children.setdefault(part, cls())
+            node.excluded = True
+        return root
 
 
 def _iter_union(field_type: Any) -> list[type[Any]]:
@@ -103,70 +141,158 @@ def _is_pydantic_model(model: Any) -> TypeGuard[type[BaseModel]]:
         return False
 
 
+class _ModelField(NamedTuple):
+    """Represent a field of a model, independently of the path where the model appears."""
+
+    name: FieldName
+    field_info: FieldInfo
+    documentation: Union[LazyDocumentation, None]
+
+
+class _Frame(NamedTuple):
+    """Represent an object (model or field) waiting to be visited by `_collect_fields()`.
+
+    Attributes:
+        obj: model or field to visit
+        name: name of the field
+        parents: parent names of the field, including its own name
+        documentation: documentation of the field
+        unpack_list: if True, lists of models can be unpacked
+        unpacked_from: dotted name of the list this field is unpacked from, if any
+        exclusions: node of the exclusion trie matching `parents`, if any
+        ancestors: models being expanded on the path to this object
+    """
+
+    obj: Union[type[BaseModel], FieldInfo]
+    name: FieldName
+    parents: tuple[FieldName, ...]
+    documentation: Union[str, LazyDocumentation, None]
+    unpack_list: bool
+    unpacked_from: Optional[DottedFieldName]
+    exclusions: Optional[_ExclusionNode]
+    ancestors: tuple[type[BaseModel], ...]
+
+
 def _collect_fields(
     obj: Union[type[BaseModel], FieldInfo],
     name: FieldName = "",  # type: ignore[assignment]
     parents: tuple[FieldName, ...] = (),
-    documentation: Optional[str] = None,
+    documentation: Union[str, LazyDocumentation, None] = None,
     parse_docstring: bool = True,
     docstring_style: Literal["google", "numpy", "sphinx"] = "google",
     unpack_list: bool = False,
-) -> Iterable[_Field]:
-    """Recursively iterate over fields from a Pydantic model."""
-    if _is_pydantic_model(obj) or _is_pydantic_model(getattr(obj, "annotation", None)):
-        model: type[BaseModel]
-        model = obj if _is_pydantic_model(obj) else obj.annotation  # type: ignore[assignment, union-attr]
-        docstrings = parse_attribute_documentation(model, docstring_style=docstring_style) if parse_docstring else {}
-        for field_name, field in model.model_fields.items():
-            field_name = FieldName(field_name)
-            documentation = docstrings.get(field_name, None)
-            yield from _collect_fields(
-                field,
-                name=field_name,
-                parents=(*parents, field_name),
-                documentation=documentation,
-                parse_docstring=parse_docstring,
-                unpack_list=unpack_list,
+    docstring_parser: DocstringParser = "griffe",
+    exclusions: Optional[_ExclusionNode] = None,
+    max_depth: Optional[int] = None,
+) -> Iterator[_Field]:
+    """Iterate over fields from a Pydantic model, depth-first.
+
+    Nested models are visited with an explicit stack rather than recursive calls, so that deeply nested models don't
+    exhaust the interpreter stack. Models that are already being expanded (recursive models) or that are nested deeper
+    than `max_depth` aren't expanded: the field holding them is yielded as is.
+
+    `exclusions` is the node of the exclusion trie matching `parents`, if any: excluded fields are skipped, without
+    visiting their subfields.
+    """
+    model_fields: dict[type[BaseModel], list[_ModelField]] = {}
+
+    def can_expand(model: type[BaseModel], frame: _Frame) -> bool:
+        return model not in frame.ancestors and (max_depth is None or len(frame.parents) < max_depth)
+
+    stack: list[Union[_Frame, _Field]] = [
+        _Frame(obj, name, parents, documentation, unpack_list, None, exclusions, ancestors=())
+    ]
+    while stack:
+        frame = stack.pop()
+        if isinstance(frame, _Field):
+            yield frame
+            continue
+        obj = frame.obj
+        model = obj if _is_pydantic_model(obj) else getattr(obj, "annotation", None)
+        if _is_pydantic_model(model) and (not isinstance(obj, FieldInfo) or can_expand(model, frame)):
+            # Models appearing at several paths are only analyzed once
+            if model not in model_fields:
+                model_fields[model] = _get_model_fields(model, parse_docstring, docstring_style, docstring_parser)
+            stack.extend(reversed(_expand_model(model, model_fields[model], frame)))
+        elif isinstance(obj, FieldInfo):
+            stack.extend(reversed(_expand_field(obj, frame, can_expand)))
+        else:
+            raise TypeError(f"Can't process {type(obj)}: {obj} is neither a `BaseModel`, nor a `FieldInfo`")
+
+
+def _expand_model(model: type[BaseModel], model_fields: list[_ModelField], frame: _Frame) -> list[_Frame]:
+    """Return the frames to visit for the (non-excluded) fields of `model`."""
+    children = []
+    for model_field in model_fields:
+        field_exclusions = frame.exclusions.children.get(model_field.name) if frame.exclusions else None
+        if field_exclusions is not None and field_exclusions.excluded:
+            continue
+        children.append(
+            _Frame(
+                model_field.field_info,
+                name=model_field.name,
+                parents=(*frame.parents, model_field.name),
+                documentation=model_field.documentation,
+                unpack_list=frame.unpack_list,
+                unpacked_from=frame.unpacked_from,
+                exclusions=field_exclusions,
+                ancestors=(*frame.ancestors, model),
             )
-    elif isinstance(obj, FieldInfo):
-        if not name:
-            raise ValueError(f"Can't automatically infer a name from a field: {obj}")
-        dotted_name = DottedFieldName(".".join(parents))
-        if (
-            unpack_list
-            and get_origin(obj.annotation) is list
-            and len(args := get_args(obj.annotation)) == 1
-            and _is_pydantic_model(args[0])
-        ):
-            for collected_field in _collect_fields(
-                args[0],
-                name=name,
-                parents=parents,
-                documentation=documentation,
-                parse_docstring=parse_docstring,
-                # Cannot have unpacked model inside another unpacked model (unspecified behavior)
-                unpack_list=False,
-            ):
-                collected_field.unpacked_from = dotted_name
-                yield collected_field
-            return
-        for annotation in _iter_union(obj.annotation):
-            if _is_pydantic_model(annotation):
-                yield from _collect_fields(
-                    annotation,
-                    name=name,
-                    parents=parents,
-                    documentation=documentation,
-                    parse_docstring=parse_docstring,
-                    unpack_list=unpack_list,
-                )
-        # TODO: exclude base models from the union
-        yield _Field(
-            name=name,
+        )
+    return children
+
+
+def _expand_field(
+    field_info: FieldInfo, frame: _Frame, can_expand: Callable[[type[BaseModel], _Frame], bool]
+) -> list[Union[_Frame, _Field]]:
+    """Return the frames to visit for a field: unpacked models, models from unions and the field itself."""
+    if not frame.name:
+        raise ValueError(f"Can't automatically infer a name from a field: {field_info}")
+    dotted_name = DottedFieldName(".".join(frame.parents))
+    if (
+        frame.unpack_list
+        and get_origin(field_info.annotation) is list
+        and len(args := get_args(field_info.annotation)) == 1
+        and _is_pydantic_model(args[0])
+        and can_expand(args[0], frame)
+    ):
+        # Cannot have unpacked model inside another unpacked model (unspecified behavior)
+        return [frame._replace(obj=args[0], unpack_list=False, unpacked_from=dotted_name)]
+    children: list[Union[_Frame, _Field]] = [
+        frame._replace(obj=annotation)
+        for annotation in _iter_union(field_info.annotation)
+        if _is_pydantic_model(annotation) and can_expand(annotation, frame)
+    ]
+    # TODO: exclude base models from the union
+    children.append(
+        _Field(
+            name=frame.name,
             dotted_name=dotted_name,
-            parents=parents,
-            field_info=obj,
-            documentation=documentation,
+            parents=frame.parents,
+            field_info=field_info,
+            documentation=frame.documentation,
+            unpacked_from=frame.unpacked_from,
         )
-    else:
-        raise TypeError(f"Can't process {type(obj)}: {obj} is neither a `BaseModel`, nor a `FieldInfo`")
+    )
+    return children
+
+
+def _get_model_fields(
+    model: type[BaseModel],
+    parse_docstring: bool,
+    docstring_style: Literal["google", "numpy", "sphinx"],
+    docstring_parser: DocstringParser,
+) -> list[_ModelField]:
+    """List the fields of a model, with their (lazy) documentation."""
+    return [
+        _ModelField(
+            name=field_name,
+            field_info=field_info,
+            documentation=(
+                LazyDocumentation(model, field_name, docstring_style=docstring_style, docstring_parser=docstring_parser)
+                if parse_docstring
+                else None
+            ),
+        )
+        for field_name, field_info in cast(dict[FieldName, FieldInfo], model.model_fields).items()
+    ]
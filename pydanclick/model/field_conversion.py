@@ -1,5 +1,6 @@
 """Convert Pydantic fields to Click options."""
 
+import inspect
 from typing import Any, Callable, Optional, TypeVar, Union
 
 import click
@@ -7,6 +8,7 @@ from pydantic import PydanticUserError
 from pydantic.fields import FieldInfo
 from pydantic_core import PydanticUndefined
 
+from pydanclick.model.docstrings import LazyDocumentation
 from pydanclick.model.field_collection import _Field
 from pydanclick.model.type_conversion import PydanclickDefault, PydanclickDefaultCallable, _get_type_from_field
 from pydanclick.types import ArgumentName, DottedFieldName, OptionName, _ParameterKwargs
@@ -145,7 +147,7 @@ def _get_option_from_field(
     argument_name: ArgumentName,
     option_name: str,
     field_info: FieldInfo,
-    documentation: Optional[str] = None,
+    documentation: Union[str, LazyDocumentation, None] = None,
     short_name: Optional[str] = None,
     option_kwargs: Optional[_ParameterKwargs] = None,
     multiple: bool = False,
@@ -172,14 +174,36 @@ def _get_option_from_field(
         "type": _get_type_from_field(field_info),
         "default": _get_default_value_from_field(field_info) if not multiple else [],
         "required": field_info.is_required(),
-        "help": documentation,
         "multiple": multiple,
     }
+    if not isinstance(documentation, LazyDocumentation):
+        kwargs["help"] = documentation
     if option_kwargs is not None:
         kwargs.update(option_kwargs)
+    if isinstance(documentation, LazyDocumentation) and "help" not in kwargs:
+        option = _LazyHelpOption(param_decls=param_decls, **kwargs)
+        option.help = documentation
+        return option
     return click.Option(param_decls=param_decls, **kwargs)
 
 
+class _LazyHelpOption(click.Option):
+    """Click option whose help string is only computed when it is first accessed (typically, to format help)."""
+
+    _help: Union[str, LazyDocumentation, None]
+
+    @property
+    def help(self) -> Optional[str]:
+        if isinstance(self._help, LazyDocumentation):
+            documentation = self._help.resolve()
+            self._help = inspect.cleandoc(documentation) if documentation else documentation
+        return self._help
+
+    @help.setter  # noqa: A003
+    def help(self, value: Union[str, LazyDocumentation, None]) -> None:
+        self._help = value
+
+
 def _get_default_value_from_field(field: FieldInfo) -> Union[Any, Callable[[], Any], None]:
     """Return the default value of `field`.
 
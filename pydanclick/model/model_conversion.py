@@ -1,16 +1,30 @@
 """Convert a Pydantic model to Click options, and provide function to convert Click arguments back to Pydantic."""
 
-import functools
+import os
 from collections.abc import Sequence
-from typing import Callable, Literal, Optional, TypeVar, cast
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional, TypeVar, Union, cast, get_args, get_origin
+from uuid import UUID
 
 import click
 from pydantic import BaseModel
+from pydantic.fields import FieldInfo
 
+from pydanclick.model import disk_cache
+from pydanclick.model.docstrings import DocstringParser
 from pydanclick.model.field_collection import collect_fields
 from pydanclick.model.field_conversion import convert_fields_to_options
-from pydanclick.model.validation import model_validate_kwargs
-from pydanclick.types import DottedFieldName, OptionName, _ParameterKwargs
+from pydanclick.model.type_conversion import PydanclickParamType, get_raw_type, is_json_type
+from pydanclick.model.validation import (
+    ConstructionPlan,
+    FlatValidationPlan,
+    IncrementalValidationPlan,
+    MemoizedValidationPlan,
+    ValidationMode,
+    ValidationPlan,
+    _is_deterministic,
+)
+from pydanclick.types import ArgumentName, DottedFieldName, OptionName, _ParameterKwargs
 
 T = TypeVar("T")
 M = TypeVar("M", bound=BaseModel)
@@ -25,9 +39,15 @@ def convert_to_click(
     prefix: Optional[str] = None,
     parse_docstring: bool = True,
     docstring_style: Literal["google", "numpy", "sphinx"] = "google",
+    docstring_parser: DocstringParser = "griffe",
     extra_options: Optional[dict[str, _ParameterKwargs]] = None,
     ignore_unsupported: Optional[bool] = False,
     unpack_list: bool = False,
+    max_depth: Optional[int] = None,
+    validation: ValidationMode = "default",
+    trusted: bool = False,
+    cache_dir: Union[str, "os.PathLike[str]", None] = None,
+    validator_cache_size: Optional[int] = None,
 ) -> tuple[list[click.Option], Callable[..., M]]:
     """Extract Click options from a Pydantic model.
 
@@ -57,16 +77,224 @@ def convert_to_click(
             models. Prefix won't be added to aliases or short option names.
         parse_docstring: if True, parse model docstring to extract field documentation
         docstring_style: docstring style of the model. Only used if `parse_docstring=True`
+        docstring_parser: docstring parser, either `griffe` (requires `griffe` to be installed) or `builtin` (faster,
+            but only supports attribute sections). Only used if `parse_docstring=True`
         extra_options: extra options to pass to `click.Option` for specific fields, as a mapping from dotted field names
             to option dictionary
         ignore_unsupported: ignore unsupported model fields instead of raising
         unpack_list: if True, a list of nested models (e.g. `list[Foo]`) will be yield one command-line option for each
             field in the nested model. Each field can be specified multiple times. This API is experimental.
+        max_depth: if set, maximum nesting depth of options (top-level fields have depth 1). Nested models beyond this
+            depth, as well as recursive models, yield a single option expecting a JSON string
+        validation: how parsed arguments are converted to a model instance. `default` builds the nested representation
+            of the model, then validates it. `flat` compiles a dedicated validator, that reads arguments directly from
+            the flat mapping of parsed arguments (models that don't support it fall back to `default`). With
+            `pydantic-only`, Click passes raw strings through (for numbers, dates, paths, UUIDs and JSON fields) and
+            values are only parsed by Pydantic. With `click-trusted`, values parsed by Click's JSON types aren't
+            validated again. Both imply `flat`. `incremental` remembers the previous call, and only validates again
+            the sub-models whose arguments changed (see `IncrementalValidationPlan`)
+        trusted: if True and Click already guarantees the type of every field, instantiate the model without
+            validation (with `model_construct()`). This is only the case for flat models whose fields are strings,
+            integers, floats, booleans, UUIDs, paths or string literals, without constraints nor validators. Other
+            models are validated according to `validation`
+        cache_dir: if set, store the conversion result in this directory, and reuse it as long as the model, its source
+            file and the conversion arguments don't change. Warm starts then skip field collection, docstring parsing
+            and type conversion. Only models whose types and defaults can be pickled are cached
+        validator_cache_size: if set, the validator caches up to this number of instances, and returns them (or a copy,
+            for mutable models) when called again with the same arguments (see `MemoizedValidationPlan`). Caching is
+            disabled for models whose default factories may return different values (e.g. `uuid4` or
+            `datetime.now`): only builtin collections and models are considered deterministic factories
 
     Returns:
         a pair `(options, validate)` where `options` is the list of Click options extracted from the model, and
             `validate` is a function that can instantiate a model from the list of arguments parsed by Click
     """
+    arguments: dict[str, Any] = {
+        "exclude": exclude,
+        "rename": rename,
+        "shorten": shorten,
+        "prefix": prefix,
+        "parse_docstring": parse_docstring,
+        "docstring_style": docstring_style,
+        "docstring_parser": docstring_parser,
+        "extra_options": extra_options,
+        "ignore_unsupported": ignore_unsupported,
+        "unpack_list": unpack_list,
+        "max_depth": max_depth,
+    }
+    if cache_dir is None:
+        conversion = _convert(model, **arguments)
+    else:
+        key = disk_cache.get_cache_key(model, arguments)
+        cached_conversion = disk_cache.load(cache_dir, key)
+        if cached_conversion is None:
+            conversion = _convert(model, **arguments)
+            disk_cache.store(cache_dir, key, conversion)
+        else:
+            conversion = cached_conversion
+    validator: ValidationPlan[M]
+    if trusted and _can_construct(model, conversion):
+        validator = ConstructionPlan(model, conversion.qualified_names)
+    else:
+        validator = _create_validator(model, conversion, validation)
+    if validator_cache_size is not None and _is_deterministic(model):
+        validator = MemoizedValidationPlan(validator, validator_cache_size)
+    return conversion.options, validator
+
+
+def _create_validator(
+    model: type[M], conversion: disk_cache.CachedConversion, validation: ValidationMode
+) -> ValidationPlan[M]:
+    """Create the validator for `validation` mode. Options may be updated to pass raw values (`pydantic-only`)."""
+    if validation == "default":
+        return ValidationPlan(model, conversion.qualified_names, conversion.unpacked_names)
+    if validation == "flat":
+        return FlatValidationPlan(model, conversion.qualified_names, conversion.unpacked_names)
+    if validation == "incremental":
+        return IncrementalValidationPlan(model, conversion.qualified_names, conversion.unpacked_names)
+    options = {cast(ArgumentName, option.name): option for option in conversion.options}
+    json_names = {name for name, option in options.items() if is_json_type(option.type)}
+    if validation == "click-trusted":
+        # JSON types validate values against the bare annotation, without the model config: fields with constraints
+        # or with a non-default config must be validated again
+        trusted_names = {
+            name
+            for name in (json_names if _has_default_config(model) else ())
+            if _is_trusted(model, conversion.qualified_names[name])
+        }
+        return FlatValidationPlan(
+            model, conversion.qualified_names, conversion.unpacked_names, trusted_names=trusted_names
+        )
+    # Strict fields reject raw strings: keep converting them with Click (JSON strings are parsed in JSON mode, where
+    # strict fields accept them)
+    raw_names = json_names | {
+        name for name, dotted_name in conversion.qualified_names.items() if not _is_strict(model, dotted_name)
+    }
+    plan = FlatValidationPlan(model, conversion.qualified_names, conversion.unpacked_names, json_names=json_names)
+    if not plan.is_flat:
+        # Raw values can't be handed over to Pydantic: keep converting them with Click
+        return ValidationPlan(model, conversion.qualified_names, conversion.unpacked_names)
+    for name in conversion.qualified_names:
+        option = options[name]
+        raw_type = get_raw_type(option.type)
+        if name in raw_names and raw_type is not None and not option.multiple:
+            option.type = raw_type
+    return plan
+
+
+def _get_field(model: type[BaseModel], dotted_name: DottedFieldName) -> Optional[tuple[type[BaseModel], FieldInfo]]:
+    """Return the field of a (possibly nested) model with the model declaring it, or None if it can't be resolved."""
+    *parents, name = dotted_name.split(".")
+    for parent in parents:
+        field = model.model_fields.get(parent)
+        annotation = field.annotation if field is not None else None
+        if not (isinstance(annotation, type) and issubclass(annotation, BaseModel)):
+            return None
+        model = annotation
+    field = model.model_fields.get(name)
+    return (model, field) if field is not None else None
+
+
+def _is_trusted(model: type[BaseModel], dotted_name: DottedFieldName) -> bool:
+    """Return True if the field at `dotted_name` has no metadata (e.g. constraints), nor config changing validation."""
+    declaration = _get_field(model, dotted_name)
+    return declaration is not None and not declaration[1].metadata and _has_default_config(declaration[0])
+
+
+def _is_strict(model: type[BaseModel], dotted_name: DottedFieldName) -> bool:
+    """Return True if the field at `dotted_name` is validated in strict mode (or can't be resolved)."""
+    declaration = _get_field(model, dotted_name)
+    if declaration is None:
+        return True
+    model, field = declaration
+    strict = [item.strict for item in field.metadata if getattr(item, "strict", None) is not None]
+    return strict[-1] if strict else bool(model.model_config.get("strict", False))
+
+
+def _has_default_config(model: type[BaseModel]) -> bool:
+    """Return True if the config of `model` doesn't change how values are validated (see `_TRUSTED_CONFIG`)."""
+    return all(model.model_config.get(setting, default) == default for setting, default in _TRUSTED_CONFIG.items())
+
+
+# Click types whose result has exactly the type of the corresponding field, and annotations they're used for
+_TRUSTED_TYPES: dict[Any, tuple[type[click.ParamType], ...]] = {
+    str: (click.types.StringParamType,),
+    int: (click.types.IntParamType,),
+    float: (click.types.FloatParamType,),
+    bool: (click.types.BoolParamType,),
+    UUID: (click.types.UUIDParameterType,),
+    Path: (click.Path,),
+}
+# Config settings that change how trusted types are validated, with their default value
+_TRUSTED_CONFIG: dict[str, Any] = {
+    "strict": False,
+    "str_strip_whitespace": False,
+    "str_to_lower": False,
+    "str_to_upper": False,
+    "str_min_length": 0,
+    "str_max_length": None,
+    "coerce_numbers_to_str": False,
+    "allow_inf_nan": True,
+    "validate_default": False,
+}
+
+
+def _can_construct(model: type[BaseModel], conversion: disk_cache.CachedConversion) -> bool:
+    """Return True if Click guarantees the type of every argument, so that `model` can be instantiated without validation.
+
+    Models with validators, nested models, constrained fields, or any field which isn't a string, an integer, a float, a
+    boolean, a UUID, a path or a literal of strings can't be trusted.
+    """
+    if conversion.unpacked_names or model.__pydantic_custom_init__ or model.__pydantic_root_model__:
+        return False
+    decorators = model.__pydantic_decorators__
+    if (
+        decorators.validators
+        or decorators.field_validators
+        or decorators.root_validators
+        or decorators.model_validators
+    ):
+        return False
+    if not _has_default_config(model):
+        return False
+    options = {option.name: option for option in conversion.options}
+    for argument_name, dotted_name in conversion.qualified_names.items():
+        field = model.model_fields.get(dotted_name)
+        if field is None or field.metadata or field.validate_default:
+            return False
+        annotation = field.annotation
+        if get_origin(annotation) is Union and field.default is None:
+            # Optional fields defaulting to None: None is never passed by Click
+            annotation = next((arg for arg in get_args(annotation) if arg is not type(None)), None)
+        param_type = options[argument_name].type
+        actual_type = param_type.actual_type if isinstance(param_type, PydanclickParamType) else None
+        if get_origin(annotation) is Literal:
+            trusted_types: tuple[type[click.ParamType], ...] = (click.Choice,)
+            if not all(isinstance(arg, str) for arg in get_args(annotation)):
+                return False
+        else:
+            trusted_types = _TRUSTED_TYPES.get(annotation, ())
+        if not trusted_types or options[argument_name].multiple or not isinstance(actual_type, trusted_types):
+            return False
+    return True
+
+
+def _convert(
+    model: type[BaseModel],
+    *,
+    exclude: Sequence[str],
+    rename: Optional[dict[str, str]],
+    shorten: Optional[dict[str, str]],
+    prefix: Optional[str],
+    parse_docstring: bool,
+    docstring_style: Literal["google", "numpy", "sphinx"],
+    docstring_parser: DocstringParser,
+    extra_options: Optional[dict[str, _ParameterKwargs]],
+    ignore_unsupported: Optional[bool],
+    unpack_list: bool,
+    max_depth: Optional[int],
+) -> disk_cache.CachedConversion:
+    """Collect fields from `model` and convert them to Click options (see `convert_to_click()` for arguments)."""
     # We're doing a lot of casting here, to convert regular strings provided by the user into specific string types
     # used internally to disambiguate the different names associated with a field (option, argument, dotted...)
     fields = collect_fields(
@@ -75,6 +303,8 @@ def convert_to_click(
         docstring_style=docstring_style,
         parse_docstring=parse_docstring,
         unpack_list=unpack_list,
+        docstring_parser=docstring_parser,
+        max_depth=max_depth,
     )
     qualified_names, options = convert_fields_to_options(
         fields,
@@ -85,7 +315,4 @@ def convert_to_click(
         ignore_unsupported=ignore_unsupported,
     )
     unpacked_names = {field.unpacked_from for field in fields if field.unpacked_from is not None}
-    validator = functools.partial(
-        model_validate_kwargs, model=model, qualified_names=qualified_names, unpacked_names=unpacked_names
-    )
-    return options, validator
+    return disk_cache.CachedConversion(options=options, qualified_names=qualified_names, unpacked_names=unpacked_names)
@@ -1,7 +1,6 @@
 """Convert Pydantic types to Click types."""
 
 import datetime
-import re
 from pathlib import Path
 from typing import Any, Literal, Optional, TypedDict, Union, cast, get_args, get_origin
 from uuid import UUID
@@ -11,8 +10,17 @@ from annotated_types import Ge, Gt, Le, Lt, SupportsGe, SupportsGt, SupportsLe,
 from pydantic import TypeAdapter, ValidationError
 from pydantic.fields import FieldInfo
 
+from pydanclick.types import CacheInfo
+from pydanclick.utils import LRUCache
+
 NoneType = type(None)
 
+# Annotations repeat a lot across fields and models: share type adapters and JSON types between them. Keys are field
+# annotations (type adapters are created without any config, so the annotation is the only input)
+_TYPE_CACHE_MAXSIZE = 1024
+_type_adapters: LRUCache[Any, TypeAdapter[Any]] = LRUCache(maxsize=_TYPE_CACHE_MAXSIZE)
+_custom_types: LRUCache[Any, click.ParamType] = LRUCache(maxsize=_TYPE_CACHE_MAXSIZE)
+
 
 class _RangeDict(TypedDict, total=False):
     """Represent arguments to `click.IntRange` or `click.FloatRange`."""
@@ -41,17 +49,190 @@ class PydanclickParamType(click.ParamType):
     def __getattr__(self, attr: Any) -> Any:
         return getattr(self._actual_type, attr)
 
+    def to_info_dict(self) -> dict[str, Any]:
+        # Click derives `param_type` from the class name: keep it the same for all wrapper classes
+        return {**super().to_info_dict(), "param_type": "Pydanclick"}
 
-def _get_pydanclick_type(field_type: click.ParamType) -> click.ParamType:
-    pydanclick_type: type[PydanclickParamType] = type(
-        "PydanclickParamType",
-        (
-            PydanclickParamType,
-            field_type.__class__,
-        ),
-        {},
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Rebuild wrappers from the wrapped type when unpickling, so that shared wrappers stay shared
+        return _get_pydanclick_type, (self._actual_type,)
+
+
+class JsonParamType(click.ParamType):
+    """Base class of the custom Click types that parse JSON strings."""
+
+    name = "JSON STRING"
+
+
+class _JsonAnnotationParamType(JsonParamType):
+    """Click type parsing JSON strings, and validating them against an annotation.
+
+    Args:
+        annotation: type annotation values are validated against
+    """
+
+    def __init__(self, annotation: Any) -> None:
+        self.annotation = annotation
+        # Build the type adapter eagerly, so that unsupported annotations are detected when creating options
+        self.type_adapter = _get_type_adapter(annotation)
+
+    def convert(self, value: Any, param: Optional[click.Parameter], ctx: Optional[click.Context]) -> Any:
+        try:
+            if isinstance(value, str):
+                return self.type_adapter.validate_json(value)
+            else:
+                return self.type_adapter.validate_python(value)
+        except ValidationError as e:
+            self.fail(str(e), param, ctx)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.annotation!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Share types (and type adapters) with the fields of the unpickling process
+        return _create_custom_type_from_annotation, (self.annotation,)
+
+
+class _PydanclickString(PydanclickParamType, click.types.StringParamType):
+    pass
+
+
+class _PydanclickInt(PydanclickParamType, click.types.IntParamType):
+    pass
+
+
+class _PydanclickFloat(PydanclickParamType, click.types.FloatParamType):
+    pass
+
+
+class _PydanclickBool(PydanclickParamType, click.types.BoolParamType):
+    pass
+
+
+class _PydanclickUUID(PydanclickParamType, click.types.UUIDParameterType):
+    pass
+
+
+class _PydanclickIntRange(PydanclickParamType, click.IntRange):
+    pass
+
+
+class _PydanclickFloatRange(PydanclickParamType, click.FloatRange):
+    pass
+
+
+class _PydanclickPath(PydanclickParamType, click.Path):
+    pass
+
+
+class _PydanclickDateTime(PydanclickParamType, click.DateTime):
+    pass
+
+
+class _PydanclickChoice(PydanclickParamType, click.Choice):
+    pass
+
+
+class _PydanclickJson(PydanclickParamType, _JsonAnnotationParamType):
+    pass
+
+
+# Wrapper classes, per wrapped Click type class. Wrappers of the types created by `_get_click_type_from_field()` are
+# defined above, so that they can be pickled by reference; classes for other types are created on demand
+_wrapper_classes: dict[type[click.ParamType], type[PydanclickParamType]] = {
+    wrapper_class.__bases__[1]: wrapper_class
+    for wrapper_class in (
+        _PydanclickString,
+        _PydanclickInt,
+        _PydanclickFloat,
+        _PydanclickBool,
+        _PydanclickUUID,
+        _PydanclickIntRange,
+        _PydanclickFloatRange,
+        _PydanclickPath,
+        _PydanclickDateTime,
+        _PydanclickChoice,
+        _PydanclickJson,
     )
-    return pydanclick_type(field_type)
+}
+# Wrappers of Click's immutable singleton types can themselves be shared
+_SHARED_TYPES = (click.INT, click.FLOAT, click.STRING, click.BOOL, click.UUID)
+_shared_wrappers: dict[int, PydanclickParamType] = {}
+
+
+def _get_pydanclick_type(field_type: click.ParamType) -> click.ParamType:
+    if any(field_type is shared_type for shared_type in _SHARED_TYPES):
+        wrapper = _shared_wrappers.get(id(field_type))
+        if wrapper is None:
+            wrapper = _shared_wrappers[id(field_type)] = _get_wrapper_class(field_type.__class__)(field_type)
+        return wrapper
+    return _get_wrapper_class(field_type.__class__)(field_type)
+
+
+def _get_wrapper_class(cls: type[click.ParamType]) -> type[PydanclickParamType]:
+    wrapper_class = _wrapper_classes.get(cls)
+    if wrapper_class is None:
+        wrapper_class = _wrapper_classes[cls] = type("PydanclickParamType", (PydanclickParamType, cls), {})
+    return wrapper_class
+
+
+class RawParamType(PydanclickParamType):
+    """Pass raw command-line values through, leaving all parsing to Pydantic.
+
+    The wrapped type is only used to render help and completions: its name and metavar are kept.
+    """
+
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return self._actual_type.name
+
+    def convert(self, value: Any, param: Optional[click.Parameter], ctx: Optional[click.Context]) -> Any:
+        if isinstance(value, PydanclickDefault):
+            return None
+        return value
+
+    def get_metavar(self, param: click.Parameter) -> Optional[str]:
+        return self._actual_type.get_metavar(param)
+
+    def shell_complete(self, ctx: click.Context, param: click.Parameter, incomplete: str) -> list[Any]:
+        return self._actual_type.shell_complete(ctx, param, incomplete)
+
+    def to_info_dict(self) -> dict[str, Any]:
+        return self._actual_type.to_info_dict()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self._actual_type,)
+
+
+# Click types whose conversion Pydantic can do by itself, from the raw string
+_RAW_TYPES = (
+    click.types.IntParamType,
+    click.types.FloatParamType,
+    click.IntRange,
+    click.FloatRange,
+    click.types.UUIDParameterType,
+    click.Path,
+    click.DateTime,
+)
+
+
+def get_raw_type(param_type: click.ParamType) -> Optional[RawParamType]:
+    """Return a type passing raw values through instead of `param_type`, or None if Pydantic can't parse them alone.
+
+    JSON types are supported, but their raw value must be parsed as JSON before validation (see `is_json_type()`).
+    Other types (such as strings, booleans and choices) are already cheap to convert, or drive Click's behavior.
+    """
+    actual_type = param_type.actual_type if isinstance(param_type, PydanclickParamType) else None
+    if actual_type is None or not isinstance(actual_type, (*_RAW_TYPES, JsonParamType)):
+        return None
+    return RawParamType(actual_type)
+
+
+def is_json_type(param_type: click.ParamType) -> bool:
+    """Return True if `param_type` (possibly wrapped) parses JSON strings."""
+    if isinstance(param_type, PydanclickParamType):
+        param_type = param_type.actual_type
+    return isinstance(param_type, JsonParamType)
 
 
 class PydanclickDefault:
@@ -72,6 +253,9 @@ class PydanclickDefault:
     def __repr__(self) -> Any:
         return repr(self._default)
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self._default,)
+
 
 class PydanclickDefaultCallable(PydanclickDefault):
     """Represents a callable default value in pydanclick"""
@@ -196,24 +380,28 @@ def _get_click_type_from_field(field: FieldInfo) -> click.ParamType:
 
 def _create_custom_type(field: FieldInfo) -> click.ParamType:
     """Create a custom Click type from a Pydantic field."""
-    name = "".join(part.capitalize() for part in re.split(r"\W", str(field.annotation)) if part)
-    type_adapter = TypeAdapter(cast(type[Any], field.annotation))
+    return _create_custom_type_from_annotation(field.annotation)
 
-    def convert(self, value, param, ctx):  # type: ignore[no-untyped-def]
-        try:
-            if isinstance(value, str):
-                return type_adapter.validate_json(value)
-            else:
-                return type_adapter.validate_python(value)
-        except ValidationError as e:
-            self.fail(str(e), param, ctx)
 
-    custom_type: type[click.ParamType] = type(
-        name,
-        (click.ParamType,),
-        {
-            "name": "JSON STRING",
-            "convert": convert,
-        },
-    )
-    return custom_type()
+def _create_custom_type_from_annotation(annotation: Any) -> click.ParamType:
+    """Get a custom Click type that validates JSON strings against `annotation`.
+
+    Types are cached by annotation (see `type_cache_info()`): fields sharing the same annotation share the same type.
+    """
+    return _custom_types.get_or_create(annotation, lambda: _JsonAnnotationParamType(annotation))
+
+
+def _get_type_adapter(annotation: Any) -> TypeAdapter[Any]:
+    """Get a (cached) type adapter for `annotation`."""
+    return _type_adapters.get_or_create(annotation, lambda: TypeAdapter(cast(type[Any], annotation)))
+
+
+def type_cache_info() -> dict[str, CacheInfo]:
+    """Return statistics about the caches of type adapters and custom Click types."""
+    return {"type_adapters": _type_adapters.info(), "custom_types": _custom_types.info()}
+
+
+def clear_type_cache() -> None:
+    """Clear the caches of type adapters and custom Click types, and reset their statistics."""
+    _type_adapters.clear()
+    _custom_types.clear()
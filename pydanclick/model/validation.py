@@ -6,21 +6,47 @@ Validation involves the following steps:
 - create a flat representation of the object (with nested field names separated by dots)
 - unflatten this representation
 - pass the nested representation to the `model_validate` method of the Pydantic model
+
+`ValidationPlan` does the same, but precomputes everything that only depends on the model (such as the path of each
+field in the nested representation), so that validating arguments doesn't involve any string processing.
+`FlatValidationPlan` skips the nested representation altogether, and validates the flat arguments directly.
+`ConstructionPlan` skips validation altogether, for flat models whose arguments are already validated by Click.
+`IncrementalValidationPlan` reuses the sub-models of the previous instance whose arguments didn't change.
+`MemoizedValidationPlan` caches the instances created by another plan, for repeated arguments.
 """
 
-from collections.abc import Iterable
+import datetime
+import functools
+import itertools
+from collections.abc import Collection, Hashable, Iterable, Iterator, Mapping
+from decimal import Decimal
 from itertools import zip_longest
-from typing import Any
+from pathlib import Path, PurePath
+from typing import Any, Generic, Literal, Optional, cast, get_args
+from uuid import UUID
 
-from pydantic import BaseModel
-from typing_extensions import TypeVar
+from pydantic import BaseModel, ValidationError
+from pydantic_core import (
+    CoreSchema,
+    ErrorDetails,
+    InitErrorDetails,
+    PydanticCustomError,
+    PydanticUndefined,
+    SchemaValidator,
+)
+from pydantic_core.core_schema import ErrorType
+from typing_extensions import TypeAlias, TypeVar
 
-from pydanclick.types import ArgumentName, DottedFieldName
+from pydanclick.model.type_conversion import _get_type_adapter
+from pydanclick.types import ArgumentName, CacheInfo, DottedFieldName
+from pydanclick.utils import LRUCache
 
 M = TypeVar("M", bound=BaseModel)
 V = TypeVar("V")
 K = TypeVar("K", bound=str)
 
+ValidationMode: TypeAlias = Literal["default", "flat", "pydantic-only", "click-trusted", "incremental"]
+
 
 def model_validate_kwargs(
     kwargs: dict[ArgumentName, Any],
@@ -60,6 +86,800 @@ def model_validate_kwargs(
     return model.model_validate(raw_model)
 
 
+class RecordValidationError(ValueError):
+    """Raised when one of several records is invalid (see `ValidationPlan.validate_many()`).
+
+    Attributes:
+        index: index of the invalid record
+        error: validation error of this record alone
+    """
+
+    def __init__(self, index: int, error: ValidationError) -> None:
+        super().__init__(f"Invalid record {index}: {error}")
+        self.index = index
+        self.error = error
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self.index, self.error)
+
+
+class ValidationPlan(Generic[M]):
+    """Instantiate a model from keyword arguments, like `model_validate_kwargs()`, with precomputed field paths.
+
+    Dotted field names are split once, when creating the plan, into a tree of nested dictionaries. Each call fills a
+    copy of this tree with the provided values: only nodes containing at least one value are created, and per-call work
+    is linear in the number of arguments.
+
+    >>> class Foo(BaseModel):
+    ...     a: int
+    >>> class Bar(BaseModel):
+    ...     b: Foo
+    ...     c: str = "c"
+    >>> plan = ValidationPlan(Bar, {"arg1": "b.a", "arg2": "c"})
+    >>> plan({"arg1": 1, "arg2": None})
+    Bar(b=Foo(a=1), c='c')
+
+    Args:
+        model: Pydantic model to instantiate
+        qualified_names: a mapping from argument names to corresponding dotted field names
+        unpacked_names: (dotted) field names to unpack, i.e. that are represented as a dict of lists and should be
+            turned into a list of dicts. As with `model_validate_kwargs()`, only top-level fields can be unpacked
+    """
+
+    def __init__(
+        self,
+        model: type[M],
+        qualified_names: Mapping[ArgumentName, DottedFieldName],
+        unpacked_names: Iterable[DottedFieldName] = (),
+    ) -> None:
+        self.model = model
+        self.qualified_names = dict(qualified_names)
+        self.unpacked_names = set(unpacked_names)
+        # Node 0 is the root. Every other node is represented by the index of its parent node and its key in the parent
+        node_indices: dict[tuple[str, ...], int] = {(): 0}
+        self._nodes: list[tuple[int, str]] = [(0, "")]
+        self._leaves: list[tuple[ArgumentName, int, str]] = []
+        for argument_name, dotted_name in self.qualified_names.items():
+            if not dotted_name:
+                raise ValueError("Empty keys are not supported")
+            *parents, key = dotted_name.split(".")
+            self._leaves.append((argument_name, self._get_node_index(tuple(parents), node_indices), key))
+        self._unpacked_keys = [name for name in self.unpacked_names if "." not in name]
+
+    def _get_node_index(self, path: tuple[str, ...], node_indices: dict[tuple[str, ...], int]) -> int:
+        if path not in node_indices:
+            parent_index = self._get_node_index(path[:-1], node_indices)
+            node_indices[path] = len(self._nodes)
+            self._nodes.append((parent_index, path[-1]))
+        return node_indices[path]
+
+    def __call__(self, kwargs: dict[ArgumentName, Any]) -> M:
+        """Instantiate the model from keyword arguments. Arguments matching a model field are removed from `kwargs`."""
+        return self.model.model_validate(self.unflatten(kwargs))
+
+    def validate_many(self, records: Iterable[dict[ArgumentName, Any]], chunk_size: int = 1000) -> Iterator[M]:
+        """Instantiate the model from many sets of keyword arguments, lazily.
+
+        Records are validated by chunks, each with a single call to Pydantic (e.g. a `TypeAdapter(list[Model])`),
+        which saves most of the per-record overhead. As with `__call__()`, arguments are removed from each record.
+
+        Args:
+            records: keyword arguments, as parsed by Click
+            chunk_size: number of records validated at once
+
+        Returns:
+            an iterator over model instances, in the same order as `records`
+
+        Raises:
+            RecordValidationError: if a record is invalid. Instances of the preceding records are yielded first
+        """
+        if chunk_size < 1:
+            raise ValueError(f"`chunk_size` must be positive, got {chunk_size}")
+        iterator = iter(records)
+        start = 0
+        while chunk := [self._prepare(record) for record in itertools.islice(iterator, chunk_size)]:
+            try:
+                instances = self._validate_chunk(chunk)
+            except ValidationError as e:
+                index = min(cast(int, error["loc"][0]) for error in e.errors())
+                yield from self._validate_chunk(chunk[:index])
+                try:
+                    self._validate_prepared(chunk[index])
+                except ValidationError as record_error:
+                    raise RecordValidationError(start + index, record_error) from None
+                raise  # pragma: no cover
+            yield from instances
+            start += len(chunk)
+
+    def _prepare(self, kwargs: dict[ArgumentName, Any]) -> Any:
+        """Convert keyword arguments into the input of the validator."""
+        return self.unflatten(kwargs)
+
+    def _validate_prepared(self, value: Any) -> M:
+        return self.model.model_validate(value)
+
+    def _validate_chunk(self, values: list[Any]) -> list[M]:
+        return _get_type_adapter(list[self.model]).validate_python(values)  # type: ignore[name-defined,no-any-return]
+
+    def unflatten(self, kwargs: dict[ArgumentName, Any]) -> dict[str, Any]:
+        """Create the nested representation of the model from keyword arguments.
+
+        Args:
+            kwargs: mapping from argument names to their values. Arguments matching a model field are removed from it
+
+        Returns:
+            a nested dictionary, to be passed to `model_validate()`
+        """
+        nodes: list[Optional[dict[str, Any]]] = [None] * len(self._nodes)
+        root: dict[str, Any] = {}
+        nodes[0] = root
+        for argument_name, node_index, key in self._leaves:
+            value = kwargs.pop(argument_name, None)
+            if value is None:
+                continue
+            node = nodes[node_index]
+            if node is None:
+                node = self._create_node(nodes, node_index)
+            node[key] = value
+        for key in self._unpacked_keys:
+            if key in root:
+                root[key] = _pack_dict(root[key])
+                # See `model_validate_kwargs()`: an empty list means nothing was passed
+                if not root[key]:
+                    del root[key]
+        return root
+
+    def _create_node(self, nodes: list[Optional[dict[str, Any]]], node_index: int) -> dict[str, Any]:
+        """Create a node, and link it to its parents (creating them if needed)."""
+        node: dict[str, Any] = {}
+        nodes[node_index] = node
+        parent_index, key = self._nodes[node_index]
+        parent = nodes[parent_index]
+        if parent is None:
+            parent = self._create_node(nodes, parent_index)
+        parent[key] = node
+        return node
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.model.__name__})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self.model, self.qualified_names, self.unpacked_names)
+
+
+class FlatValidationPlan(ValidationPlan[M]):
+    """Instantiate a model from keyword arguments, without creating a nested representation of the model.
+
+    The core schema of the model is compiled (on first call) into a dedicated validator, where each field reads its
+    value from the flat mapping of arguments: fields use their argument name as validation alias, and nested models use
+    a synthetic key, mapped to the flat mapping itself. Per call, the only allocation is the flat mapping of provided
+    values.
+
+    Results and errors are the same as with `ValidationPlan`: errors whose input is the flat mapping (e.g. missing
+    fields) report the nested representation instead, and fields with a validation alias ignore their argument (unless
+    they can be populated by name).
+
+    Some models can't be validated from a flat mapping: models with unpacked fields, models with `extra="allow"` or
+    `extra="forbid"` or with a custom `__init__`, and nested models with `before`, `wrap` or `plain` validators (which
+    would receive the flat mapping). These models fall back to `ValidationPlan`.
+
+    Arguments in `json_names` are expected to be raw JSON strings, and are parsed by Pydantic. Arguments in
+    `trusted_names` are expected to be already validated (e.g. by a Click type), and are not validated again, unless
+    their field has validators or constraints of its own.
+
+    >>> class Foo(BaseModel):
+    ...     a: int
+    >>> class Bar(BaseModel):
+    ...     b: Foo
+    ...     c: str = "c"
+    >>> plan = FlatValidationPlan(Bar, {"arg1": "b.a", "arg2": "c"})
+    >>> plan({"arg1": 1, "arg2": None})
+    Bar(b=Foo(a=1), c='c')
+    >>> plan.is_flat
+    True
+    """
+
+    def __init__(
+        self,
+        model: type[M],
+        qualified_names: Mapping[ArgumentName, DottedFieldName],
+        unpacked_names: Iterable[DottedFieldName] = (),
+        *,
+        json_names: Iterable[ArgumentName] = (),
+        trusted_names: Iterable[ArgumentName] = (),
+    ) -> None:
+        super().__init__(model, qualified_names, unpacked_names)
+        self.json_names = set(json_names)
+        self.trusted_names = set(trusted_names)
+        self._top_level_names: list[ArgumentName] = []
+        # For nested arguments, keys of the nested models containing them (innermost first)
+        self._nested_leaves: list[tuple[ArgumentName, list[str]]] = []
+        for argument_name, dotted_name in self.qualified_names.items():
+            parents = dotted_name.split(".")[:-1]
+            if parents:
+                node_keys = [_get_node_key(parents[:i]) for i in range(len(parents), 0, -1)]
+                self._nested_leaves.append((argument_name, node_keys))
+            else:
+                self._top_level_names.append(argument_name)
+        self._validator: Optional[SchemaValidator] = None
+        self._compiled_schema: Optional[dict[str, Any]] = None
+        self._many_validator: Optional[SchemaValidator] = None
+        self._compiled = False
+
+    @property
+    def is_flat(self) -> bool:
+        """Return True if the model can be validated from flat arguments, False if it falls back to `ValidationPlan`."""
+        return self._get_validator() is not None
+
+    def __call__(self, kwargs: dict[ArgumentName, Any]) -> M:
+        """Instantiate the model from keyword arguments. Arguments matching a model field are removed from `kwargs`."""
+        validator = self._get_validator()
+        if validator is None:
+            return super().__call__(kwargs)
+        return self._validate_flat(validator, self._flatten(kwargs))
+
+    def _flatten(self, kwargs: dict[ArgumentName, Any]) -> dict[str, Any]:
+        """Create the input of the compiled validator from keyword arguments."""
+        pop = kwargs.pop
+        values: dict[str, Any] = {
+            name: value for name in self._top_level_names if (value := pop(name, None)) is not None
+        }
+        for argument_name, node_keys in self._nested_leaves:
+            value = pop(argument_name, None)
+            if value is None:
+                continue
+            values[argument_name] = value
+            for node_key in node_keys:
+                if node_key in values:
+                    # Outer nodes have already been added, too
+                    break
+                values[node_key] = values
+        return values
+
+    def _prepare(self, kwargs: dict[ArgumentName, Any]) -> Any:
+        return super()._prepare(kwargs) if self._get_validator() is None else self._flatten(kwargs)
+
+    def _validate_prepared(self, value: Any) -> M:
+        validator = self._get_validator()
+        return super()._validate_prepared(value) if validator is None else self._validate_flat(validator, value)
+
+    def _validate_flat(self, validator: SchemaValidator, values: dict[str, Any]) -> M:
+        try:
+            return validator.validate_python(values)  # type: ignore[no-any-return]
+        except ValidationError as e:
+            raise self._clean_error(e, values) from None
+
+    def _clean_error(self, error: ValidationError, values: dict[str, Any]) -> ValidationError:
+        """Replace the flat mapping in errors (e.g. missing fields) with the nested representation of the same node."""
+        line_errors = error.errors()
+        if not any(line_error["input"] is values for line_error in line_errors):
+            return error
+        nested: dict[Any, Any] = self.unflatten({name: values[name] for name in self.qualified_names if name in values})
+        for line_error in line_errors:
+            if line_error["input"] is values:
+                # Missing fields are reported with the input of their model
+                path = line_error["loc"][:-1] if line_error["type"] == "missing" else line_error["loc"]
+                line_error["input"] = functools.reduce(lambda node, key: node.get(key, {}), path, nested)
+        return ValidationError.from_exception_data(error.title, list(map(_to_line_error, line_errors)))
+
+    def _validate_chunk(self, values: list[Any]) -> list[M]:
+        if self._get_validator() is None:
+            return super()._validate_chunk(values)
+        if self._many_validator is None:
+            # Same as the compiled validator, for lists of inputs
+            schema = cast(dict[str, Any], self._compiled_schema)
+            if schema["type"] == "definitions":
+                schema = {**schema, "schema": {"type": "list", "items_schema": schema["schema"]}}
+            else:
+                schema = {"type": "list", "items_schema": schema}
+            self._many_validator = SchemaValidator(schema)
+        return self._many_validator.validate_python(values)  # type: ignore[no-any-return]
+
+    def _get_validator(self) -> Optional[SchemaValidator]:
+        if not self._compiled:
+            self._validator = self._compile()
+            self._compiled = True
+        return self._validator
+
+    def _compile(self) -> Optional[SchemaValidator]:
+        if self.unpacked_names:
+            return None
+        schema = self.model.__pydantic_core_schema__
+        compiler = _FlatSchemaCompiler(self.qualified_names, schema, self.json_names, self.trusted_names)
+        self._compiled_schema = compiler.compile()
+        if self._compiled_schema is None:
+            return None
+        return SchemaValidator(self._compiled_schema)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return functools.partial(self.__class__, json_names=self.json_names, trusted_names=self.trusted_names), (
+            self.model,
+            self.qualified_names,
+            self.unpacked_names,
+        )
+
+
+def _to_line_error(error: ErrorDetails) -> InitErrorDetails:
+    """Convert an error reported by Pydantic back into an error that can be raised."""
+    if error["type"] in _ERROR_TYPES:
+        line_error = InitErrorDetails(type=cast(ErrorType, error["type"]), loc=error["loc"], input=error["input"])
+        if "ctx" in error:
+            line_error["ctx"] = error["ctx"]
+        return line_error
+    # Custom errors (raised by validators) are reported with their formatted message
+    return InitErrorDetails(
+        type=PydanticCustomError(error["type"], error["msg"]), loc=error["loc"], input=error["input"]
+    )
+
+
+_ERROR_TYPES = frozenset(get_args(ErrorType))
+
+
+class ConstructionPlan(ValidationPlan[M]):
+    """Instantiate a model from keyword arguments, without validating them (see `BaseModel.model_construct()`).
+
+    Only top-level fields are supported. Arguments must already have the type of their field: this is the caller's
+    responsibility (see `pydanclick.model.convert_to_click()` with `trusted=True`).
+
+    `model_construct()` spends most of its time looking for aliases and computing defaults. When all defaults are
+    immutable (and the model has no `model_post_init()`), instances are created directly instead.
+
+    >>> class Foo(BaseModel):
+    ...     a: int
+    ...     b: str = "b"
+    >>> ConstructionPlan(Foo, {"arg1": "a", "arg2": "b"})({"arg1": 1, "arg2": None})
+    Foo(a=1, b='b')
+    """
+
+    def __init__(
+        self,
+        model: type[M],
+        qualified_names: Mapping[ArgumentName, DottedFieldName],
+        unpacked_names: Iterable[DottedFieldName] = (),
+    ) -> None:
+        super().__init__(model, qualified_names, unpacked_names)
+        if self.unpacked_names or len(self._nodes) > 1:
+            raise ValueError("Only top-level fields can be constructed without validation")
+        argument_names = {key: argument_name for argument_name, _, key in self._leaves}
+        # For each field, in order: its name, its argument name (if any) and its default value (if any)
+        self._fields: Optional[list[tuple[str, Optional[ArgumentName], Any]]] = []
+        for name, field in model.model_fields.items():
+            if field.default_factory is not None or not isinstance(field.default, _IMMUTABLE_TYPES):
+                self._fields = None
+                break
+            self._fields.append((name, argument_names.get(name), field.default))
+        if model.__pydantic_post_init__ or model.model_config.get("extra") == "allow":
+            self._fields = None
+
+    def __call__(self, kwargs: dict[ArgumentName, Any]) -> M:
+        """Instantiate the model from keyword arguments. Arguments matching a model field are removed from `kwargs`."""
+        pop = kwargs.pop
+        if self._fields is None:
+            values = {
+                key: value for argument_name, _, key in self._leaves if (value := pop(argument_name, None)) is not None
+            }
+            return self.model.model_construct(**values)
+        fields_values: dict[str, Any] = {}
+        fields_set = set()
+        for name, argument_name, default in self._fields:
+            value = None if argument_name is None else pop(argument_name, None)
+            if value is not None:
+                fields_values[name] = value
+                fields_set.add(name)
+            elif default is not PydanticUndefined:
+                fields_values[name] = default
+        instance = self.model.__new__(self.model)
+        object.__setattr__(instance, "__dict__", fields_values)
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+    def validate_many(self, records: Iterable[dict[ArgumentName, Any]], chunk_size: int = 1000) -> Iterator[M]:
+        """Instantiate the model from many sets of keyword arguments, lazily (there's nothing to validate)."""
+        return map(self, records)
+
+
+class IncrementalValidationPlan(ValidationPlan[M]):
+    """Instantiate a model from keyword arguments, reusing the sub-models of the previous instance that didn't change.
+
+    The plan remembers the arguments and the result of its last call. Sub-models whose arguments are all equal to the
+    previous ones are passed to Pydantic as already validated instances, so that only changed sub-models (and the
+    fields of their parents) are validated again. This pays off for sequences of similar arguments, such as sweeps.
+
+    Sub-models are only reused when the fields leading to them are plain models (not unions, nor optional), without
+    field validators or metadata, and when the models containing them have no model validators: such validators may
+    expect raw values. Sub-models with default factories which may return different values (e.g. `uuid4`) aren't
+    reused either. Other sub-models are always validated, and models with unpacked fields are validated as usual.
+
+    Consecutive instances share their unchanged sub-models: don't mutate them. Plans aren't thread-safe.
+
+    >>> class Foo(BaseModel):
+    ...     a: int
+    >>> class Bar(BaseModel):
+    ...     b: Foo
+    ...     c: str = "c"
+    >>> plan = IncrementalValidationPlan(Bar, {"arg1": "b.a", "arg2": "c"})
+    >>> first, second = plan({"arg1": 1, "arg2": None}), plan({"arg1": 1, "arg2": "d"})
+    >>> second
+    Bar(b=Foo(a=1), c='d')
+    >>> second.b is first.b
+    True
+    """
+
+    def __init__(
+        self,
+        model: type[M],
+        qualified_names: Mapping[ArgumentName, DottedFieldName],
+        unpacked_names: Iterable[DottedFieldName] = (),
+    ) -> None:
+        super().__init__(model, qualified_names, unpacked_names)
+        # Nodes whose value can be reused, with their path, parents first
+        self._reusable_nodes: list[tuple[int, tuple[str, ...]]] = []
+        if not self.unpacked_names:
+            paths = [self._get_node_path(node_index) for node_index in range(len(self._nodes))]
+            self._reusable_nodes = [
+                (node_index, path) for node_index, path in enumerate(paths) if path and _is_reusable(model, path)
+            ]
+            self._reusable_nodes.sort(key=lambda node: len(node[1]))
+        self._previous: Optional[tuple[list[Any], M]] = None
+
+    def _get_node_path(self, node_index: int) -> tuple[str, ...]:
+        path: list[str] = []
+        while node_index:
+            node_index, key = self._nodes[node_index]
+            path.append(key)
+        return tuple(reversed(path))
+
+    def __call__(self, kwargs: dict[ArgumentName, Any]) -> M:
+        """Instantiate the model from keyword arguments. Arguments matching a model field are removed from `kwargs`."""
+        if not self._reusable_nodes:
+            return super().__call__(kwargs)
+        pop = kwargs.pop
+        values = [pop(argument_name, None) for argument_name, _, _ in self._leaves]
+        nodes: list[Optional[dict[str, Any]]] = [None] * len(self._nodes)
+        root: dict[str, Any] = {}
+        nodes[0] = root
+        # Reused nodes are detached from the tree: their arguments are only collected to know whether they're empty
+        reused_nodes = self._get_reused_nodes(values) if self._previous is not None else {}
+        for node_index in reused_nodes:
+            nodes[node_index] = {}
+        for (_, node_index, key), value in zip(self._leaves, values):
+            if value is None:
+                continue
+            node = nodes[node_index]
+            if node is None:
+                node = self._create_node(nodes, node_index)
+            node[key] = value
+        for node_index, sub_model in reused_nodes.items():
+            if nodes[node_index]:
+                parent_index, key = self._nodes[node_index]
+                parent = nodes[parent_index]
+                if parent is None:
+                    parent = self._create_node(nodes, parent_index)
+                parent[key] = sub_model
+        instance = self.model.model_validate(root)
+        self._previous = (values, instance)
+        return instance
+
+    def _get_reused_nodes(self, values: list[Any]) -> dict[int, Any]:
+        """Map the outermost reusable nodes whose arguments didn't change to the sub-models of the previous instance."""
+        previous_values, previous = cast(tuple[list[Any], M], self._previous)
+        changed = [False] * len(self._nodes)
+        for (_, node_index, _), value, previous_value in zip(self._leaves, values, previous_values):
+            if _is_unchanged(value, previous_value):
+                continue
+            # A change in a node also changes its parents
+            while node_index and not changed[node_index]:
+                changed[node_index] = True
+                node_index = self._nodes[node_index][0]
+        reused_nodes: dict[int, Any] = {}
+        for node_index, path in self._reusable_nodes:
+            if changed[node_index] or self._has_reused_parent(node_index, reused_nodes):
+                continue
+            reused_nodes[node_index] = functools.reduce(getattr, path, previous)
+        return reused_nodes
+
+    def _has_reused_parent(self, node_index: int, reused_nodes: dict[int, Any]) -> bool:
+        while node_index:
+            node_index = self._nodes[node_index][0]
+            if node_index in reused_nodes:
+                return True
+        return False
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # The previous call isn't part of the state of the plan
+        return self.__class__, (self.model, self.qualified_names, self.unpacked_names)
+
+
+def _is_unchanged(value: Any, previous_value: Any) -> bool:
+    """Return True if `value` and `previous_value` are interchangeable (see `_freeze()`), e.g. 1, 1.0 and True aren't."""
+    if value is previous_value:
+        return True
+    if type(value) is not type(previous_value):
+        return False
+    return bool(value == previous_value if type(value) in _ATOMIC_TYPES else _freeze(value) == _freeze(previous_value))
+
+
+def _is_reusable(model: type[BaseModel], path: tuple[str, ...]) -> bool:
+    """Return True if validated instances can be passed to the field at `path`, instead of raw values."""
+    for name in path:
+        if model.__pydantic_decorators__.model_validators or _has_field_validators(model, name):
+            return False
+        field = model.model_fields.get(name)
+        if field is None or field.metadata or not _is_model_class(field.annotation):
+            return False
+        model = cast(type[BaseModel], field.annotation)
+    # Default factories of reused sub-models aren't called again
+    return _is_deterministic(model)
+
+
+# Default factories always returning equal values
+_DETERMINISTIC_FACTORIES = (list, dict, set, tuple, frozenset)
+
+
+def _is_deterministic(annotation: Any, seen: Optional[set[type[BaseModel]]] = None) -> bool:
+    """Return True if the default factories of all models in `annotation` return equal values on every call."""
+    seen = set() if seen is None else seen
+    if not (isinstance(annotation, type) and issubclass(annotation, BaseModel)):
+        return all(_is_deterministic(arg, seen) for arg in get_args(annotation))
+    if annotation in seen:
+        return True
+    seen.add(annotation)
+    for field in annotation.model_fields.values():
+        factory = field.default_factory
+        if factory is not None and factory not in _DETERMINISTIC_FACTORIES:
+            # Models are deterministic factories if their own factories are
+            is_model = isinstance(factory, type) and issubclass(factory, BaseModel)
+            if not is_model or not _is_deterministic(factory, seen):
+                return False
+        if not _is_deterministic(field.annotation, seen):
+            return False
+    return True
+
+
+def _has_field_validators(model: type[BaseModel], name: str) -> bool:
+    return any(
+        name in validator.info.fields or "*" in validator.info.fields
+        for validator in model.__pydantic_decorators__.field_validators.values()
+    )
+
+
+def _is_model_class(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+class MemoizedValidationPlan(ValidationPlan[M]):
+    """Cache the instances created by another plan, keyed on the values of their arguments.
+
+    Values are frozen to be hashable (e.g. lists become tuples): instances whose arguments can't be frozen are created
+    but not cached. Frozen models are returned as is, other models are copied with `model_copy()`. Copies are shallow:
+    their fields can be assigned, but nested values (sub-models, lists...) are shared with the cached instance and
+    shouldn't be modified in place.
+
+    >>> class Foo(BaseModel):
+    ...     a: int
+    >>> plan = MemoizedValidationPlan(ValidationPlan(Foo, {"arg": "a"}), maxsize=16)
+    >>> plan({"arg": 1}), plan({"arg": 1}), plan({"arg": 2})
+    (Foo(a=1), Foo(a=1), Foo(a=2))
+    >>> plan.cache_info()
+    CacheInfo(hits=1, misses=2, maxsize=16, currsize=2)
+
+    Args:
+        plan: plan creating instances on cache misses
+        maxsize: maximum number of cached instances
+    """
+
+    def __init__(self, plan: ValidationPlan[M], maxsize: int) -> None:
+        self.plan = plan
+        self.model = plan.model
+        self.qualified_names = plan.qualified_names
+        self.unpacked_names = plan.unpacked_names
+        self._argument_names = list(plan.qualified_names)
+        self._frozen = bool(plan.model.model_config.get("frozen"))
+        self._cache: LRUCache[Hashable, M] = LRUCache(maxsize=maxsize)
+
+    def __call__(self, kwargs: dict[ArgumentName, Any]) -> M:
+        """Instantiate the model from keyword arguments. Arguments matching a model field are removed from `kwargs`."""
+        pop = kwargs.pop
+        values = [pop(argument_name, None) for argument_name in self._argument_names]
+        types = tuple(map(type, values))
+        # Types are part of the key, so that equal values of different types (e.g. 1 and True) don't collide
+        key = (types, tuple(values if _ATOMIC_TYPES.issuperset(types) else map(_freeze, values)))
+        instance = self._cache.get_or_create(key, lambda: self.plan(dict(zip(self._argument_names, values))))
+        return instance if self._frozen else instance.model_copy()
+
+    def validate_many(self, records: Iterable[dict[ArgumentName, Any]], chunk_size: int = 1000) -> Iterator[M]:
+        """Instantiate the model from many sets of keyword arguments, lazily (see `ValidationPlan.validate_many()`).
+
+        Records are validated by chunks with the underlying plan, without using the cache.
+        """
+        return self.plan.validate_many(records, chunk_size=chunk_size)
+
+    def unflatten(self, kwargs: dict[ArgumentName, Any]) -> dict[str, Any]:
+        return self.plan.unflatten(kwargs)
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics about cached instances."""
+        return self._cache.info()
+
+    def cache_clear(self) -> None:
+        """Remove all cached instances, and reset statistics."""
+        self._cache.clear()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.plan!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self.plan, self._cache.maxsize)
+
+
+# Hashable types, whose equal values are interchangeable, and can be used as cache keys directly. Equal floats (0.0 and
+# -0.0), decimals (1 and 1.0) and aware datetimes (in different timezones) aren't
+_ATOMIC_TYPES = frozenset({
+    str,
+    int,
+    bool,
+    type(None),
+    bytes,
+    UUID,
+    datetime.date,
+    type(PurePath()),
+    type(Path()),
+})
+
+
+def _freeze(value: Any) -> Any:
+    """Convert a value to a hashable equivalent. Frozen values are only equal if their values are interchangeable: values
+    of different types (e.g. 1 and True), floats of different signs (0.0 and -0.0), decimals of different precisions or
+    datetimes in different timezones never compare equal.
+
+    >>> _freeze([1, {"a": True}])
+    (<class 'list'>, ((<class 'int'>, 1), (<class 'dict'>, (((<class 'str'>, 'a'), (<class 'bool'>, True)),))))
+    >>> _freeze(-0.0) == _freeze(0.0)
+    False
+    """
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(map(_freeze, value))
+    if isinstance(value, dict):
+        return dict, tuple((_freeze(key), _freeze(item)) for key, item in value.items())
+    if isinstance(value, (set, frozenset)):
+        return type(value), frozenset(map(_freeze, value))
+    if isinstance(value, (float, Decimal)):
+        return type(value), repr(value)
+    if isinstance(value, (datetime.datetime, datetime.time)):
+        return type(value), value, value.utcoffset()
+    return type(value), value
+
+
+# Default values that can be shared between instances (mutable defaults are copied by Pydantic)
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None), bytes, UUID, PurePath, type(PydanticUndefined))
+
+
+def _get_node_key(path: Iterable[str]) -> str:
+    """Return the key of a nested model in the flat mapping. Argument names are identifiers: keys can't collide."""
+    return "." + ".".join(path)
+
+
+class _FlatSchemaCompiler:
+    """Rewrite the core schema of a model, so that it can validate a flat mapping of arguments (see `FlatValidationPlan`).
+
+    Nested models containing arguments are inlined (removing their reference, since the same model can appear at
+    several paths with different aliases). Other fields keep their original schema, except for JSON arguments (parsed
+    from JSON before validation) and trusted arguments (not validated).
+    """
+
+    # Wrappers that can be found around nested models, and that don't inspect the input
+    _TRANSPARENT_SCHEMAS = ("default", "nullable", "function-after")
+
+    def __init__(
+        self,
+        qualified_names: Mapping[ArgumentName, DottedFieldName],
+        schema: CoreSchema,
+        json_names: Collection[ArgumentName] = (),
+        trusted_names: Collection[ArgumentName] = (),
+    ) -> None:
+        self.schema = schema
+        self.json_names = json_names
+        self.trusted_names = trusted_names
+        self.leaves = {
+            tuple(dotted_name.split(".")): argument_name for argument_name, dotted_name in qualified_names.items()
+        }
+        self.nodes = {path[:i] for path in self.leaves for i in range(1, len(path))}
+        self.definitions: dict[str, Any] = {}
+        if schema["type"] == "definitions":
+            self.definitions = {definition["ref"]: definition for definition in schema["definitions"]}
+
+    def compile(self) -> Optional[dict[str, Any]]:
+        if self.schema["type"] == "definitions":
+            compiled = self._compile_node(self.schema["schema"], ())
+            return None if compiled is None else {**self.schema, "schema": compiled}
+        return self._compile_node(self.schema, ())
+
+    def _compile_node(self, schema: Any, path: tuple[str, ...]) -> Optional[dict[str, Any]]:
+        schema_type = schema["type"]
+        if schema_type in self._TRANSPARENT_SCHEMAS:
+            inner_schema = self._compile_node(schema["schema"], path)
+            return None if inner_schema is None else {**schema, "schema": inner_schema}
+        if schema_type == "definition-ref" and schema["schema_ref"] in self.definitions:
+            return self._compile_node(self.definitions[schema["schema_ref"]], path)
+        if schema_type != "model" or schema.get("custom_init") or schema.get("root_model"):
+            return None
+        config = schema.get("config", {})
+        if config.get("extra_fields_behavior", "ignore") != "ignore":
+            return None
+        # Like the nested representation, arguments of aliased fields are ignored unless fields can be populated by name
+        by_name = bool(config.get("populate_by_name") or config.get("validate_by_name"))
+        fields_schema = self._compile_fields(schema["schema"], path, by_name)
+        if fields_schema is None:
+            return None
+        compiled = {key: value for key, value in schema.items() if key != "ref"}
+        # Report errors with field names, as if the nested representation was validated
+        compiled["config"] = {**config, "loc_by_alias": False}
+        compiled["schema"] = fields_schema
+        return compiled
+
+    def _compile_fields(self, schema: Any, path: tuple[str, ...], by_name: bool) -> Optional[dict[str, Any]]:
+        if schema["type"] == "function-after":
+            inner_schema = self._compile_fields(schema["schema"], path, by_name)
+            return None if inner_schema is None else {**schema, "schema": inner_schema}
+        if schema["type"] != "model-fields" or schema.get("extra_behavior", "ignore") != "ignore":
+            return None
+        fields = {}
+        alias: str
+        for name, field in schema["fields"].items():
+            field_path = (*path, name)
+            field_schema = field["schema"]
+            if "validation_alias" in field and not by_name:
+                alias = "!" + ".".join(field_path)
+            elif field_path in self.leaves:
+                if field_path in self.nodes:
+                    # Field can be passed both as a whole and through its subfields (e.g. a union of models)
+                    return None
+                alias = self.leaves[field_path]
+                field_schema = self._compile_leaf(field_schema, alias)
+            elif field_path in self.nodes:
+                alias = _get_node_key(field_path)
+                field_schema = self._compile_node(field_schema, field_path)
+                if field_schema is None:
+                    return None
+            else:
+                # Field isn't mapped to any argument (e.g. it was excluded): make sure it is never found
+                alias = "!" + ".".join(field_path)
+            fields[name] = {**field, "schema": field_schema, "validation_alias": alias}
+        return {**schema, "fields": fields}
+
+    def _compile_leaf(self, schema: Any, argument_name: ArgumentName) -> Any:
+        # Keep the default value, but change how the provided value is validated
+        inner_schema = schema["schema"] if schema["type"] == "default" else schema
+        if argument_name in self.json_names:
+            inner_schema = {"type": "json", "schema": inner_schema}
+        elif (
+            argument_name in self.trusted_names
+            and not inner_schema["type"].startswith("function-")
+            and _CONSTRAINTS.isdisjoint(inner_schema)
+        ):
+            inner_schema = {"type": "any"}
+        else:
+            return schema
+        return {**schema, "schema": inner_schema} if schema["type"] == "default" else inner_schema
+
+
+# Core schema keys constraining values beyond their type (Click types only validate the type)
+_CONSTRAINTS = frozenset({
+    "strict",
+    "min_length",
+    "max_length",
+    "gt",
+    "ge",
+    "lt",
+    "le",
+    "multiple_of",
+    "pattern",
+    "allow_inf_nan",
+})
+
+
 def _pack_dict(d: dict[K, Iterable[V]]) -> list[dict[K, Any]]:
     unset = object()
     packed_dict = []
@@ -0,0 +1,274 @@
+"""Read model instances from records (JSON Lines, CSV or TSV files), instead of command-line arguments.
+
+Records are read and validated one at a time, so that arbitrarily large inputs can be processed in constant memory.
+Options passed on the command line override the corresponding fields of every record.
+"""
+
+import csv
+import itertools
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from typing import IO, Any, Callable, Generic, Optional
+
+import click
+from pydantic import BaseModel, ValidationError
+from pydantic_core import from_json
+from typing_extensions import TypeVar
+
+from pydanclick.model.validation import RecordValidationError, ValidationPlan
+
+M = TypeVar("M", bound=BaseModel)
+
+# Keys containing a dot, i.e. dotted field names. Records without any can be validated directly from raw bytes
+_DOTTED_KEY_PATTERN = re.compile(rb'"[^"\\]*\.[^"\\]*"\s*:')
+
+
+class RecordValidator(Generic[M]):
+    """Validate JSON records, with optional overrides.
+
+    Records are JSON objects, either nested (like the JSON representation of the model) or flat, with dotted field
+    names as keys (e.g. `{"bar.baz.c": 1}`). Both can be mixed in the same record.
+
+    >>> class Foo(BaseModel):
+    ...     a: int
+    ...     b: int = 0
+    >>> class Bar(BaseModel):
+    ...     foo: Foo
+    ...     c: str = "c"
+    >>> validate = RecordValidator(Bar, overrides={"c": "d"})
+    >>> validate(b'{"foo.a": 1, "foo": {"b": 2}}')
+    Bar(foo=Foo(a=1, b=2), c='d')
+
+    Args:
+        model: Pydantic model
+        overrides: nested representation of values overriding the ones from records (see `ValidationPlan.unflatten()`)
+    """
+
+    def __init__(self, model: type[M], overrides: Optional[Mapping[str, Any]] = None) -> None:
+        self.model = model
+        self.overrides = dict(overrides or {})
+
+    def __call__(self, record: bytes) -> M:
+        """Validate a record, given as raw JSON bytes."""
+        if not self.overrides and not _DOTTED_KEY_PATTERN.search(record):
+            return self.model.model_validate_json(record)
+        data = from_json(record)
+        if not isinstance(data, dict):
+            # Let Pydantic report the error
+            return self.model.model_validate(data)
+        return self.model.model_validate(_merge(_expand_dotted_keys(data), self.overrides))
+
+
+def _expand_dotted_keys(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert top-level dotted keys into nested dictionaries.
+
+    >>> _expand_dotted_keys({"a.b": 1, "a": {"c": 2}, "d": 3})
+    {'a': {'b': 1, 'c': 2}, 'd': 3}
+    """
+    expanded: dict[str, Any] = {}
+    for key, value in data.items():
+        *parents, name = key.split(".")
+        node = expanded
+        for parent in parents:
+            child = node.get(parent)
+            if not isinstance(child, dict):
+                child = node[parent] = {}
+            node = child
+        node[name] = _merge(node[name], value) if isinstance(node.get(name), dict) else value
+    return expanded
+
+
+def _merge(data: Any, overrides: Any) -> Any:
+    """Recursively merge `overrides` into `data` (without modifying `data`). Overrides take precedence.
+
+    >>> _merge({"a": {"b": 1, "c": 2}}, {"a": {"c": 3}})
+    {'a': {'b': 1, 'c': 3}}
+    """
+    if not isinstance(data, dict) or not isinstance(overrides, dict):
+        return overrides
+    merged = dict(data)
+    for key, value in overrides.items():
+        merged[key] = _merge(merged[key], value) if key in merged else value
+    return merged
+
+
+def iter_lines(file: IO[bytes]) -> Iterator[tuple[int, bytes]]:
+    """Yield non-blank lines of `file`, with their (1-based) line number."""
+    for line_number, line in enumerate(file, start=1):
+        if line.strip():
+            yield line_number, line
+
+
+def iter_records(file: IO[bytes], validate: RecordValidator[M], param: Optional[click.Parameter] = None) -> Iterator[M]:
+    """Read JSON Lines from `file` and yield one model instance per line, lazily.
+
+    Args:
+        file: file opened in binary mode
+        validate: record validator
+        param: Click parameter the file was passed to, used in error messages
+
+    Returns:
+        an iterator over model instances
+
+    Raises:
+        click.BadParameter: if a record is invalid. The error message contains its line number
+    """
+    for line_number, line in iter_lines(file):
+        try:
+            yield validate(line)
+        except (ValidationError, ValueError) as e:
+            raise click.BadParameter(f"invalid record on line {line_number}: {e}", param=param) from e
+
+
+def get_explicit_kwargs(ctx: click.Context, plan: ValidationPlan[Any], kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Extract the arguments of the model explicitly passed to the command (i.e. not from their default value).
+
+    All arguments of the model are removed from `kwargs`, so that the remaining ones can be passed to the command.
+    """
+    explicit_kwargs: dict[str, Any] = {}
+    for name in plan.qualified_names:
+        if name in kwargs:
+            value = kwargs.pop(name)
+            if value is not None and _is_explicit(ctx, name):
+                explicit_kwargs[name] = value
+    return explicit_kwargs
+
+
+def _is_explicit(ctx: click.Context, name: str) -> bool:
+    source = ctx.get_parameter_source(name)
+    return source is not None and source not in (
+        click.core.ParameterSource.DEFAULT,
+        click.core.ParameterSource.DEFAULT_MAP,
+    )
+
+
+def parse_json_kwargs(
+    plan: ValidationPlan[Any], kwargs: Mapping[str, Any], options: Iterable[click.Option]
+) -> dict[str, Any]:
+    """Parse the arguments passed to `plan` as raw JSON strings (see `FlatValidationPlan`), e.g. to merge them into records.
+
+    Args:
+        plan: validator returned by `pydanclick.model.convert_to_click()`
+        kwargs: arguments of the model
+        options: options returned by `pydanclick.model.convert_to_click()`, used in error messages
+
+    Returns:
+        a copy of `kwargs`, where JSON strings are replaced with the values they represent
+
+    Raises:
+        click.BadParameter: if an argument isn't valid JSON
+    """
+    # Memoized plans wrap the plan receiving the arguments
+    json_names = getattr(getattr(plan, "plan", plan), "json_names", ())
+    parsed_kwargs = dict(kwargs)
+    for name, value in kwargs.items():
+        if name in json_names and isinstance(value, str):
+            try:
+                parsed_kwargs[name] = from_json(value)
+            except ValueError as e:
+                option = next((option for option in options if option.name == name), None)
+                raise click.BadParameter(f"{value!r} is not valid JSON: {e}", param=option) from e
+    return parsed_kwargs
+
+
+def iter_csv_records(
+    file: IO[str],
+    plan: ValidationPlan[M],
+    options: Iterable[click.Option],
+    *,
+    delimiter: str = ",",
+    overrides: Optional[Mapping[str, Any]] = None,
+    chunk_size: int = 1000,
+    ctx: Optional[click.Context] = None,
+    param: Optional[click.Parameter] = None,
+) -> Iterator[M]:
+    """Read a CSV file and yield one model instance per row, lazily.
+
+    The header is mapped once to argument names: columns are named after dotted field names (e.g. `bar.baz.c`) or
+    argument names. Cells are converted by the Click type of the corresponding option (empty cells are left out, so that
+    the default value is used), then rows are validated by `plan`, just like command-line arguments. Rows are read and
+    validated by chunks, each with a single call to Pydantic (see `ValidationPlan.validate_many()`).
+
+    Args:
+        file: file opened in text mode, with `newline=""` so that quoted cells may span several lines
+        plan: validator returned by `pydanclick.model.convert_to_click()`
+        options: options returned by `pydanclick.model.convert_to_click()`
+        delimiter: column delimiter (e.g. a tab for TSV files)
+        overrides: arguments overriding the values of every row, as a mapping from argument names to parsed values
+        chunk_size: number of rows read and validated at once
+        ctx: current Click context, passed to Click types
+        param: Click parameter the file was passed to, used in error messages
+
+    Returns:
+        an iterator over model instances
+
+    Raises:
+        click.BadParameter: if the header contains unknown columns or columns taking several values (e.g. unpacked
+            lists), or if a row is invalid. The error message contains its line number. Instances of the preceding
+            rows are yielded first
+    """
+    reader = csv.reader(file, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = _map_columns(header, plan, options, param)
+    overrides = dict(overrides or {})
+    rows = ((reader.line_num, row) for row in reader)
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        line_numbers: list[int] = []
+        records: list[dict[str, Any]] = []
+        conversion_error: Optional[tuple[int, click.BadParameter]] = None
+        for line_number, row in chunk:
+            try:
+                kwargs = _convert_row(row, columns, ctx)
+            except click.BadParameter as e:
+                # Rows preceding the invalid one are still yielded first, as if rows were read one at a time
+                conversion_error = line_number, e
+                break
+            kwargs.update(overrides)
+            line_numbers.append(line_number)
+            records.append(kwargs)
+        if records:
+            try:
+                yield from plan.validate_many(records, chunk_size=len(records))  # type: ignore[arg-type]
+            except RecordValidationError as e:
+                message = f"invalid record on line {line_numbers[e.index]}: {e.error}"
+                raise click.BadParameter(message, param=param) from e.error
+        if conversion_error is not None:
+            line_number, error = conversion_error
+            raise click.BadParameter(f"invalid record on line {line_number}, {error.message}", param=param) from error
+
+
+def _convert_row(
+    row: list[str], columns: list[tuple[str, str, click.Option, Callable[..., Any]]], ctx: Optional[click.Context]
+) -> dict[str, Any]:
+    """Convert the cells of a row with the Click types of their options. Empty cells are left out."""
+    kwargs: dict[str, Any] = {}
+    for (column, argument_name, option, convert), cell in zip(columns, row):
+        if not cell:
+            continue
+        try:
+            kwargs[argument_name] = convert(cell, option, ctx)
+        except click.BadParameter as e:
+            raise click.BadParameter(f"column {column!r}: {e.message}") from e
+    return kwargs
+
+
+def _map_columns(
+    header: list[str], plan: ValidationPlan[Any], options: Iterable[click.Option], param: Optional[click.Parameter]
+) -> list[tuple[str, str, click.Option, Callable[..., Any]]]:
+    """Map each column to its argument name, its option and the function converting its cells."""
+    argument_names: dict[str, str] = {
+        dotted_name: argument_name for argument_name, dotted_name in plan.qualified_names.items()
+    }
+    options_by_name = {option.name: option for option in options if option.name in plan.qualified_names}
+    columns = []
+    for column in header:
+        argument_name = argument_names.get(column.strip(), column.strip())
+        option = options_by_name.get(argument_name)
+        if option is None:
+            raise click.BadParameter(f"unknown column {column!r}", param=param)
+        if option.multiple or option.nargs != 1:
+            raise click.BadParameter(f"column {column!r} takes several values, which tables don't support", param=param)
+        columns.append((column, argument_name, option, option.type.convert))
+    return columns
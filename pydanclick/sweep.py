@@ -0,0 +1,218 @@
+"""Sweep options over several values, invoking a command once per combination.
+
+Sweepable options (numbers and choices) accept lists of values (`--lr 0.1,0.01,0.001`) and, for numbers, inclusive
+ranges (`--seed 1..100`, or `--lr 0..1:0.25` with a step). Combinations are generated lazily: neither the values of
+ranges nor the grid of combinations are ever materialized.
+"""
+
+import re
+from collections.abc import Iterator, Sequence
+from decimal import Decimal, InvalidOperation
+from typing import Any, Literal, Optional, Union, overload
+
+import click
+
+from pydanclick.model.type_conversion import PydanclickParamType
+
+SweepMode = Literal["product", "zip"]
+
+# Start, stop and optional step of a range, e.g. `1..10` or `-1.5..1.5:0.5`
+_RANGE_PATTERN = re.compile(r"^\s*(?P<start>[^:]+?)\s*\.\.\s*(?P<stop>[^:]+?)\s*(?::\s*(?P<step>.+?)\s*)?$")
+
+
+class Sweep:
+    """Represent the values an option is swept over.
+
+    Args:
+        values: values of the option, already converted. Ranges are lazy sequences
+    """
+
+    def __init__(self, values: Sequence[Any]) -> None:
+        self.values = values
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Sweep) and list(self.values) == list(other.values)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.values!r})"
+
+
+class _DecimalRange(Sequence[float]):
+    """Inclusive range of floats, computed with decimal arithmetic to avoid accumulating rounding errors.
+
+    >>> list(_DecimalRange(Decimal("0.1"), Decimal("0.5"), Decimal("0.1")))
+    [0.1, 0.2, 0.3, 0.4, 0.5]
+    """
+
+    def __init__(self, start: Decimal, stop: Decimal, step: Decimal) -> None:
+        self.start = start
+        self.step = step
+        self.length = max(0, int((stop - start) / step) + 1)
+
+    @overload
+    def __getitem__(self, index: int) -> float: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[float]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[float, Sequence[float]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("range index out of range")
+        return float(self.start + index * self.step)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.start}, {self.start + (self.length - 1) * self.step}, {self.step})"
+
+
+class SweepParamType(PydanclickParamType):
+    """Accept lists (`a,b,c`) and ranges (`start..stop[:step]`) of values, in addition to single values.
+
+    Single values are converted by the wrapped type as usual. Lists and ranges are converted to `Sweep` objects, whose
+    values are converted (lists) or range-checked (ranges) by the wrapped type.
+    """
+
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return self._actual_type.name
+
+    def convert(self, value: Any, param: Optional[click.Parameter], ctx: Optional[click.Context]) -> Any:
+        if not isinstance(value, str):
+            return self._actual_type.convert(value, param, ctx)
+        if "," in value:
+            actual_type = _unwrap(self._actual_type)
+            if isinstance(actual_type, click.Choice) and value in actual_type.choices:
+                return self._actual_type.convert(value, param, ctx)
+            return Sweep(tuple(self._actual_type.convert(item.strip(), param, ctx) for item in value.split(",")))
+        match = _RANGE_PATTERN.match(value) if ".." in value and _is_numeric(self._actual_type) else None
+        if match is None:
+            return self._actual_type.convert(value, param, ctx)
+        return Sweep(self._convert_range(match["start"], match["stop"], match["step"], param, ctx))
+
+    def _convert_range(
+        self,
+        start: str,
+        stop: str,
+        step: Optional[str],
+        param: Optional[click.Parameter],
+        ctx: Optional[click.Context],
+    ) -> Sequence[Any]:
+        # Values lie between start and stop: checking them is enough to enforce the bounds of range types. Bounds are
+        # converted even if the option passes raw values through, to generate values of the right type
+        actual_type = _unwrap(self._actual_type)
+        first, last = (actual_type.convert(bound, param, ctx) for bound in (start, stop))
+        if isinstance(first, int) and isinstance(last, int):
+            int_step = click.INT.convert(step, param, ctx) if step is not None else 1 if last >= first else -1
+            if int_step == 0:
+                self.fail("the step of a range can't be zero", param, ctx)
+            values: Sequence[Any] = range(first, last + (1 if int_step > 0 else -1), int_step)
+        else:
+            try:
+                decimal_start, decimal_stop = Decimal(start), Decimal(stop)
+                decimal_step = Decimal(step) if step is not None else Decimal(1 if last >= first else -1)
+            except InvalidOperation:
+                self.fail(f"{step!r} is not a valid step", param, ctx)
+            if decimal_step == 0:
+                self.fail("the step of a range can't be zero", param, ctx)
+            values = _DecimalRange(decimal_start, decimal_stop, decimal_step)
+        if not values:
+            self.fail(f"the range {start}..{stop} is empty", param, ctx)
+        return values
+
+    def get_metavar(self, param: click.Parameter) -> Optional[str]:
+        return self._actual_type.get_metavar(param)
+
+    def shell_complete(self, ctx: click.Context, param: click.Parameter, incomplete: str) -> list[Any]:
+        return self._actual_type.shell_complete(ctx, param, incomplete)
+
+    def to_info_dict(self) -> dict[str, Any]:
+        return self._actual_type.to_info_dict()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self._actual_type,)
+
+
+def _unwrap(param_type: click.ParamType) -> click.ParamType:
+    while isinstance(param_type, PydanclickParamType):
+        param_type = param_type.actual_type
+    return param_type
+
+
+def _is_numeric(param_type: click.ParamType) -> bool:
+    return isinstance(_unwrap(param_type), (click.types.IntParamType, click.types.FloatParamType))
+
+
+def _is_choice(param_type: click.ParamType) -> bool:
+    return isinstance(_unwrap(param_type), click.Choice)
+
+
+def enable_sweeps(options: list[click.Option]) -> list[click.Option]:
+    """Let numerical and choice options accept lists and ranges of values (see `SweepParamType`).
+
+    Options taking several values (flags, options with `multiple=True` or `nargs > 1`) are left unchanged.
+    """
+    for option in options:
+        if isinstance(option.type, SweepParamType) or option.is_flag or option.multiple or option.nargs != 1:
+            continue
+        if _is_numeric(option.type) or _is_choice(option.type):
+            option.type = SweepParamType(option.type)
+    return options
+
+
+def has_sweeps(kwargs: dict[str, Any]) -> bool:
+    """Return True if any argument is swept over."""
+    return any(isinstance(value, Sweep) for value in kwargs.values())
+
+
+def iter_sweep(kwargs: dict[str, Any], mode: SweepMode = "product") -> Iterator[dict[str, Any]]:
+    """Yield one dictionary of arguments per combination of swept values, lazily.
+
+    >>> [kwargs["a"] + kwargs["b"] for kwargs in iter_sweep({"a": Sweep(range(2)), "b": Sweep((10, 20)), "c": 0})]
+    [10, 20, 11, 21]
+    >>> [kwargs["a"] + kwargs["b"] for kwargs in iter_sweep({"a": Sweep(range(2)), "b": Sweep((10, 20))}, "zip")]
+    [10, 21]
+
+    Args:
+        kwargs: arguments, where swept arguments are `Sweep` objects
+        mode: `product` to yield the cartesian product of swept values (the last argument varying fastest), or `zip`
+            to yield the n-th value of every swept argument together. Zipped sweeps must have the same length
+
+    Returns:
+        an iterator over arguments, with one value per argument. Each dictionary is a new object
+
+    Raises:
+        click.UsageError: if zipped sweeps have different lengths
+    """
+    sweeps = {name: value for name, value in kwargs.items() if isinstance(value, Sweep)}
+    if mode == "zip":
+        if len({len(sweep) for sweep in sweeps.values()}) > 1:
+            lengths = ", ".join(f"{name} ({len(sweep)} values)" for name, sweep in sweeps.items())
+            raise click.UsageError(f"Zipped sweeps must have the same length, got {lengths}")
+        combinations: Iterator[tuple[Any, ...]] = zip(*sweeps.values())
+    else:
+        combinations = _product(list(sweeps.values()))
+    for combination in combinations:
+        yield {**kwargs, **dict(zip(sweeps, combination))}
+
+
+def _product(sweeps: list[Sweep]) -> Iterator[tuple[Any, ...]]:
+    """Same as `itertools.product()`, except that input sequences are iterated over again instead of being stored."""
+    if not sweeps:
+        yield ()
+        return
+    head, *tail = sweeps
+    for value in head:
+        for combination in _product(tail):
+            yield (value, *combination)
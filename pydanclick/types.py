@@ -1,4 +1,4 @@
-from typing import Any, Optional, TypedDict, Union
+from typing import Any, NamedTuple, Optional, TypedDict, Union
 
 import click
 from typing_extensions import NewType
@@ -30,3 +30,19 @@ ArgumentName = NewType("ArgumentName", str)
 OptionName = NewType("OptionName", str)
 FieldName = NewType("FieldName", str)
 DottedFieldName = NewType("DottedFieldName", str)
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of an internal cache, in the spirit of `functools.lru_cache().cache_info()`.
+
+    Attributes:
+        hits: number of calls answered from the cache
+        misses: number of calls that had to compute their result
+        maxsize: maximum number of entries, or None if the cache is unbounded
+        currsize: current number of entries
+    """
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
@@ -1,4 +1,13 @@
 import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+from pydanclick.types import CacheInfo
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
 
 _CAMEL_CASE_PATTERN = re.compile(r"(?<!^)(?=[A-Z])")
 
@@ -47,3 +56,70 @@ def strip_option_name(name: str) -> str:
 
     """
     return re.sub("-+$", "", re.sub("^-+", "", name))
+
+
+class LRUCache(Generic[K, V]):
+    """Size-bounded mapping that evicts its least recently used entries.
+
+    Unlike `functools.lru_cache()`, keys are explicit, and values whose key is unhashable are computed but not cached.
+
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache.get_or_create("a", lambda: 1), cache.get_or_create("b", lambda: 2), cache.get_or_create("a", lambda: 3)
+    (1, 2, 1)
+    >>> cache.get_or_create("c", lambda: 4)  # evicts "b"
+    4
+    >>> cache.get_or_create("b", lambda: 5)
+    5
+    >>> cache.info()
+    CacheInfo(hits=1, misses=4, maxsize=2, currsize=2)
+
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_create(self, key: K, factory: Callable[[], V]) -> V:
+        """Return the value cached for `key`, or create it with `factory()` and cache it.
+
+        Args:
+            key: cache key. If it is unhashable, the value is created but not cached
+            factory: function creating the value on cache misses
+
+        Returns:
+            the cached or newly created value
+        """
+        try:
+            with self._lock:
+                value = self._data[key]
+                self._data.move_to_end(key)
+                self._hits += 1
+                return value
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable key
+            self._misses += 1
+            return factory()
+        # Create the value outside of the lock: the factory may itself use the cache
+        value = factory()
+        with self._lock:
+            self._misses += 1
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return cache statistics."""
+        return CacheInfo(hits=self._hits, misses=self._misses, maxsize=self.maxsize, currsize=len(self._data))
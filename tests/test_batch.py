@@ -0,0 +1,140 @@
+import click
+import pytest
+from click.testing import CliRunner
+from pydantic import BaseModel
+
+import pydanclick.model
+from pydanclick import batch, batch_option, from_pydantic
+from pydanclick.batch import parse_argv, read_argvs
+
+
+class Job(BaseModel):
+    a: int
+    b: str = "b"
+
+
+@click.command()
+@from_pydantic("job", Job)
+@batch_option()
+def cli(job: Job):
+    click.echo(job.model_dump_json())
+    return job
+
+
+@pytest.mark.parametrize("line", ["--a 1 --b 'x y'", '["--a", "1", "--b", "x y"]', "  --a 1  --b 'x y'\n"])
+def test_parse_argv(line):
+    assert parse_argv(line) == ["--a", "1", "--b", "x y"]
+
+
+@pytest.mark.parametrize("line", ['["--a", 1]', "[--a 1", "--a 'unterminated"])
+def test_parse_argv_with_invalid_line(line):
+    with pytest.raises(ValueError):
+        parse_argv(line)
+
+
+def test_read_argvs():
+    assert list(read_argvs(["--a 1\n", "\n", "# comment\n", "--a 2"])) == ["--a 1", "--a 2"]
+
+
+def test_batch(monkeypatch):
+    results = list(batch(cli, ["--a 1", ["--a", "2", "--b", "c"], "--a x", "--help", "[1]"]))
+    assert [result.position for result in results] == [0, 1, 2, 3, 4]
+    assert [result.exit_code for result in results] == [0, 0, 2, 0, 2]
+    assert results[0].return_value == Job(a=1)
+    assert results[1].return_value == Job(a=2, b="c")
+    assert isinstance(results[2].exception, click.BadParameter)
+    assert results[3].return_value is None
+    assert isinstance(results[4].exception, ValueError)
+
+
+def test_batch_reports_validation_errors():
+    @click.command()
+    @from_pydantic("job", Job, validation="pydantic-only")
+    def cli(job: Job):
+        return job
+
+    (result,) = batch(cli, ["--a x"])
+    assert not result.ok
+    assert result.exit_code == 1
+
+
+def test_batch_reuses_options(monkeypatch):
+    calls = []
+    convert_to_click = pydanclick.model.convert_to_click
+    monkeypatch.setattr(
+        pydanclick.model,
+        "convert_to_click",
+        lambda *args, **kwargs: calls.append(1) or convert_to_click(*args, **kwargs),
+    )
+
+    @click.command()
+    @from_pydantic("job", Job, lazy=True)
+    def cli(job: Job):
+        return job
+
+    results = list(batch(cli, [f"--a {i}" for i in range(10)]))
+    assert [result.return_value.a for result in results] == list(range(10))
+    assert len(calls) == 1
+
+
+def test_batch_option(tmp_path):
+    jobs = tmp_path / "jobs.txt"
+    jobs.write_text("--a 1\n# comment\n--a 2 --b c\n")
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli, ["--pydanclick-batch", str(jobs)])
+    assert result.exit_code == 0
+    assert [Job.model_validate_json(line) for line in result.stdout.splitlines()] == [Job(a=1), Job(a=2, b="c")]
+
+
+def test_batch_option_from_stdin_with_failures():
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli, ["--pydanclick-batch", "-"], input="--a 1\n--b c\n--a 3\n")
+    assert result.exit_code == 1
+    assert [Job.model_validate_json(line) for line in result.stdout.splitlines()] == [Job(a=1), Job(a=3)]
+    assert "Missing option '--a'" in result.stderr
+    assert "Invocation 1 (--b c) exited with code 2" in result.stderr
+
+
+def test_batch_option_is_hidden():
+    result = CliRunner().invoke(cli, ["--help"])
+    assert "--pydanclick-batch" not in result.output
+    assert "--pydanclick-workers" not in result.output
+
+
+def test_batch_in_workers(capsys):
+    results = list(batch(cli, ["--a 1", "--a x", "[1]", *(f"--a {i}" for i in range(2, 20))], workers=2))
+    assert [result.position for result in results] == list(range(21))
+    assert [result.exit_code for result in results] == [0, 2, 2] + [0] * 18
+    assert [result.return_value for result in results if result.ok] == [Job(a=1), *(Job(a=i) for i in range(2, 20))]
+    assert isinstance(results[1].exception, RuntimeError)
+    assert "BadParameter" in str(results[1].exception)
+    stdout, stderr = capsys.readouterr()
+    assert [Job.model_validate_json(line) for line in stdout.splitlines()] == [
+        result.return_value for result in results if result.ok
+    ]
+    assert "Invalid value for '--a'" in stderr
+
+
+def test_batch_in_workers_requires_importable_command():
+    @click.command()
+    def local():
+        pass
+
+    with pytest.raises(ValueError, match="top level of a module"):
+        list(batch(local, ["--help"], workers=2))
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--pydanclick-workers", "2", "--pydanclick-batch", "-"],
+        ["--pydanclick-batch", "-", "--pydanclick-workers", "2"],
+    ],
+)
+def test_batch_option_with_workers(args):
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli, args, input="--a 1\n--b c\n--a 3\n")
+    assert result.exit_code == 1
+    assert [Job.model_validate_json(line) for line in result.stdout.splitlines()] == [Job(a=1), Job(a=3)]
+    assert "Missing option '--a'" in result.stderr
+    assert "Invocation 1 (--b c) exited with code 2" in result.stderr
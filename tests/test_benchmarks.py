@@ -0,0 +1,31 @@
+from benchmarks import records
+from benchmarks.startup import compare, run
+
+
+def test_benchmarks_run():
+    results = run(scale=0.01, repeat=1)
+    assert set(results) == {
+        "import",
+        *(
+            f"{step}.{shape}"
+            for step in ("decoration", "invocation")
+            for shape in ("wide", "deep", "unions", "unpacked")
+        ),
+    }
+    assert all(duration > 0 for duration in results.values())
+
+
+def test_compare_with_baseline():
+    comparisons = {
+        comparison.name: comparison for comparison in compare({"a": 1.3, "b": 1.1, "c": 1.0}, {"a": 1.0, "b": 1.0}, 0.2)
+    }
+    assert comparisons["a"].regression
+    assert not comparisons["b"].regression
+    assert comparisons["c"].baseline is None
+    assert not comparisons["c"].regression
+
+
+def test_records_benchmark_runs():
+    results = records.run(rows=10, chunk_size=3)
+    assert set(results) == {"csv.default", "csv.flat", "jsonl"}
+    assert all(throughput > 0 for throughput in results.values())
@@ -0,0 +1,99 @@
+import importlib.util
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from pydanclick.__main__ import cli
+from pydanclick.codegen import generate_module, import_model
+from pydanclick.command import add_options
+from pydanclick.model import convert_to_click, model_conversion
+
+
+def _import_module(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _info(options):
+    return [repr(option.to_info_dict()) for option in options]
+
+
+def _make_command(options, validate):
+    @click.command("cli")
+    @add_options(options)
+    def command(**kwargs):
+        click.echo(validate(kwargs).model_dump_json())
+
+    return command
+
+
+@pytest.mark.parametrize(
+    "model_path, kwargs, args",
+    [
+        ("tests.base_models:Obj", {}, ["--bar-baz-c", "b", "--no-foo-b", "--bar-a", "0.5"]),
+        ("tests.base_models:Obj", {"prefix": "obj", "rename": {"bar.baz": "--baz"}, "shorten": {"foo.a": "-a"}}, []),
+        ("tests.base_models:Foos", {"unpack_list": True}, ["--foos-a", "1", "--foos-a", "2", "--foos-b"]),
+        ("examples.complex_types:RunConfig", {}, ["--image", "foo", "--ports", '{"80": 8080}']),
+        ("examples.nested:Obj", {"exclude": ["bar.b"]}, ["--foo-a", "2", "--bar-baz-c", "b"]),
+        ("examples.simple:TrainingConfig", {"docstring_parser": "builtin"}, ["--epochs", "2", "--lr", "0"]),
+    ],
+)
+def test_generated_module_is_equivalent(tmp_path, monkeypatch, model_path, kwargs, args):
+    path = tmp_path / "generated_options.py"
+    path.write_text(generate_module(model_path, **kwargs))
+    model = import_model(model_path)
+    expected_options, expected_validate = convert_to_click(model, **kwargs)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("generated modules shouldn't collect fields")
+
+    monkeypatch.setattr(model_conversion, "collect_fields", fail)
+    generated = _import_module(path)
+    assert _info(generated.options) == _info(expected_options)
+    for arguments in (args, ["--help"]):
+        expected = CliRunner().invoke(_make_command(expected_options, expected_validate), arguments)
+        result = CliRunner().invoke(_make_command(generated.options, generated.validate), arguments)
+        assert (result.exit_code, result.output) == (expected.exit_code, expected.output)
+        assert result.exit_code == 0 or "--lr" in arguments
+
+
+def test_codegen_command(tmp_path, monkeypatch):
+    output = tmp_path / "options.py"
+    args = ["codegen", "tests.base_models:Obj", "--output", str(output), "--prefix", "obj"]
+    result = CliRunner().invoke(cli, args, catch_exceptions=False)
+    assert result.exit_code == 0
+    source = output.read_text()
+    assert "python -m pydanclick codegen tests.base_models:Obj --prefix obj\n" in source
+    assert CliRunner().invoke(cli, [*args, "--check"]).exit_code == 0
+    # The output path doesn't make the module outdated
+    with monkeypatch.context() as m:
+        m.chdir(tmp_path)
+        assert CliRunner().invoke(cli, [*args[:2], "-o", "./options.py", *args[4:], "--check"]).exit_code == 0
+    output.write_text(source.replace("--obj-foo-a", "--obj-a"))
+    result = CliRunner(mix_stderr=False).invoke(cli, [*args, "--check"])
+    assert result.exit_code == 1
+    assert (
+        f"is outdated, run: python -m pydanclick codegen tests.base_models:Obj --prefix obj --output {output}"
+        in result.stderr
+    )
+
+
+def test_generated_module_is_formatted():
+    source = generate_module("examples.complex_types:RunConfig", docstring_parser="builtin")
+    lines = source.splitlines()
+    # Code formatters don't change the module, so that `--check` still passes once it's formatted
+    assert max(map(len, lines)) <= 120
+    assert "'" not in "\n".join(line for line in lines if "help=" not in line)
+    imports = lines[lines.index("import click") : lines.index("options = [")]
+    assert imports == [
+        "import click",
+        "",
+        "from examples.complex_types import RunConfig",
+        "from pydanclick.codegen import LazyJsonParamType, PydanclickDefaultCallable, field_info, wrap_type",
+        "from pydanclick.model.validation import ValidationPlan",
+        "",
+    ]
+    assert '    qualified_names={\n        "image": "image",\n' in source
@@ -0,0 +1,82 @@
+import importlib.metadata
+
+import click
+import pytest
+from click.testing import CliRunner
+from pydantic import BaseModel, Field
+
+from pydanclick import from_pydantic
+from pydanclick.model import convert_to_click, disk_cache, model_conversion
+from pydanclick.model.disk_cache import get_cache_key
+from tests.base_models import Foo, Obj
+
+
+def _info(options):
+    # Defaults are wrapped in `PydanclickDefault`, which doesn't compare equal to itself: compare representations
+    return [repr(option.to_info_dict()) for option in options]
+
+
+def test_warm_start_reuses_cached_options(tmp_path, monkeypatch):
+    cold_options, _ = convert_to_click(Obj, prefix="obj", cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("fields shouldn't be collected on warm starts")
+
+    monkeypatch.setattr(model_conversion, "collect_fields", fail)
+    warm_options, validator = convert_to_click(Obj, prefix="obj", cache_dir=tmp_path)
+    assert _info(warm_options) == _info(cold_options)
+    assert validator({"obj_foo_a": 2}) == Obj(foo=Foo(a=2))
+
+
+def test_cache_key_depends_on_arguments():
+    assert get_cache_key(Obj, {"prefix": None}) == get_cache_key(Obj, {"prefix": None})
+    assert get_cache_key(Obj, {"prefix": None}) != get_cache_key(Obj, {"prefix": "obj"})
+    assert get_cache_key(Obj, {"prefix": None}) != get_cache_key(Foo, {"prefix": None})
+
+
+@pytest.mark.parametrize("distribution", ["click", "pydanclick"])
+def test_cache_key_depends_on_versions(monkeypatch, distribution):
+    key = get_cache_key(Obj, {"prefix": None})
+    version = importlib.metadata.version
+
+    def fake_version(name):
+        return "0.0.0" if name == distribution else version(name)
+
+    monkeypatch.setattr(importlib.metadata, "version", fake_version)
+    disk_cache._get_versions.cache_clear()
+    try:
+        assert get_cache_key(Obj, {"prefix": None}) != key
+    finally:
+        disk_cache._get_versions.cache_clear()
+
+
+def test_cache_key_ignores_memory_addresses():
+    assert get_cache_key(Obj, {"extra_options": {"foo.a": {"callback": lambda *args: None}}}) == get_cache_key(
+        Obj, {"extra_options": {"foo.a": {"callback": lambda *args: None}}}
+    )
+
+
+def test_unpicklable_model_is_not_cached(tmp_path):
+    class Local(BaseModel):
+        a: list[int] = Field(default_factory=lambda: [1])
+
+    _, validator = convert_to_click(Local, cache_dir=tmp_path)
+    assert not list(tmp_path.glob("*.pickle"))
+    assert validator({"a": [2]}) == Local(a=[2])
+
+
+@pytest.mark.parametrize("args", [[], ["--bar-baz-c", "b", "--no-foo-b"]])
+def test_cached_command(tmp_path, args):
+    @click.command("cli")
+    @from_pydantic(Obj, cache_dir=tmp_path)
+    def cold(obj: Obj):
+        click.echo(obj.model_dump_json())
+
+    @click.command("cli")
+    @from_pydantic(Obj, cache_dir=tmp_path)
+    def warm(obj: Obj):
+        click.echo(obj.model_dump_json())
+
+    assert CliRunner().invoke(cold, args).output == CliRunner().invoke(warm, args).output
+    assert CliRunner().invoke(cold, ["--help"]).output == CliRunner().invoke(warm, ["--help"]).output
@@ -0,0 +1,207 @@
+import gc
+
+import click
+import pytest
+from click.testing import CliRunner
+from pydantic import BaseModel
+
+from pydanclick import from_pydantic
+from pydanclick.model import docstrings
+from pydanclick.model.docstrings import (
+    _parse_with_builtin_parser,
+    _parse_with_griffe,
+    clear_docstring_cache,
+    docstring_cache_info,
+    parse_attribute_documentation,
+)
+from pydanclick.model.field_collection import collect_fields
+
+
+class Shared(BaseModel):
+    """Shared model.
+
+    Attributes:
+        a: first field
+    """
+
+    a: int = 0
+
+
+class Parent(BaseModel):
+    """Parent model.
+
+    Attributes:
+        x: first occurrence
+        y: second occurrence
+    """
+
+    x: Shared = Shared()
+    y: Shared = Shared()
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_docstring_cache()
+    yield
+    clear_docstring_cache()
+
+
+def test_parse_attribute_documentation():
+    assert parse_attribute_documentation(Parent) == {"x": "first occurrence", "y": "second occurrence"}
+
+
+def test_parse_attribute_documentation_is_memoized():
+    fields = collect_fields(Parent)
+    assert [field.documentation for field in fields] == ["first field", "first field"]
+    # Docstrings are only parsed once documentation is resolved: `Parent` is never parsed here
+    assert docstring_cache_info()[:2] == (1, 1)
+    parse_attribute_documentation(Parent, docstring_style="numpy")
+    assert docstring_cache_info().misses == 2
+    assert docstring_cache_info().currsize == 2
+
+
+def test_docstrings_are_only_parsed_for_help(monkeypatch):
+    @click.command()
+    @from_pydantic(Parent)
+    def cli(parent: Parent):
+        click.echo(parent.model_dump_json())
+
+    def fail(*args, **kwargs):
+        raise AssertionError("docstrings shouldn't be parsed outside of help")
+
+    with monkeypatch.context() as m:
+        m.setattr(docstrings, "parse_attribute_documentation", fail)
+        result = CliRunner().invoke(cli, ["--x-a", "1"])
+    assert result.exit_code == 0, result.output
+    assert docstring_cache_info().currsize == 0
+    result = CliRunner().invoke(cli, ["--help"])
+    assert "first field" in result.output
+    assert docstring_cache_info().currsize == 1
+
+
+def test_parse_attribute_documentation_does_not_leak_models():
+    def parse_dynamic_model():
+        class Dynamic(BaseModel):
+            """Dynamic model.
+
+            Attributes:
+                a: some field
+            """
+
+            a: int = 0
+
+        assert parse_attribute_documentation(Dynamic) == {"a": "some field"}
+
+    parse_dynamic_model()
+    gc.collect()
+    assert docstring_cache_info().currsize == 0
+
+
+GOOGLE_DOCSTRING = """Summary.
+
+    Args:
+        z: not an attribute
+
+    Attributes:
+        a: first
+        b (int): second
+            continued here
+              more indented
+        c:   spaced
+        d:
+            on next line
+
+        e: after blank
+
+    Returns:
+        nothing
+    """
+
+NUMPY_DOCSTRING = """Summary.
+
+    Attributes
+    ----------
+    a : int
+        first
+    b
+        second
+        continued
+    c : str
+
+    d : float
+        after blank
+
+    Parameters
+    ----------
+    z : int
+        no
+    """
+
+SPHINX_DOCSTRING = """Summary.
+
+    :ivar a: first
+    :var b: second
+        continued
+    :cvar c: third
+    :vartype a: int
+    :param z: no
+    :ivar a: duplicate
+    """
+
+
+@pytest.mark.parametrize(
+    "docstring, docstring_style",
+    [
+        (GOOGLE_DOCSTRING, "google"),
+        (NUMPY_DOCSTRING, "numpy"),
+        (SPHINX_DOCSTRING, "sphinx"),
+        ("Summary.\nAttributes:\n    a: missing blank line above", "google"),
+        ("Summary.\n\nAttributes:\n\n    a: extraneous blank line below", "google"),
+        ("Summary.\n\n```\nAttributes:\n    a: in code block\n```\n\nAttributes:\n    b: outside code block", "google"),
+        ("Summary.\n\nAttributes\n---\na\nb : int\n  desc\n\n\nc:str\n    x\nNotes\n-----\nnothing", "numpy"),
+        ("", "google"),
+        ("", "numpy"),
+        ("", "sphinx"),
+    ],
+)
+def test_builtin_parser_matches_griffe(docstring, docstring_style):
+    pytest.importorskip("griffe")
+    assert _parse_with_builtin_parser(docstring, docstring_style) == _parse_with_griffe(docstring, docstring_style)
+
+
+def test_builtin_parser():
+    assert parse_attribute_documentation(Parent, docstring_parser="builtin") == {
+        "x": "first occurrence",
+        "y": "second occurrence",
+    }
+
+    @click.command()
+    @from_pydantic(Parent, docstring_parser="builtin")
+    def cli(parent: Parent):
+        pass
+
+    result = CliRunner().invoke(cli, ["--help"])
+    assert "first field" in result.output
+
+
+class NumpyShared(BaseModel):
+    """Shared model.
+
+    Attributes
+    ----------
+    a
+        first field
+    """
+
+    a: int = 0
+
+
+class NumpyParent(BaseModel):
+    """Parent model."""
+
+    x: NumpyShared = NumpyShared()
+
+
+def test_docstring_style_applies_to_nested_models():
+    fields = collect_fields(NumpyParent, docstring_style="numpy")
+    assert [field.documentation for field in fields] == ["first field"]
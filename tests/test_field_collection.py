@@ -1,3 +1,10 @@
+import inspect
+import sys
+from typing import Optional
+
+from pydantic import BaseModel, Field, create_model
+
+from pydanclick.model import field_collection
 from pydanclick.model.field_collection import _Field, collect_fields
 from tests.base_models import Bar, Baz, Foo, Foos, Obj
 
@@ -19,6 +26,72 @@ def test_collect_fields_with_exclude():
     # TODO: test docstring parsing
 
 
+def test_collect_fields_with_exclude_prunes_excluded_subtrees(monkeypatch):
+    visited = []
+    get_model_fields = field_collection._get_model_fields
+
+    def record(model, *args, **kwargs):
+        visited.append(model)
+        return get_model_fields(model, *args, **kwargs)
+
+    monkeypatch.setattr(field_collection, "_get_model_fields", record)
+    fields = collect_fields(Obj, excluded_fields=["bar", "foo.b", "foo.a.c"])
+    assert [field.dotted_name for field in fields] == ["foo.a"]
+    assert visited == [Obj, Foo]
+
+
+class Node(BaseModel):
+    name: str = "node"
+    child: Optional["Node"] = None
+    children: list["Node"] = Field(default_factory=list)
+
+
+class Tree(BaseModel):
+    root: Node = Field(default_factory=Node)
+    other: Node = Field(default_factory=Node)
+
+
+def test_collect_fields_with_recursive_model():
+    fields = collect_fields(Tree, unpack_list=True)
+    assert [(field.dotted_name, field.unpacked_from) for field in fields] == [
+        ("root.name", None),
+        ("root.child", None),
+        ("root.children", None),
+        ("other.name", None),
+        ("other.child", None),
+        ("other.children", None),
+    ]
+    # Model fields are collected once, and shared between paths
+    assert fields[0].documentation is fields[3].documentation
+
+
+def test_collect_fields_with_max_depth():
+    assert [field.dotted_name for field in collect_fields(Obj, max_depth=1)] == ["foo", "bar"]
+    assert [field.dotted_name for field in collect_fields(Obj, max_depth=2)] == [
+        "foo.a",
+        "foo.b",
+        "bar.a",
+        "bar.b",
+        "bar.baz",
+    ]
+
+
+def test_collect_fields_with_deeply_nested_model():
+    depth = 30
+    model = Foo
+    for i in range(depth):
+        model = create_model(f"Model{i}", sub=(model, Field(default_factory=model)))
+    recursion_limit = sys.getrecursionlimit()
+    # Leave less room on the interpreter stack than the nesting depth
+    sys.setrecursionlimit(len(inspect.stack()) + 20)
+    try:
+        fields = collect_fields(model)
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+    assert [field.name for field in fields] == ["a", "b"]
+    assert len(fields[0].parents) == depth + 1
+
+
 def test_collect_fields_without_unpack_list():
     fields = collect_fields(Foos, unpack_list=False)
     assert fields == [_Field(name="foos", dotted_name="foos", field_info=Foos.model_fields["foos"], parents=("foos",))]
@@ -0,0 +1,77 @@
+import subprocess
+import sys
+import textwrap
+
+
+def _run(code):
+    """Run `code` in a fresh interpreter, and return the modules it imported (as printed by `code`)."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=sys.path[0] or ".",
+    )
+    return result.stdout.split()
+
+
+def test_import_pydanclick_is_lazy():
+    modules = _run(
+        """
+        import sys
+        import sysconfig
+
+        before = set(sys.modules)
+        import pydanclick
+
+        stdlib = (sysconfig.get_paths()["stdlib"], sysconfig.get_paths()["platstdlib"])
+        files = {name: getattr(sys.modules[name], "__file__", None) for name in set(sys.modules) - before}
+        print(*sorted(name for name, file in files.items() if file and not file.startswith(stdlib)))
+        """
+    )
+    assert modules == ["pydanclick"]
+
+
+def test_lazy_command_does_not_import_conversion_machinery():
+    modules = _run(
+        """
+        import sys
+
+        import click
+        from pydanclick import from_pydantic
+        from tests.base_models import Foo
+
+        @click.command()
+        @from_pydantic(Foo, lazy=True)
+        def cli(foo):
+            pass
+
+        print(*sorted(sys.modules))
+        print("---")
+        cli(["--a", "2"], standalone_mode=False)
+        print(*sorted(sys.modules))
+        """
+    )
+    separator = modules.index("---")
+    before_invocation, after_invocation = modules[:separator], modules[separator + 1 :]
+    assert not [module for module in before_invocation if module.startswith(("pydanclick.model", "griffe"))]
+    assert "pydanclick.model.model_conversion" in after_invocation
+
+
+def test_generated_module_does_not_import_conversion_machinery(tmp_path):
+    from pydanclick.codegen import generate_module
+
+    (tmp_path / "gen_obj.py").write_text(generate_module("tests.base_models:Obj"))
+    modules = _run(
+        f"""
+        import sys
+
+        sys.path.append({str(tmp_path)!r})
+        import gen_obj
+
+        print(*sorted(sys.modules))
+        """
+    )
+    assert "gen_obj" in modules
+    conversion_modules = ["disk_cache", "field_collection", "docstrings", "field_conversion", "model_conversion"]
+    assert not [module for module in modules if module.split(".")[-1] in conversion_modules]
@@ -1,9 +1,14 @@
+from pathlib import Path
+from typing import Literal, Optional
+
 import click
 import pytest
 from click.testing import CliRunner
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 
+import pydanclick.model
 from pydanclick import from_pydantic
+from pydanclick.model.validation import ConstructionPlan
 from tests.base_models import Bar, Baz, Foo, Foos, MultipleFoos, NestedFoos, Obj, OptionalFoos, UnionFoos
 
 
@@ -25,16 +30,151 @@ def test_cli():
     assert Config.model_validate_json(result.output) == Config()
 
 
-def test_nested():
+class StrictInner(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    a: int = 0
+    b: float = 0.0
+
+
+class StrictOuter(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    inner: StrictInner = StrictInner()
+    c: int = Field(0, strict=False)
+    tags: list[str] = []
+
+
+@pytest.mark.parametrize("validation", ["default", "flat", "pydantic-only", "click-trusted", "incremental"])
+@pytest.mark.parametrize(
+    "model, args, expected",
+    [
+        (
+            Obj,
+            ["--no-foo-b", "--bar-baz-c", "b", "--bar-a", "0.5"],
+            Obj(foo=Foo(b=False), bar=Bar(a=0.5, baz=Baz(c="b"))),
+        ),
+        (
+            StrictOuter,
+            ["--inner-a", "3", "--inner-b", "4", "--c", "5", "--tags", '["x"]'],
+            StrictOuter(inner=StrictInner(a=3, b=4.0), c=5, tags=["x"]),
+        ),
+    ],
+)
+def test_nested(validation, model, args, expected):
     @click.command()
-    @from_pydantic("obj", Obj)
-    def cli(obj: Obj):
+    @from_pydantic("obj", model, validation=validation)
+    def cli(obj: BaseModel):
         click.echo(obj.model_dump_json(indent=2))
 
     runner = CliRunner()
-    result = runner.invoke(cli, ["--no-foo-b", "--bar-baz-c", "b", "--bar-a", "0.5"])
-    print(result.output)
-    assert Obj.model_validate_json(result.output) == Obj(foo=Foo(b=False), bar=Bar(a=0.5, baz=Baz(c="b")))
+    result = runner.invoke(cli, args, catch_exceptions=False)
+    assert model.model_validate_json(result.output) == expected
+
+
+def test_pydantic_only_validation():
+    class Model(BaseModel):
+        a: int = 0
+        b: list[int] = [1]
+        c: Optional[str] = None
+
+    @click.command()
+    @from_pydantic("model", Model, validation="pydantic-only")
+    def cli(model: Model):
+        click.echo(model.model_dump_json())
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--a", "1", "--b", "[2, 3]", "--c", "c"], catch_exceptions=False)
+    assert Model.model_validate_json(result.output) == Model(a=1, b=[2, 3], c="c")
+    assert Model.model_validate_json(runner.invoke(cli, []).output) == Model()
+    # Values are only parsed by Pydantic
+    result = runner.invoke(cli, ["--a", "x"])
+    assert isinstance(result.exception, ValidationError)
+    assert result.exception.errors()[0]["loc"] == ("a",)
+
+
+def test_click_trusted_validation_with_constraints():
+    class Model(BaseModel):
+        xs: list[int] = Field([1, 2], min_length=2)
+        ys: list[int] = [1]
+
+    @click.command()
+    @from_pydantic("model", Model, validation="click-trusted")
+    def cli(model: Model):
+        click.echo(repr(model))
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--xs", "[1, 2, 3]", "--ys", "[]"], catch_exceptions=False)
+    assert result.output.strip() == repr(Model(xs=[1, 2, 3], ys=[]))
+    # Constraints of fields aren't checked by Click types, and are validated by Pydantic
+    result = runner.invoke(cli, ["--xs", "[1]"])
+    assert isinstance(result.exception, ValidationError)
+    assert result.exception.errors()[0]["loc"] == ("xs",)
+
+
+def test_click_trusted_validation_with_config():
+    class Model(BaseModel):
+        model_config = ConfigDict(str_to_lower=True)
+
+        tags: list[str] = []
+
+    @click.command()
+    @from_pydantic("model", Model, validation="click-trusted")
+    def cli(model: Model):
+        click.echo(repr(model))
+
+    result = CliRunner().invoke(cli, ["--tags", '["ABC"]'], catch_exceptions=False)
+    assert result.output.strip() == repr(Model(tags=["abc"]))
+
+
+class Trusted(BaseModel):
+    a: int = 0
+    b: Optional[str] = None
+    c: Literal["x", "y"] = "x"
+    d: bool = False
+    e: Path = Path("e")
+
+
+class Constrained(BaseModel):
+    a: int = Field(0, ge=0)
+
+
+class Validated(BaseModel):
+    a: int = 0
+
+    @field_validator("a")
+    @classmethod
+    def validate_a(cls, value):
+        return value
+
+
+class Strict(BaseModel):
+    model_config = ConfigDict(str_to_lower=True)
+
+    a: str = "a"
+
+
+@pytest.mark.parametrize(
+    "model, is_trusted",
+    [(Trusted, True), (Obj, False), (Constrained, False), (Validated, False), (Strict, False), (Foos, False)],
+)
+def test_trusted(model, is_trusted):
+    _, validate = pydanclick.model.convert_to_click(model, trusted=True)
+    assert isinstance(validate, ConstructionPlan) == is_trusted
+
+
+def test_trusted_command():
+    @click.command()
+    @from_pydantic("trusted", Trusted, trusted=True)
+    def cli(trusted: Trusted):
+        click.echo(repr(trusted))
+        click.echo(sorted(trusted.model_fields_set))
+
+    result = CliRunner().invoke(cli, ["--a", "1", "--c", "y", "--d", "--e", "f"], catch_exceptions=False)
+    assert result.output.splitlines() == [
+        repr(Trusted(a=1, c="y", d=True, e=Path("f"))),
+        str(["a", "c", "d", "e"]),
+    ]
 
 
 def test_list_field():
@@ -125,3 +265,91 @@ def test_unpack_list_with_nested_list():
     result = CliRunner().invoke(cli, ["--nested-foos-a", "2", "--no-nested-foos-b", "--nested-foos-a", "3"])
     assert result.exit_code == 0
     assert NestedFoos.model_validate_json(result.output) == NestedFoos(nested=Foos(foos=[Foo(a=2, b=False), Foo(a=3)]))
+
+
+@pytest.fixture
+def conversion_counter(monkeypatch):
+    calls = []
+    convert_to_click = pydanclick.model.convert_to_click
+
+    def counting_convert_to_click(model, **kwargs):
+        calls.append(model)
+        return convert_to_click(model, **kwargs)
+
+    monkeypatch.setattr(pydanclick.model, "convert_to_click", counting_convert_to_click)
+    return calls
+
+
+def test_lazy_conversion(conversion_counter):
+    @click.group()
+    def cli():
+        pass
+
+    @cli.command()
+    @from_pydantic(Obj, lazy=True)
+    def obj(obj: Obj):
+        click.echo(obj.model_dump_json())
+
+    @cli.command()
+    @from_pydantic(Foo, lazy=True)
+    def foo(foo: Foo):
+        click.echo(foo.model_dump_json())
+
+    assert conversion_counter == []
+    assert CliRunner().invoke(cli, ["--help"]).exit_code == 0
+    assert conversion_counter == []
+    result = CliRunner().invoke(cli, ["foo", "--a", "3"], catch_exceptions=False)
+    assert Foo.model_validate_json(result.output) == Foo(a=3)
+    assert conversion_counter == [Foo]
+    result = CliRunner().invoke(cli, ["foo", "--no-b"], catch_exceptions=False)
+    assert Foo.model_validate_json(result.output) == Foo(b=False)
+    assert conversion_counter == [Foo]
+
+
+@pytest.mark.parametrize("args", [[], ["--no-foo-b", "--bar-baz-c", "b", "--bar-a", "0.5"], ["--help"]])
+def test_lazy_conversion_is_transparent(args):
+    @click.command("cli")
+    @click.option("--before")
+    @from_pydantic(Obj, lazy=True)
+    @click.option("--after")
+    def lazy_cli(obj: Obj, before, after):
+        click.echo(obj.model_dump_json())
+
+    @click.command("cli")
+    @click.option("--before")
+    @from_pydantic(Obj)
+    @click.option("--after")
+    def eager_cli(obj: Obj, before, after):
+        click.echo(obj.model_dump_json())
+
+    lazy_result = CliRunner().invoke(lazy_cli, args, catch_exceptions=False)
+    eager_result = CliRunner().invoke(eager_cli, args, catch_exceptions=False)
+    assert lazy_result.exit_code == eager_result.exit_code == 0
+    assert lazy_result.output == eager_result.output
+
+
+class Node(BaseModel):
+    name: str = "node"
+    child: Optional["Node"] = None
+
+
+def test_recursive_model():
+    @click.command()
+    @from_pydantic(Node)
+    def cli(node: Node):
+        click.echo(node.model_dump_json())
+
+    result = CliRunner().invoke(
+        cli, ["--name", "root", "--child", '{"child": {"name": "leaf"}}'], catch_exceptions=False
+    )
+    assert Node.model_validate_json(result.output) == Node(name="root", child=Node(child=Node(name="leaf")))
+
+
+def test_max_depth():
+    @click.command()
+    @from_pydantic(Obj, max_depth=1)
+    def cli(obj: Obj):
+        click.echo(obj.model_dump_json())
+
+    result = CliRunner().invoke(cli, ["--foo", '{"a": 2}'], catch_exceptions=False)
+    assert Obj.model_validate_json(result.output) == Obj(foo=Foo(a=2))
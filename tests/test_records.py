@@ -0,0 +1,214 @@
+import io
+import itertools
+
+import click
+import pytest
+from click.testing import CliRunner
+from pydantic import BaseModel
+
+from pydanclick import from_pydantic
+from pydanclick.model import convert_to_click
+from pydanclick.records import RecordValidator, iter_csv_records, iter_records
+from tests.base_models import Bar, Baz, Foo, Obj
+
+
+class Job(BaseModel):
+    a: int
+    b: str = "b"
+
+
+@click.command()
+@from_pydantic("job", Job, records=True)
+@click.option("--verbose", is_flag=True)
+def cli(job: Job, verbose: bool):
+    click.echo(f"{verbose} {job.model_dump_json()}")
+
+
+@pytest.mark.parametrize(
+    "record, overrides, expected",
+    [
+        (b'{"foo": {"a": 2}}', {}, Obj(foo=Foo(a=2))),
+        (b'{"foo.a": 2, "bar.baz.c": "b"}', {}, Obj(foo=Foo(a=2), bar=Bar(baz=Baz(c="b")))),
+        (b'{"foo.a": 2, "foo": {"b": false}}', {}, Obj(foo=Foo(a=2, b=False))),
+        (b'{"foo": {"a": 2, "b": false}}', {"foo": {"a": 3}}, Obj(foo=Foo(a=3, b=False))),
+        (b'{"bar": {"b": "a.b", "a": 1.5}}', {}, Obj(bar=Bar(a=1.5, b="a.b"))),
+    ],
+)
+def test_record_validator(record, overrides, expected):
+    assert RecordValidator(Obj, overrides)(record) == expected
+
+
+def test_iter_records_is_lazy():
+    file = io.BytesIO(b'{"a": 1}\n\n{"a": 2}\n{"a": "x"}\n')
+    records = iter_records(file, RecordValidator(Job))
+    assert next(records) == Job(a=1)
+    assert next(records) == Job(a=2)
+    with pytest.raises(click.BadParameter, match="line 4"):
+        next(records)
+
+
+def test_records_option():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--job-records", "-"], input='{"a": 1}\n{"a": 2, "b": "c"}\n', catch_exceptions=False)
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [
+        f"False {Job(a=1).model_dump_json()}",
+        f"False {Job(a=2, b='c').model_dump_json()}",
+    ]
+
+
+def test_records_option_with_overrides(tmp_path):
+    records = tmp_path / "records.jsonl"
+    records.write_text('{"a": 1}\n{"a": 2, "b": "c"}\n')
+    result = CliRunner().invoke(cli, ["--job-records", str(records), "--b", "d", "--verbose"], catch_exceptions=False)
+    assert result.output.splitlines() == [
+        f"True {Job(a=1, b='d').model_dump_json()}",
+        f"True {Job(a=2, b='d').model_dump_json()}",
+    ]
+
+
+def test_records_option_with_invalid_record():
+    result = CliRunner().invoke(cli, ["--job-records", "-"], input='{"a": 1}\n{"b": "c"}\n')
+    assert result.exit_code == 2
+    assert "invalid record on line 2" in result.output
+
+
+def test_records_option_is_not_required():
+    result = CliRunner().invoke(cli, ["--a", "1"], catch_exceptions=False)
+    assert result.output == f"False {Job(a=1).model_dump_json()}\n"
+
+
+def test_lazy_records_option():
+    @click.command()
+    @from_pydantic("job", Job, records=True, lazy=True)
+    def cli(job: Job):
+        click.echo(job.a)
+
+    result = CliRunner().invoke(cli, ["--job-records", "-", "--a", "3"], input='{"a": 1}\n{"a": 2}\n')
+    assert result.output.splitlines() == ["3", "3"]
+
+
+@click.command()
+@from_pydantic("obj", Obj, records=True, records_format="csv", records_chunk_size=2)
+def csv_cli(obj: Obj):
+    click.echo(obj.model_dump_json())
+
+
+def test_csv_records():
+    table = "foo.a,foo_b,bar.baz.c\n1,false,b\n2,,\n3,true,a\n"
+    result = CliRunner().invoke(csv_cli, ["--obj-records", "-"], input=table, catch_exceptions=False)
+    assert [Obj.model_validate_json(line) for line in result.output.splitlines()] == [
+        Obj(foo=Foo(a=1, b=False), bar=Bar(baz=Baz(c="b"))),
+        Obj(foo=Foo(a=2)),
+        Obj(foo=Foo(a=3, b=True)),
+    ]
+
+
+def test_csv_records_with_overrides():
+    table = "foo.a,bar.a\n1,0.5\n2,1.5\n"
+    result = CliRunner().invoke(csv_cli, ["--obj-records", "-", "--bar-a", "2"], input=table, catch_exceptions=False)
+    assert [Obj.model_validate_json(line).bar.a for line in result.output.splitlines()] == [2, 2]
+
+
+@pytest.mark.parametrize(
+    "table, message",
+    [
+        ("foo.a,unknown\n1,2\n", "unknown column 'unknown'"),
+        ("foo.a\n1\n2\nx\n", "invalid record on line 4, column 'foo.a': 'x' is not a valid integer"),
+        ("bar.baz.c\na\nc\n", "invalid record on line 3"),
+    ],
+)
+def test_invalid_csv_records(table, message):
+    result = CliRunner().invoke(csv_cli, ["--obj-records", "-"], input=table)
+    assert result.exit_code == 2
+    assert message in result.output
+
+
+
+@pytest.mark.parametrize("validation", ["default", "pydantic-only"])
+def test_csv_records_are_validated_by_chunks(validation):
+    options, plan = convert_to_click(Job, validation=validation)
+    chunks = []
+    validate_chunk = plan._validate_chunk
+    plan._validate_chunk = lambda values: chunks.append(len(values)) or validate_chunk(values)
+    table = io.StringIO("a,b\n1,x\n2,\n3,y\n4,\nz,\n")
+    instances = iter_csv_records(table, plan, options, chunk_size=2)
+    assert [job.a for job in itertools.islice(instances, 4)] == [1, 2, 3, 4]
+    assert chunks == [2, 2]
+    with pytest.raises(click.BadParameter, match="invalid record on line 6"):
+        next(instances)
+
+
+def test_invalid_csv_records_in_later_chunks():
+    # Cells are converted by Pydantic, so that errors are raised when validating chunks
+    options, plan = convert_to_click(Job, validation="pydantic-only")
+    instances = iter_csv_records(io.StringIO("a\n1\n2\n3\nz\n5\n"), plan, options, chunk_size=2)
+    assert [job.a for job in itertools.islice(instances, 3)] == [1, 2, 3]
+    with pytest.raises(click.BadParameter, match="invalid record on line 5:"):
+        next(instances)
+
+def test_tsv_records():
+    @click.command()
+    @from_pydantic("job", Job, records=True, records_format="tsv")
+    def cli(job: Job):
+        click.echo(job.model_dump_json())
+
+    result = CliRunner().invoke(cli, ["--job-records", "-"], input="a\tb\n1\tx, y\n", catch_exceptions=False)
+    assert result.output == Job(a=1, b="x, y").model_dump_json() + "\n"
+
+
+def test_csv_records_with_multiline_cells(tmp_path):
+    @click.command()
+    @from_pydantic("job", Job, records=True, records_format="csv")
+    def cli(job: Job):
+        click.echo(repr(job))
+
+    path = tmp_path / "jobs.csv"
+    path.write_bytes(b'a,b\r\n1,"x\r\ny"\r\n2,z\r\n')
+    result = CliRunner().invoke(cli, ["--job-records", str(path)], catch_exceptions=False)
+    assert result.output.splitlines() == [repr(Job(a=1, b="x\r\ny")), repr(Job(a=2, b="z"))]
+
+
+def test_csv_records_with_unpacked_lists():
+    class Item(BaseModel):
+        name: str
+
+    class Model(BaseModel):
+        items: list[Item] = []
+        a: int = 0
+
+    @click.command()
+    @from_pydantic("model", Model, records=True, records_format="csv", unpack_list=True)
+    def cli(model: Model):
+        pass
+
+    result = CliRunner().invoke(cli, ["--model-records", "-"], input="items.name,a\nfoo,3\n")
+    assert result.exit_code == 2
+    assert "column 'items.name' takes several values" in result.output
+
+
+class Tagged(BaseModel):
+    a: int = 0
+    tags: list[int] = []
+
+
+@pytest.mark.parametrize("records_format, table", [("jsonl", '{"a": 1}\n'), ("csv", "a\n1\n")])
+def test_records_with_raw_json_overrides(records_format, table):
+    @click.command()
+    @from_pydantic("m", Tagged, records=True, records_format=records_format, validation="pydantic-only")
+    def cli(m: Tagged):
+        click.echo(repr(m))
+
+    result = CliRunner().invoke(cli, ["--m-records", "-", "--tags", "[5]"], input=table, catch_exceptions=False)
+    assert result.output.strip() == repr(Tagged(a=1, tags=[5]))
+
+
+def test_json_records_with_invalid_raw_json_overrides():
+    @click.command()
+    @from_pydantic("m", Tagged, records=True, validation="pydantic-only")
+    def cli(m: Tagged):
+        pass
+
+    result = CliRunner().invoke(cli, ["--m-records", "-", "--tags", "[5"], input='{"a": 1}\n')
+    assert result.exit_code == 2
+    assert "Invalid value for '--tags': '[5' is not valid JSON" in result.output
@@ -0,0 +1,122 @@
+import itertools
+import pickle
+from typing import Literal
+
+import click
+import pytest
+from click.testing import CliRunner
+from pydantic import BaseModel, Field
+
+from pydanclick import from_pydantic
+from pydanclick.model.type_conversion import PydanclickDefault, _get_type_from_field
+from pydanclick.sweep import Sweep, SweepParamType, iter_sweep
+
+
+class Config(BaseModel):
+    lr: float = 0.1
+    seed: int = Field(0, ge=0)
+    optimizer: Literal["sgd", "adam", "a,b"] = "sgd"
+    name: str = "run"
+
+
+def _get_sweep_type(field_name: str) -> SweepParamType:
+    return SweepParamType(_get_type_from_field(Config.model_fields[field_name]))
+
+
+@pytest.mark.parametrize(
+    "field_name, value, expected",
+    [
+        ("seed", "3", 3),
+        ("seed", "1,2,5", Sweep((1, 2, 5))),
+        ("seed", "1..4", Sweep(range(1, 5))),
+        ("seed", "1..10:3", Sweep((1, 4, 7, 10))),
+        ("seed", "5..1:-2", Sweep((5, 3, 1))),
+        ("lr", "0.1..0.5:0.1", Sweep((0.1, 0.2, 0.3, 0.4, 0.5))),
+        ("lr", "-1..1", Sweep((-1.0, 0.0, 1.0))),
+        ("lr", "1e-3, 1e-2", Sweep((0.001, 0.01))),
+        ("optimizer", "sgd,adam", Sweep(("sgd", "adam"))),
+        ("optimizer", "a,b", "a,b"),
+    ],
+)
+def test_sweep_param_type(field_name, value, expected):
+    assert _get_sweep_type(field_name).convert(value, None, None) == expected
+
+
+@pytest.mark.parametrize(
+    "field_name, value",
+    [
+        ("seed", "1..x"),
+        ("seed", "0..10:0"),
+        ("seed", "3..1:1"),
+        ("seed", "1,-1"),
+        ("lr", "0..1:0"),
+        ("optimizer", "a..b"),
+    ],
+)
+def test_sweep_param_type_with_invalid_values(field_name, value):
+    with pytest.raises(click.BadParameter):
+        _get_sweep_type(field_name).convert(value, None, None)
+
+
+def test_sweep_param_type_keeps_defaults_and_pickles():
+    sweep_type = _get_sweep_type("seed")
+    assert sweep_type.convert(PydanclickDefault(0), None, None) is None
+    assert sweep_type.name == "integer range"
+    assert pickle.loads(pickle.dumps(sweep_type)).convert("1,2", None, None) == Sweep((1, 2))  # noqa: S301
+
+
+def test_iter_sweep_is_lazy():
+    kwargs = {"a": Sweep(range(10**6)), "b": Sweep(range(10**6)), "c": 0}
+    assert [(kwargs["a"], kwargs["b"]) for kwargs in itertools.islice(iter_sweep(kwargs), 3)] == [
+        (0, 0),
+        (0, 1),
+        (0, 2),
+    ]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize(
+    "sweep, args, expected",
+    [
+        ("product", ["--seed", "1"], [(0.1, 1, "sgd")]),
+        (
+            "product",
+            ["--seed", "1,2", "--optimizer", "sgd,adam"],
+            [(0.1, 1, "sgd"), (0.1, 1, "adam"), (0.1, 2, "sgd"), (0.1, 2, "adam")],
+        ),
+        ("zip", ["--seed", "1..3", "--lr", "0.1..0.3:0.1"], [(0.1, 1, "sgd"), (0.2, 2, "sgd"), (0.3, 3, "sgd")]),
+    ],
+)
+def test_from_pydantic_with_sweep(lazy, sweep, args, expected):
+    @click.command()
+    @from_pydantic("config", Config, sweep=sweep, lazy=lazy)
+    @click.option("--verbose", is_flag=True)
+    def cli(config: Config, verbose: bool):
+        assert verbose
+        click.echo(f"{config.lr} {config.seed} {config.optimizer}")
+
+    result = CliRunner().invoke(cli, [*args, "--verbose"], catch_exceptions=False)
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [" ".join(map(str, values)) for values in expected]
+
+
+def test_from_pydantic_with_zipped_sweeps_of_different_lengths():
+    @click.command()
+    @from_pydantic("config", Config, sweep="zip")
+    def cli(config: Config):
+        pass
+
+    result = CliRunner().invoke(cli, ["--seed", "1..3", "--lr", "0.1,0.2"])
+    assert result.exit_code == 2
+    assert "Zipped sweeps must have the same length, got seed (3 values), lr (2 values)" in result.output
+
+
+def test_from_pydantic_without_sweep():
+    @click.command()
+    @from_pydantic("config", Config)
+    def cli(config: Config):
+        pass
+
+    result = CliRunner().invoke(cli, ["--seed", "1,2"])
+    assert result.exit_code == 2
+    assert "'1,2' is not a valid integer" in result.output
@@ -1,3 +1,4 @@
+import pickle
 from typing import Annotated, Literal, Union
 
 import click
@@ -5,7 +6,15 @@ import pytest
 from click import BadParameter
 from pydantic import BaseModel, Field
 
-from pydanclick.model.type_conversion import _get_type_from_field
+from pydanclick.model import type_conversion
+from pydanclick.model.type_conversion import (
+    PydanclickDefault,
+    RawParamType,
+    _get_type_from_field,
+    clear_type_cache,
+    get_raw_type,
+    type_cache_info,
+)
 from tests.conftest import error_or_value
 
 
@@ -78,3 +87,81 @@ def test_get_type_from_field(annotation, raw_value, expected_outcome):
     with context:
         converted_value = click_type.convert(raw_value, None, None)
         check_expected(converted_value)
+
+
+def test_custom_types_are_shared_between_fields():
+    class Foo(BaseModel):
+        a: list[int]
+        b: list[int]
+        c: dict[str, float]
+
+    clear_type_cache()
+    types = [_get_type_from_field(field).actual_type for field in Foo.model_fields.values()]
+    assert types[0] is types[1]
+    assert types[0] is not types[2]
+    assert types[1].convert("[1, 2]", None, None) == [1, 2]
+    assert type_cache_info()["type_adapters"].currsize == 2
+    assert type_cache_info()["custom_types"][:2] == (1, 2)
+
+
+def test_custom_types_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(type_conversion, "_custom_types", type_conversion.LRUCache(maxsize=2))
+    for annotation in (list[int], list[str], list[float], list[int]):
+        type_conversion._create_custom_type_from_annotation(annotation)
+    assert type_cache_info()["custom_types"] == (0, 4, 2, 2)
+
+
+def test_wrapper_types_are_shared():
+    class Foo(BaseModel):
+        a: int
+        b: int
+        c: Annotated[int, Field(ge=0)]
+        d: Annotated[int, Field(le=0)]
+
+    a, b, c, d = (_get_type_from_field(field) for field in Foo.model_fields.values())
+    assert a is b
+    assert type(c) is type(d)
+    assert c is not d
+    assert type(pickle.loads(pickle.dumps(a))) is type(a)  # noqa: S301
+    assert d.convert("-1", None, None) == -1
+
+
+@pytest.mark.parametrize(
+    "annotation, value",
+    [
+        (int, "1"),
+        (Annotated[float, Field(gt=0)], "0.5"),
+        (Literal["a", "b"], "b"),
+        (bool, "true"),
+        (list[int], "[1, 2]"),
+        (dict[str, int], '{"a": 1}'),
+    ],
+)
+def test_types_can_be_pickled(annotation, value):
+    class Foo(BaseModel):
+        a: annotation
+
+    param_type = _get_type_from_field(Foo.model_fields["a"])
+    unpickled_type = pickle.loads(pickle.dumps(param_type))  # noqa: S301
+    assert type(unpickled_type) is type(param_type)
+    assert type(unpickled_type).__qualname__ == type(param_type).__qualname__ != "PydanclickParamType"
+    assert unpickled_type.convert(value, None, None) == param_type.convert(value, None, None)
+    assert unpickled_type.to_info_dict() == param_type.to_info_dict()
+
+
+@pytest.mark.parametrize(
+    "annotation, is_raw",
+    [(int, True), (Annotated[float, Field(gt=0)], True), (list[int], True), (str, False), (Literal["a", "b"], False)],
+)
+def test_get_raw_type(annotation, is_raw):
+    class Foo(BaseModel):
+        a: annotation
+
+    param_type = _get_type_from_field(Foo.model_fields["a"])
+    raw_type = get_raw_type(param_type)
+    assert (raw_type is not None) == is_raw
+    if raw_type is not None:
+        assert raw_type.name == param_type.name
+        assert raw_type.convert("not validated", None, None) == "not validated"
+        assert raw_type.convert(PydanclickDefault(1), None, None) is None
+        assert type(pickle.loads(pickle.dumps(raw_type))) is RawParamType  # noqa: S301
@@ -1,6 +1,26 @@
+import datetime
+import pickle
+import uuid
+from typing import Any, Union, get_args
+
+import click
 import pytest
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
+from pydantic_core import PydanticCustomError
 
-from pydanclick.model.validation import _pack_dict
+from pydanclick.model import convert_to_click
+from pydanclick.model.validation import (
+    ConstructionPlan,
+    FlatValidationPlan,
+    IncrementalValidationPlan,
+    MemoizedValidationPlan,
+    RecordValidationError,
+    ValidationMode,
+    ValidationPlan,
+    _pack_dict,
+    model_validate_kwargs,
+)
+from tests.base_models import Foos, Obj, OptionalFoos
 
 
 @pytest.mark.parametrize(
@@ -17,3 +37,442 @@ from pydanclick.model.validation import _pack_dict
 def test__pack_dict(input_value, expected_value):
     packed_value = _pack_dict(input_value)
     assert packed_value == expected_value
+
+
+@pytest.mark.parametrize(
+    "model, qualified_names, unpacked_names, kwargs",
+    [
+        (Obj, {"foo_a": "foo.a", "bar_baz_c": "bar.baz.c", "bar_a": "bar.a"}, set(), {"foo_a": 2, "bar_baz_c": "b"}),
+        (Obj, {"foo_a": "foo.a", "bar_baz_c": "bar.baz.c"}, set(), {"foo_a": None, "bar_baz_c": None, "other": 1}),
+        (Foos, {"foos_a": "foos.a", "foos_b": "foos.b"}, {"foos"}, {"foos_a": [1, 2], "foos_b": [False]}),
+        (OptionalFoos, {"foos_a": "foos.a", "foos_b": "foos.b"}, {"foos"}, {"foos_a": [], "foos_b": []}),
+    ],
+)
+@pytest.mark.parametrize("plan_cls", [ValidationPlan, FlatValidationPlan])
+def test_validation_plan(plan_cls, model, qualified_names, unpacked_names, kwargs):
+    plan = plan_cls(model, qualified_names, unpacked_names)
+    plan_kwargs, expected_kwargs = dict(kwargs), dict(kwargs)
+    assert plan(plan_kwargs) == model_validate_kwargs(expected_kwargs, model, qualified_names, unpacked_names)
+    assert plan_kwargs == expected_kwargs
+    assert pickle.loads(pickle.dumps(plan))(dict(kwargs)) == plan(dict(kwargs))  # noqa: S301
+
+
+@pytest.mark.parametrize(
+    "model, args", [(Obj, ["--foo-a", "2", "--bar-baz-c", "b"]), (Foos, ["--foos", '[{"a": 2}, {"b": false}]'])]
+)
+@pytest.mark.parametrize("validation", get_args(ValidationMode))
+def test_converted_options_and_validator_can_be_pickled(model, args, validation):
+    def invoke(options, validate):
+        command = click.Command("cli", params=options, callback=lambda **kwargs: validate(kwargs))
+        return command.main(args, standalone_mode=False)
+
+    options, validate = convert_to_click(model, validation=validation)
+    unpickled_options, unpickled_validate = pickle.loads(pickle.dumps((options, validate)))  # noqa: S301
+    assert [type(option.type) for option in unpickled_options] == [type(option.type) for option in options]
+    assert type(unpickled_validate) is type(validate)
+    assert invoke(unpickled_options, unpickled_validate) == invoke(options, validate)
+
+
+def test_validation_plan_only_creates_non_empty_nodes():
+    plan = ValidationPlan(Obj, {"foo_a": "foo.a", "bar_a": "bar.a", "bar_baz_c": "bar.baz.c"})
+    assert plan.unflatten({"bar_baz_c": "b", "foo_a": None}) == {"bar": {"baz": {"c": "b"}}}
+    assert plan.unflatten({}) == {}
+
+
+class Inner(BaseModel):
+    x: int = 1
+    y: str = "y"
+
+
+class Outer(BaseModel):
+    first: Inner = Inner()
+    second: Inner = Inner()
+    x: int = 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"first_x": 2},
+        {"second_y": "z", "x": None},
+        {"first_x": 2, "first_y": "a", "second_x": 3, "second_y": "b", "x": 4},
+    ],
+)
+def test_flat_validation_plan(kwargs):
+    qualified_names = {
+        "first_x": "first.x",
+        "first_y": "first.y",
+        "second_x": "second.x",
+        "second_y": "second.y",
+        "x": "x",
+    }
+    plan = FlatValidationPlan(Outer, qualified_names)
+    expected = ValidationPlan(Outer, qualified_names)(dict(kwargs))
+    instance = plan(dict(kwargs))
+    assert plan.is_flat
+    assert instance == expected
+    assert instance.model_fields_set == expected.model_fields_set
+    assert instance.first.model_fields_set == expected.first.model_fields_set
+
+
+def test_flat_validation_plan_ignores_excluded_fields():
+    # `second.x` is excluded: it must not read the value of the top-level `x`
+    plan = FlatValidationPlan(Outer, {"first_x": "first.x", "second_y": "second.y", "x": "x"})
+    assert plan({"x": 3, "second_y": "z"}) == Outer(second=Inner(y="z"), x=3)
+
+
+def test_flat_validation_plan_errors():
+    qualified_names = {"first_x": "first.x", "x": "x"}
+    with pytest.raises(ValidationError) as flat_error:
+        FlatValidationPlan(Outer, qualified_names)({"first_x": "a", "x": "b"})
+    with pytest.raises(ValidationError) as default_error:
+        ValidationPlan(Outer, qualified_names)({"first_x": "a", "x": "b"})
+    assert flat_error.value.errors() == default_error.value.errors()
+
+
+class Required(BaseModel):
+    a: int
+    b: int = 0
+
+    @model_validator(mode="after")
+    def check_b(self):
+        if self.b < 0:
+            raise PydanticCustomError("negative", "b is negative")
+        return self
+
+
+class WithRequired(BaseModel):
+    first: Required
+    c: str = Field("c", alias="C")
+    d: int = 0
+
+    @field_validator("d")
+    @classmethod
+    def check_d(cls, value):
+        if value > 10:
+            raise ValueError("d is too large")
+        return value
+
+
+_WITH_REQUIRED_NAMES = {"first_a": "first.a", "first_b": "first.b", "c": "c", "d": "d"}
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"first_b": 1, "c": "x"},
+        {"first_a": 1, "first_b": -1, "d": 11},
+        # Aliased fields can't be passed by name: their value is ignored
+        {"first_a": "x", "c": 1},
+    ],
+)
+def test_flat_validation_plan_errors_hide_flat_mapping(kwargs):
+    with pytest.raises(ValidationError) as flat_error:
+        FlatValidationPlan(WithRequired, _WITH_REQUIRED_NAMES)(dict(kwargs))
+    with pytest.raises(ValidationError) as default_error:
+        ValidationPlan(WithRequired, _WITH_REQUIRED_NAMES)(dict(kwargs))
+    assert str(flat_error.value) == str(default_error.value)
+    assert repr(flat_error.value.errors()) == repr(default_error.value.errors())
+
+
+class Forbidding(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    first: Inner = Inner()
+
+
+class WithBeforeValidator(BaseModel):
+    first: Inner = Inner()
+
+    @field_validator("first", mode="before")
+    @classmethod
+    def validate_first(cls, value):
+        return value
+
+
+class WithUnion(BaseModel):
+    first: Union[Inner, int] = 0
+
+
+@pytest.mark.parametrize(
+    "model, qualified_names, unpacked_names",
+    [
+        (Forbidding, {"first_x": "first.x"}, set()),
+        (WithBeforeValidator, {"first_x": "first.x"}, set()),
+        (WithUnion, {"first": "first", "first_x": "first.x"}, set()),
+        (Foos, {"foos_a": "foos.a", "foos_b": "foos.b"}, {"foos"}),
+    ],
+)
+def test_flat_validation_plan_fallback(model, qualified_names, unpacked_names):
+    plan = FlatValidationPlan(model, qualified_names, unpacked_names)
+    assert not plan.is_flat
+
+
+class WithContainers(BaseModel):
+    values: list[int] = []
+    doubled: list[int] = []
+
+    @field_validator("doubled")
+    @classmethod
+    def double(cls, value):
+        return [2 * item for item in value]
+
+
+def test_flat_validation_plan_with_json_names():
+    plan = FlatValidationPlan(
+        WithContainers, {"values": "values", "doubled": "doubled"}, json_names={"values", "doubled"}
+    )
+    assert plan({"values": "[1, 2]", "doubled": "[3]"}) == WithContainers.model_construct(values=[1, 2], doubled=[6])
+    with pytest.raises(ValidationError):
+        plan({"values": "[1, "})
+    assert pickle.loads(pickle.dumps(plan)).json_names == {"values", "doubled"}  # noqa: S301
+
+
+def test_flat_validation_plan_with_trusted_names():
+    plan = FlatValidationPlan(
+        WithContainers, {"values": "values", "doubled": "doubled"}, trusted_names={"values", "doubled"}
+    )
+    # Trusted values aren't validated again, unless their field has validators
+    assert plan({"values": ("a",), "doubled": [3]}) == WithContainers.model_construct(values=("a",), doubled=[6])
+
+
+_OUTER_NAMES = {"first_x": "first.x", "first_y": "first.y", "second_x": "second.x", "second_y": "second.y", "x": "x"}
+
+
+def test_incremental_validation_plan():
+    plan = IncrementalValidationPlan(Outer, _OUTER_NAMES)
+    sequence = [
+        {"first_x": 2, "second_y": "a"},
+        {"first_x": 2, "second_y": "b"},
+        {"first_x": 2, "second_y": "b", "x": 1},
+        {"first_x": None, "second_y": "b", "x": 1},
+        {"first_x": None, "second_y": "b", "x": 1},
+    ]
+    instances = []
+    for kwargs in sequence:
+        expected = ValidationPlan(Outer, _OUTER_NAMES)(dict(kwargs))
+        instance = plan(kwargs)
+        assert not kwargs
+        assert instance == expected
+        assert instance.model_fields_set == expected.model_fields_set
+        instances.append(instance)
+    assert instances[1].first is instances[0].first
+    assert instances[1].second is not instances[0].second
+    assert instances[2].first is instances[1].first
+    assert instances[2].second is instances[1].second
+    assert instances[4].second is instances[3].second
+    # Reused sub-models are only passed when they're set
+    assert "first" not in instances[4].model_fields_set
+
+
+class WithModelValidator(Outer):
+    @model_validator(mode="before")
+    @classmethod
+    def validate_model(cls, value):
+        assert all(isinstance(value, dict) for value in value.values() if not isinstance(value, int))
+        return value
+
+
+class WithFieldValidator(Outer):
+    @field_validator("first", mode="before")
+    @classmethod
+    def validate_first(cls, value):
+        assert isinstance(value, dict)
+        return value
+
+
+@pytest.mark.parametrize("model, reused", [(WithModelValidator, set()), (WithFieldValidator, {"second"})])
+def test_incremental_validation_plan_with_validators(model, reused):
+    plan = IncrementalValidationPlan(model, _OUTER_NAMES)
+    kwargs = {"first_x": 2, "second_x": 3}
+    first, second = plan(dict(kwargs)), plan({**kwargs, "x": 1})
+    assert second.model_dump() == Outer(first=Inner(x=2), second=Inner(x=3), x=1).model_dump()
+    assert {name for name in ("first", "second") if getattr(first, name) is getattr(second, name)} == reused
+
+
+def test_incremental_validation_plan_can_be_pickled():
+    plan = IncrementalValidationPlan(Outer, _OUTER_NAMES)
+    plan({"first_x": 2})
+    unpickled_plan = pickle.loads(pickle.dumps(plan))  # noqa: S301
+    assert unpickled_plan._previous is None
+    assert unpickled_plan({"first_x": 3}) == Outer(first=Inner(x=3))
+
+
+def test_incremental_validation_plan_with_equal_values_of_different_types():
+    class Sub(BaseModel):
+        x: Union[int, float] = 0
+        y: list[Union[int, float]] = []
+
+    class Model(BaseModel):
+        sub: Sub = Sub()
+
+    plan = IncrementalValidationPlan(Model, {"sub_x": "sub.x", "sub_y": "sub.y"})
+    assert repr(plan({"sub_x": 1, "sub_y": [1]})) == repr(Model(sub=Sub(x=1, y=[1])))
+    assert repr(plan({"sub_x": 1.0, "sub_y": [1]})) == repr(Model(sub=Sub(x=1.0, y=[1])))
+    assert repr(plan({"sub_x": 1.0, "sub_y": [1.0]})) == repr(Model(sub=Sub(x=1.0, y=[1.0])))
+
+
+class WithTimestamps(BaseModel):
+    ts: list[datetime.datetime] = []
+    x: float = 0.0
+
+
+_EQUAL_VALUES = [
+    {"ts": [datetime.datetime(2020, 1, 1, 12, tzinfo=datetime.timezone.utc)]},
+    {"ts": [datetime.datetime(2020, 1, 1, 13, tzinfo=datetime.timezone(datetime.timedelta(hours=1)))]},
+    {"x": -0.0},
+    {"x": 0.0},
+]
+
+
+def test_incremental_validation_plan_with_interchangeable_values():
+    class Model(BaseModel):
+        sub: WithTimestamps = WithTimestamps()
+
+    plan = IncrementalValidationPlan(Model, {"sub_ts": "sub.ts", "sub_x": "sub.x"})
+    for kwargs in _EQUAL_VALUES:
+        expected = Model(sub=WithTimestamps(**kwargs))
+        assert repr(plan({f"sub_{key}": value for key, value in kwargs.items()})) == repr(expected)
+
+
+def test_incremental_validation_plan_with_default_factories():
+    class WithFactory(BaseModel):
+        name: str = "a"
+        uid: uuid.UUID = Field(default_factory=uuid.uuid4)
+
+    class Model(BaseModel):
+        first: WithFactory = Field(default_factory=WithFactory)
+        second: Inner = Inner()
+        x: int = 0
+
+    plan = IncrementalValidationPlan(Model, {"first_name": "first.name", "second_x": "second.x", "x": "x"})
+    first, second = plan({"first_name": "b", "second_x": 2}), plan({"first_name": "b", "second_x": 2, "x": 1})
+    # Default factories are called again for every instance
+    assert first.first.uid != second.first.uid
+    assert first.second is second.second
+
+
+def test_memoized_validation_plan():
+    plan = MemoizedValidationPlan(ValidationPlan(Outer, _OUTER_NAMES), maxsize=2)
+    kwargs = {"first_x": 2, "second_y": "a", "other": 1}
+    first = plan(kwargs)
+    assert kwargs == {"other": 1}
+    second = plan({"first_x": 2, "second_y": "a"})
+    assert first == second == Outer(first=Inner(x=2), second=Inner(y="a"))
+    assert first is not second
+    assert first.model_fields_set == second.model_fields_set
+    first.x = 3
+    assert plan({"first_x": 2, "second_y": "a"}).x == 0
+    # Equal values of different types aren't mixed up
+    assert plan({"x": 1}) == plan({"x": True}) == Outer(x=1)
+    assert plan.cache_info() == (2, 3, 2, 2)
+    plan.cache_clear()
+    assert plan.cache_info() == (0, 0, 2, 0)
+
+
+def test_memoized_validation_plan_with_frozen_model_and_unhashable_values():
+    class Frozen(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
+        values: list[int] = []
+        mapping: dict[str, list[int]] = {}
+        payload: Any = None
+
+    qualified_names = {"values": "values", "mapping": "mapping", "payload": "payload"}
+    plan = MemoizedValidationPlan(ValidationPlan(Frozen, qualified_names), maxsize=8)
+    first, second = plan({"values": [1, 2], "mapping": {"a": [1]}}), plan({"values": [1, 2], "mapping": {"a": [1]}})
+    assert first is second
+    assert plan({"values": [1, 2], "mapping": {"a": [2]}}) == Frozen(values=[1, 2], mapping={"a": [2]})
+    # Keys of different types aren't mixed up either
+    assert repr(plan({"payload": {1: "v"}}).payload) == "{1: 'v'}"
+    assert repr(plan({"payload": {True: "v"}}).payload) == "{True: 'v'}"
+    # Unhashable values are validated, but not cached
+    assert plan({"payload": bytearray(b"a")}) == plan({"payload": bytearray(b"a")}) == Frozen(payload=bytearray(b"a"))
+    assert plan.cache_info()[1:] == (6, 8, 4)
+
+
+def test_memoized_validation_plan_with_equal_values():
+    plan = MemoizedValidationPlan(ValidationPlan(WithTimestamps, {"ts": "ts", "x": "x"}), maxsize=8)
+    # Equal values which aren't interchangeable aren't mixed up
+    for kwargs in _EQUAL_VALUES:
+        assert repr(plan(dict(kwargs))) == repr(WithTimestamps(**kwargs))
+    assert plan.cache_info().misses == 4
+
+
+def test_memoized_validation_plan_with_errors():
+    plan = MemoizedValidationPlan(ValidationPlan(Outer, _OUTER_NAMES), maxsize=8)
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            plan({"x": "a"})
+    assert plan.cache_info().currsize == 0
+    assert list(plan.validate_many([{"x": 1}, {"x": 2}])) == [Outer(x=1), Outer(x=2)]
+    assert pickle.loads(pickle.dumps(plan))({"x": 1}) == Outer(x=1)  # noqa: S301
+
+
+class WithDeterministicFactories(BaseModel):
+    first: Inner = Field(default_factory=Inner)
+    values: list[int] = Field(default_factory=list)
+
+
+class WithRandomFactory(BaseModel):
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+
+
+class WithNestedRandomFactory(BaseModel):
+    nested: list[WithRandomFactory] = []
+
+
+@pytest.mark.parametrize(
+    "model, memoized",
+    [(Outer, True), (WithDeterministicFactories, True), (WithRandomFactory, False), (WithNestedRandomFactory, False)],
+)
+def test_convert_to_click_with_validator_cache(model, memoized):
+    _, validate = convert_to_click(model, validator_cache_size=8)
+    assert isinstance(validate, MemoizedValidationPlan) == memoized
+    _, validate = convert_to_click(model)
+    assert not isinstance(validate, MemoizedValidationPlan)
+
+
+def test_construction_plan():
+    plan = ConstructionPlan(Outer, {"x": "x"})
+    # Values aren't validated
+    instance = plan({"x": "not an int", "other": 1})
+    assert instance.x == "not an int"
+    assert instance.model_fields_set == {"x"}
+    assert plan({"x": None}) == Outer()
+    with pytest.raises(ValueError, match="top-level"):
+        ConstructionPlan(Outer, {"first_x": "first.x"})
+
+
+def test_construction_plan_without_model_construct():
+    plan = ConstructionPlan(Inner, {"y": "y"})
+    assert plan._fields is not None
+    instance = plan({"y": "z"})
+    expected = Inner.model_construct(y="z")
+    assert repr(instance) == repr(expected)
+    assert instance.model_fields_set == expected.model_fields_set
+    assert instance.model_dump() == expected.model_dump()
+
+
+@pytest.mark.parametrize("plan_cls", [ValidationPlan, FlatValidationPlan, ConstructionPlan])
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_validate_many(plan_cls, chunk_size):
+    plan = plan_cls(Inner, {"x": "x", "y": "y"})
+    records = [{"x": i, "y": None} for i in range(5)]
+    expected = [plan(dict(record)) for record in records]
+    assert list(plan.validate_many(iter(records), chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize("plan_cls", [ValidationPlan, FlatValidationPlan])
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_validate_many_with_invalid_record(plan_cls, chunk_size):
+    plan = plan_cls(Outer, {"first_x": "first.x", "x": "x"})
+    records = [{"first_x": 1}, {"x": 2}, {"first_x": "a", "x": "b"}, {"x": 4}]
+    instances = plan.validate_many(records, chunk_size=chunk_size)
+    assert next(instances) == Outer(first=Inner(x=1))
+    assert next(instances) == Outer(x=2)
+    with pytest.raises(RecordValidationError) as error:
+        next(instances)
+    assert error.value.index == 2
+    assert [e["loc"] for e in error.value.error.errors()] == [("first", "x"), ("x",)]